@@ -0,0 +1 @@
+"""Бенчмарки Chrome MCP Server на локальных тестовых страницах."""
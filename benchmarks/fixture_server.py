@@ -0,0 +1,141 @@
+"""Локальный HTTP сервер с тестовыми страницами для бенчмарков."""
+
+import functools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict
+from urllib.parse import parse_qs, urlsplit
+
+TABLE_ROWS = 2000
+ARTICLE_PARAGRAPHS = 400
+SCROLL_BATCH = 30
+
+_LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, "
+    "quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat."
+)
+
+
+def _page(title: str, body: str) -> str:
+    return (
+        f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title>"
+        f"<meta name='description' content='{title} fixture'></head><body>{body}</body></html>"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def table_page() -> str:
+    """Большая таблица со ссылками и полями ввода."""
+    rows = "".join(
+        f"<tr id='row-{i}' class='row'><td>{i}</td><td><a href='/item/{i}'>Item {i}</a></td>"
+        f"<td>{i * 7 % 1000}.{i % 100:02d}</td><td>{'in stock' if i % 3 else 'sold out'}</td>"
+        f"<td><input type='number' name='qty-{i}' value='1'></td>"
+        f"<td><button class='add' data-id='{i}'>Add</button></td></tr>"
+        for i in range(TABLE_ROWS)
+    )
+    return _page(
+        "Table",
+        "<h1>Products</h1><form action='/search'><input name='q' placeholder='Search'>"
+        "<button type='submit'>Find</button></form>"
+        f"<table><thead><tr><th>#</th><th>Name</th><th>Price</th><th>Status</th>"
+        f"<th>Qty</th><th></th></tr></thead><tbody>{rows}</tbody></table>"
+        "<script>document.addEventListener('click', e => {"
+        "if (e.target.classList.contains('add')) e.target.textContent = 'Added';});</script>"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def article_page() -> str:
+    """Длинная статья с заголовками разделов."""
+    sections = "".join(
+        (f"<h2>Section {i // 20}</h2>" if i % 20 == 0 else "") + f"<p>{i}. {_LOREM}</p>"
+        for i in range(ARTICLE_PARAGRAPHS)
+    )
+    return _page("Article", f"<article><h1>Long article</h1>{sections}</article>")
+
+
+def slow_page() -> str:
+    """Элемент появляется после медленного запроса, картинка грузится долго."""
+    return _page(
+        "Slow",
+        "<h1>Slow</h1><div id='status'>loading</div><img src='/delay?ms=800' alt='slow'>"
+        "<script>fetch('/delay?ms=500').then(() => {"
+        "const b = document.createElement('button'); b.id = 'late'; b.textContent = 'Ready';"
+        "b.onclick = () => { document.getElementById('status').textContent = 'clicked'; };"
+        "document.body.appendChild(b);});</script>"
+    )
+
+
+def infinite_page() -> str:
+    """Бесконечная прокрутка: новые элементы при достижении конца списка."""
+    return _page(
+        "Infinite",
+        "<h1>Feed</h1><ul id='feed'></ul><div id='sentinel' style='height:1px'></div>"
+        f"<script>const batch = {SCROLL_BATCH}; let next = 0;"
+        "function load() { const feed = document.getElementById('feed');"
+        "for (let i = 0; i < batch; i++, next++) { const li = document.createElement('li');"
+        "li.className = 'item'; li.style.height = '60px'; li.textContent = 'Post ' + next;"
+        "feed.appendChild(li); } }"
+        "load(); new IntersectionObserver(entries => {"
+        "if (entries[0].isIntersecting) setTimeout(load, 100);"
+        "}).observe(document.getElementById('sentinel'));</script>"
+    )
+
+
+PAGES: Dict[str, Callable[[], str]] = {
+    "/table.html": table_page,
+    "/article.html": article_page,
+    "/slow.html": slow_page,
+    "/infinite.html": infinite_page,
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Страницы PAGES и /delay?ms=N (пустой ответ через N мс)."""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/delay":
+            ms = int(parse_qs(url.query).get("ms", ["0"])[0])
+            time.sleep(ms / 1000)
+            self._send(200, "application/json", json.dumps({"delay_ms": ms}))
+        elif url.path in PAGES:
+            self._send(200, "text/html; charset=utf-8", PAGES[url.path]())
+        else:
+            self._send(404, "text/plain", "not found")
+
+    def _send(self, status: int, content_type: str, body: str) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """HTTP сервер на свободном порту 127.0.0.1 в фоновом потоке."""
+
+    def __init__(self):
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def url(self, path: str) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
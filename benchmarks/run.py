@@ -0,0 +1,282 @@
+"""
+Бенчмарки BrowserManager и инструментов MCP на локальных страницах.
+
+Каждая операция выполняется несколько раз на страницах FixtureServer;
+в отчете - p50/p95 времени и размер ответа. Результат можно сохранить
+и сравнить со следующим запуском, чтобы заметить регрессию.
+
+Использование:
+    python -m benchmarks.run --iterations 10 --output baseline.json
+    python -m benchmarks.run --baseline baseline.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Модули сервера импортируют друг друга напрямую
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from browser_manager import BrowserManager  # noqa: E402
+
+from .fixture_server import FixtureServer  # noqa: E402
+
+# Регрессия засчитывается, только если p50 вырос больше чем на столько мс
+MIN_REGRESSION_MS = 5
+
+
+@dataclass
+class Case:
+    """Измеряемая операция BrowserManager."""
+
+    name: str
+    # Страница, открываемая перед замерами (None - не открывать)
+    page: Optional[str]
+    run: Callable[[BrowserManager, FixtureServer], Dict[str, Any]]
+    # Число повторов вместо общего (для медленных операций)
+    iterations: Optional[int] = None
+
+
+def _late_element(browser: BrowserManager, fixtures: FixtureServer) -> Dict[str, Any]:
+    browser.navigate(fixtures.url("/slow.html"), wait_until="commit")
+    return browser.wait_for("visible", "#late", timeout=5)
+
+
+def _scroll_feed(browser: BrowserManager, fixtures: FixtureServer) -> Dict[str, Any]:
+    count = browser.execute_script(
+        "window.scrollTo(0, document.body.scrollHeight);"
+        "return document.querySelectorAll('.item').length;"
+    )["result"]
+    return browser.wait_for("present", f".item:nth-child({count + 1})", timeout=5)
+
+
+CASES: List[Case] = [
+    Case("navigate/table", None, lambda b, f: b.navigate(f.url("/table.html"))),
+    Case("navigate/article", None, lambda b, f: b.navigate(f.url("/article.html"))),
+    Case("navigate/slow load", None, lambda b, f: b.navigate(f.url("/slow.html"))),
+    Case("navigate/slow domcontentloaded", None,
+         lambda b, f: b.navigate(f.url("/slow.html"), wait_until="domcontentloaded")),
+    Case("get_elements_info/script", "/table.html",
+         lambda b, f: b.get_elements_info("tr.row", max_elements=200)),
+    Case("get_elements_info/webdriver", "/table.html",
+         lambda b, f: b.get_elements_info("tr.row", max_elements=50, use_script=False),
+         iterations=3),
+    Case("get_page_html/table", "/table.html",
+         lambda b, f: b.get_page_html(max_length=0, use_cache=False)),
+    Case("get_all_text/article", "/article.html",
+         lambda b, f: b.get_all_text(max_length=0, use_cache=False)),
+    Case("get_all_text/article cached", "/article.html",
+         lambda b, f: b.get_all_text(max_length=0)),
+    Case("get_page_structure/table", "/table.html",
+         lambda b, f: b.get_page_structure(use_cache=False)),
+    Case("get_page_model/table", "/table.html",
+         lambda b, f: b.get_page_model(use_cache=False)),
+    Case("get_page_info/table", "/table.html", lambda b, f: b.get_page_info()),
+    Case("get_page_changes/article", "/article.html", lambda b, f: b.get_page_changes()),
+    Case("find_element/table", "/table.html", lambda b, f: b.find_element("#row-1500 a")),
+    Case("get_text/table", "/table.html", lambda b, f: b.get_text("#row-1500 td:nth-child(3)")),
+    Case("click/table", "/table.html", lambda b, f: b.click("#row-10 .add")),
+    Case("type_text/table", "/table.html", lambda b, f: b.type_text("input[name='q']", "query")),
+    Case("wait_for/late element", None, _late_element),
+    Case("wait_for/infinite scroll", "/infinite.html", _scroll_feed),
+    Case("screenshot/png", "/article.html", lambda b, f: b.screenshot()),
+    Case("screenshot/jpeg", "/article.html",
+         lambda b, f: b.screenshot(format="jpeg", quality=60)),
+]
+
+# Инструменты MCP: (имя замера, страница, инструмент, аргументы)
+MCP_CASES = [
+    ("mcp/get_elements_info", "/table.html", "get_elements_info",
+     {"selector": "tr.row", "max_elements": 200}),
+    ("mcp/get_all_text", "/article.html", "get_all_text", {"use_cache": False}),
+    ("mcp/get_page_structure", "/table.html", "get_page_structure", {"use_cache": False}),
+    ("mcp/find_element", "/table.html", "find_element", {"selector": "#row-1500 a"}),
+    ("mcp/screenshot", "/article.html", "screenshot", {"format": "jpeg", "quality": 60}),
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль q (0-100) методом ближайшего ранга."""
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def summarize(timings: List[float], payloads: List[int], errors: int) -> Dict[str, Any]:
+    """Сводка замеров одной операции."""
+    if not timings:
+        return {"iterations": 0, "errors": errors}
+    return {
+        "iterations": len(timings),
+        "errors": errors,
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "payload_bytes": round(statistics.fmean(payloads)),
+    }
+
+
+def _payload_size(result: Dict[str, Any]) -> int:
+    return len(json.dumps(result, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def run_browser_cases(
+    fixtures: FixtureServer,
+    iterations: int,
+    warmup: int,
+    headless: bool,
+    selected: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Замеры операций BrowserManager."""
+    browser = BrowserManager(headless=headless)
+    started = browser.start()
+    if not started["success"]:
+        raise RuntimeError(f"Не удалось запустить Chrome: {started['error']}")
+
+    report = {"browser_start": {"startup_ms": browser.startup_ms}}
+    try:
+        for case in CASES:
+            if selected and selected not in case.name:
+                continue
+            if case.page:
+                browser.navigate(fixtures.url(case.page))
+
+            timings, payloads, errors = [], [], 0
+            for number in range(warmup + (case.iterations or iterations)):
+                started_at = time.perf_counter()
+                result = case.run(browser, fixtures)
+                elapsed = (time.perf_counter() - started_at) * 1000
+                if number < warmup:
+                    continue
+                if not result.get("success", False):
+                    errors += 1
+                timings.append(elapsed)
+                payloads.append(_payload_size(result))
+
+            report[case.name] = summarize(timings, payloads, errors)
+            print(_format_row(case.name, report[case.name]), flush=True)
+    finally:
+        browser.stop()
+    return report
+
+
+async def run_mcp_cases(
+    fixtures: FixtureServer,
+    iterations: int,
+    warmup: int,
+    headless: bool,
+    selected: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Замеры call_tool через MCP клиент в том же процессе."""
+    import server as app
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    app.settings["headless"] = headless
+    report = {}
+    try:
+        async with create_connected_server_and_client_session(app.server) as client:
+            for name, page, tool, arguments in MCP_CASES:
+                if selected and selected not in name:
+                    continue
+                await client.call_tool("navigate", {"url": fixtures.url(page)})
+
+                timings, payloads, errors = [], [], 0
+                for number in range(warmup + iterations):
+                    started_at = time.perf_counter()
+                    result = await client.call_tool(tool, arguments)
+                    elapsed = (time.perf_counter() - started_at) * 1000
+                    if number < warmup:
+                        continue
+                    if result.isError:
+                        errors += 1
+                    timings.append(elapsed)
+                    payloads.append(sum(
+                        len(content.text.encode("utf-8")) if content.type == "text" else len(content.data)
+                        for content in result.content
+                    ))
+
+                report[name] = summarize(timings, payloads, errors)
+                print(_format_row(name, report[name]), flush=True)
+    finally:
+        app.pool.shutdown()
+        app.dispatcher.shutdown()
+    return report
+
+
+def _format_row(name: str, stats: Dict[str, Any]) -> str:
+    if not stats.get("iterations"):
+        return f"{name:<36} нет замеров (ошибок: {stats.get('errors', 0)})"
+    return (
+        f"{name:<36} p50 {stats['p50_ms']:>9.1f} мс  p95 {stats['p95_ms']:>9.1f} мс  "
+        f"{stats['payload_bytes']:>10} Б  ошибок {stats['errors']}"
+    )
+
+
+def compare(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float
+) -> List[str]:
+    """
+    Операции, p50 которых вырос больше чем на tolerance относительно baseline.
+
+    Returns:
+        Описания регрессий
+    """
+    regressions = []
+    for name, stats in current.items():
+        before = baseline.get(name, {}).get("p50_ms")
+        after = stats.get("p50_ms")
+        if before is None or after is None:
+            continue
+        if after > before * (1 + tolerance) and after - before > MIN_REGRESSION_MS:
+            regressions.append(f"{name}: p50 {before} -> {after} мс (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки Chrome MCP Server")
+    parser.add_argument("--iterations", type=int, default=10, help="Повторов каждой операции")
+    parser.add_argument("--warmup", type=int, default=1, help="Неучитываемых повторов перед замерами")
+    parser.add_argument("--headed", action="store_true", help="Запускать Chrome с окном")
+    parser.add_argument("--only", help="Только операции, имя которых содержит строку")
+    parser.add_argument("--skip-mcp", action="store_true", help="Без замеров через MCP клиент")
+    parser.add_argument("--output", help="Сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="JSON предыдущего запуска для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Допустимый рост p50 относительно baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    headless = not args.headed
+    with FixtureServer() as fixtures:
+        report = run_browser_cases(fixtures, args.iterations, args.warmup, headless, args.only)
+        if not args.skip_mcp:
+            report.update(asyncio.run(
+                run_mcp_cases(fixtures, args.iterations, args.warmup, headless, args.only)
+            ))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Результаты сохранены: {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"РЕГРЕССИЯ {line}")
+        if regressions:
+            return 1
+        print("Регрессий нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Асинхронный интерфейс BrowserManager для asyncio."""
+
+import functools
+from typing import Any, Callable, Dict, Optional
+
+from selenium.common.exceptions import TimeoutException
+
+from browser_manager import BrowserManager
+from devtools import DevToolsChannel
+from dispatcher import ToolDispatcher, ToolTimeoutError
+
+# Операции BrowserManager, доступные как корутины
+OPERATIONS = (
+    "start", "stop",
+    "navigate", "back", "forward", "refresh",
+    "open_tab", "switch_tab", "close_tab", "list_tabs",
+    "find_element", "click", "type_text", "get_text", "wait_for",
+    "get_elements_info", "get_page_model", "get_page_structure",
+    "get_page_html", "get_all_text", "get_page_changes", "get_page_info",
+    "execute_script", "screenshot", "get_memory_usage",
+    "free_memory", "close_background_tabs",
+)
+
+
+def _operation(name: str) -> Callable[..., Any]:
+    method = getattr(BrowserManager, name)
+
+    @functools.wraps(method)
+    async def operation(self, *args, **kwargs):
+        return await self.run(method, self.browser, *args, **kwargs)
+    operation.__qualname__ = f"AsyncBrowserManager.{name}"
+    return operation
+
+
+class AsyncBrowserManager:
+    """
+    BrowserManager с операциями-корутинами.
+
+    Вызовы WebDriver выполняются в общем ограниченном пуле потоков
+    ToolDispatcher под блокировкой браузера, поэтому операции с разными
+    браузерами выполняются параллельно без отдельного потока на каждый
+    браузер. Команды CDP и скрипты (cdp, evaluate) тоже выполняются под
+    блокировкой браузера, поэтому не пересекаются с операциями.
+
+    Пример:
+        async with AsyncBrowserManager(headless=True) as browser:
+            await browser.navigate("https://example.com")
+            info = await browser.get_page_info()
+    """
+
+    def __init__(
+        self,
+        browser: Optional[BrowserManager] = None,
+        dispatcher: Optional[ToolDispatcher] = None,
+        **options: Any
+    ):
+        """
+        Args:
+            browser: Существующий BrowserManager (по умолчанию создается
+                с параметрами options)
+            dispatcher: Пул потоков, общий для нескольких браузеров (по
+                умолчанию свой, закрывается в close)
+            **options: Параметры BrowserManager
+        """
+        self.browser = browser or BrowserManager(**options)
+        self.dispatcher = dispatcher or ToolDispatcher()
+        self._owns_dispatcher = dispatcher is None
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Блокирующий вызов с браузером в пуле потоков под его блокировкой."""
+        if kwargs:
+            func = functools.partial(func, **kwargs)
+        return await self.dispatcher.run(func, *args, lock=self.browser.lock)
+
+    def _devtools(self) -> DevToolsChannel:
+        if self.browser.devtools is None:
+            raise RuntimeError("Браузер не запущен")
+        return self.browser.devtools
+
+    async def _devtools_call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Вызов DevToolsChannel под блокировкой браузера, таймаут - TimeoutException."""
+        try:
+            return await self.run(func, *args)
+        except ToolTimeoutError as e:
+            raise TimeoutException(str(e))
+
+    async def cdp(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Команда CDP в текущей вкладке (как execute_cdp_cmd).
+
+        Raises:
+            TimeoutException: Если ответ не получен за таймаут диспетчера
+        """
+        return await self._devtools_call(self._devtools().execute, method, params)
+
+    async def evaluate(self, script: str, *args: Any) -> Any:
+        """
+        Скрипт в стиле execute_script с результатом по значению.
+
+        В отличие от execute_script не сбрасывает кэш снимков страницы и
+        возвращает результат скрипта, а не словарь с success.
+
+        Raises:
+            TimeoutException: Если ответ не получен за таймаут
+        """
+        return await self._devtools_call(self._devtools().evaluate, script, *args)
+
+    async def close(self) -> None:
+        """Остановка браузера и своего пула потоков."""
+        try:
+            await self.stop()
+        finally:
+            if self._owns_dispatcher:
+                self.dispatcher.shutdown()
+
+    async def __aenter__(self) -> "AsyncBrowserManager":
+        result = await self.start()
+        if not result["success"]:
+            await self.close()
+            raise RuntimeError(f"Не удалось запустить Chrome: {result['error']}")
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+for _name in OPERATIONS:
+    setattr(AsyncBrowserManager, _name, _operation(_name))
+del _name
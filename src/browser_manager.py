@@ -1,35 +1,278 @@
 """Управление браузером Chrome через Selenium."""
 
+import json
 import os
 import logging
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Tuple, Callable, Hashable, Iterator
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.driver_finder import DriverFinder
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
 import base64
 
+from devtools import DevToolsChannel
+from element_registry import ElementEntry, ElementRegistry, HandleError
+from metrics import Metrics, timed
+from page_cache import CursorError, Snapshot, SnapshotStore, chunk, make_cursor, parse_cursor
+from page_model import COMPUTED_STYLES, NodeElement, build_page_model
+from tracing import Tracer
+from resource_blocking import build_block_rules
+from scripts import (
+    DOM_VERSION_SCRIPT,
+    ELEMENTS_INFO_SCRIPT,
+    MARK_DOCUMENT_SCRIPT,
+    NAVIGATION_RESULT_SCRIPT,
+    NETWORK_TRACKER_SCRIPT,
+    PAGE_CHANGES_SCRIPT,
+    PAGE_INFO_SCRIPT,
+    RESTORE_STORAGE_SCRIPT,
+    SCREENSHOT_AREA_SCRIPT,
+    SESSION_STATE_SCRIPT,
+)
+from waits import BY_MAPPING, WaitEngine
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHROME_ARGUMENTS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+]
+
+# Пути к chromedriver и Chrome, найденные Selenium Manager (один раз на процесс)
+_resolved_paths: Optional[Tuple[str, str]] = None
+_resolved_paths_lock = threading.Lock()
+
+DEFAULT_ELEMENT_ATTRIBUTES = ["id", "class", "href", "src", "type", "value"]
+
+# Условия завершения navigate
+NAVIGATION_CONDITIONS = ("commit", "domcontentloaded", "load", "selector", "networkidle")
+
+# Состояние вкладки без блокировки ресурсов
+NO_BLOCKING: tuple = ((), (), ())
+
+# Форматы Page.captureScreenshot и их MIME типы
+SCREENSHOT_FORMATS = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+# Поля cookie из Storage.getCookies, которые принимает Storage.setCookies
+COOKIE_PARAMS = (
+    "name", "value", "domain", "path", "expires", "httpOnly", "secure",
+    "sameSite", "priority", "sourceScheme", "sourcePort", "partitionKey",
+)
+
+# Запас HTTP таймаута chromedriver сверх command_timeout, секунд
+COMMAND_TIMEOUT_MARGIN = 5
+
+# Таймаут загрузки страницы WebDriver по умолчанию, секунд
+DEFAULT_PAGE_LOAD_TIMEOUT = 300
+
+# Подкаталоги user_data_dir, занятые запущенными браузерами
+_claimed_profiles: set = set()
+_claimed_profiles_lock = threading.Lock()
+
 
 class BrowserManager:
     """Менеджер для управления Chrome браузером."""
     
-    def __init__(self, headless: bool = False):
+    def __init__(
+        self,
+        headless: bool = False,
+        user_data_dir: Optional[str] = None,
+        driver_path: Optional[str] = None,
+        chrome_arguments: Optional[List[str]] = None,
+        window_size: Tuple[int, int] = (1920, 1080),
+        waits: Optional[WaitEngine] = None,
+        track_requests: bool = True,
+        blocking: Optional[Dict[str, List[str]]] = None,
+        page_load_strategy: str = "normal",
+        wait_until: str = "load",
+        navigation_timeout: float = 30,
+        max_text_length: int = 100000,
+        screenshot: Optional[Dict[str, Any]] = None,
+        metrics: Optional[Metrics] = None,
+        tracer: Optional[Tracer] = None,
+        devtools_websocket: bool = True,
+        command_timeout: Optional[float] = None
+    ):
         """
         Инициализация менеджера браузера.
         
         Args:
             headless: Запускать браузер в headless режиме
+            user_data_dir: Каталог постоянных профилей Chrome (опционально).
+                Каждый запущенный браузер получает в нем свой подкаталог,
+                cookies и дисковый кэш сохраняются между запусками
+            driver_path: Путь к chromedriver (по умолчанию определяется
+                Selenium Manager один раз на процесс)
+            chrome_arguments: Аргументы командной строки Chrome
+            window_size: Размер окна в headless режиме
+            waits: Движок ожидания элементов (по умолчанию MutationObserver)
+            track_requests: Считать незавершенные fetch/XHR на страницах
+                (нужно для ожидания простоя сети)
+            blocking: Блокировка ресурсов по умолчанию для navigate:
+                {"types": [...], "urls": [...], "allow": [...]}
+            page_load_strategy: Стратегия загрузки chromedriver (normal,
+                eager, none). При none navigate сам ждет условия wait_until
+            wait_until: Условие завершения navigate по умолчанию
+                (commit, domcontentloaded, load, selector, networkidle)
+            navigation_timeout: Таймаут ожидания wait_until, секунд
+            max_text_length: Максимальная длина фрагмента get_page_html и
+                get_all_text по умолчанию (0 - без ограничения)
+            screenshot: Параметры скриншота по умолчанию:
+                {"format": ..., "quality": ..., "scale": ...}
+            metrics: Метрики методов и команд WebDriver (None - не собирать)
+            tracer: Трассировка методов и команд WebDriver (None - отключена)
+            devtools_websocket: Отправлять CDP команды и скрипты чтения
+                страницы напрямую в Chrome по WebSocket (иначе через
+                chromedriver)
+            command_timeout: Таймаут загрузки страницы и HTTP запроса к
+                chromedriver, секунд (None - без ограничения): зависшая
+                страница не держит поток и блокировку браузера дольше
         """
         self.driver: Optional[webdriver.Chrome] = None
         self.headless = headless
         self.timeout = 10
+        self.user_data_dir = user_data_dir
+        self.driver_path = driver_path
+        self.chrome_arguments = list(chrome_arguments or DEFAULT_CHROME_ARGUMENTS)
+        self.window_size = window_size
+        self.waits = waits or WaitEngine()
+        self.track_requests = track_requests
+        self.blocking = {"types": [], "urls": [], "allow": [], **(blocking or {})}
+        self.page_load_strategy = page_load_strategy
+        self.wait_until = wait_until
+        self.navigation_timeout = navigation_timeout
+        self.max_text_length = max_text_length
+        self.screenshot_defaults = {"format": "png", "quality": 80, "scale": 1.0, **(screenshot or {})}
+        self.metrics = metrics
+        self.tracer = tracer
+        self.devtools_websocket = devtools_websocket
+        self.command_timeout = command_timeout
+        # CDP и скрипты текущей вкладки (WebSocket или chromedriver)
+        self.devtools: Optional[DevToolsChannel] = None
+        # Снимки страницы: повторные чтения без изменений DOM и чтение по курсору
+        self.snapshots = SnapshotStore()
+        # Найденные элементы: повторные действия по element_id без поиска
+        self.elements = ElementRegistry()
+        # Длительность последнего запуска, мс
+        self.startup_ms: Optional[float] = None
+        # WebDriver не потокобезопасен: вызовы из пула потоков сериализуются
+        self.lock = threading.RLock()
+        # Счетчик переходов с момента запуска (для пересоздания в пуле)
+        self.navigation_count = 0
+        # Перезапуски после падения и состояние для восстановления (Watchdog)
+        self.restart_count = 0
+        self.session_state: Dict[str, Any] = {}
+        # Предыдущий вызов превысил таймаут: перезапустить перед следующим
+        self.restart_pending = False
+        # Изолированные контексты вкладок: window handle -> browserContextId
+        self._tab_contexts: Dict[str, str] = {}
+        # Правила блокировки, установленные в текущей вкладке (None - неизвестно)
+        self._blocking_state: Optional[tuple] = NO_BLOCKING
+        self._profile_dir: Optional[str] = None
+    
+    def _build_service(self, chrome_options: Options) -> Service:
+        """
+        Service с известным путем к chromedriver.
+        
+        Selenium Manager запускается только при первом старте в процессе,
+        дальше используется закэшированный путь.
+        """
+        global _resolved_paths
+        
+        if self.driver_path:
+            return Service(executable_path=self.driver_path)
+        
+        with _resolved_paths_lock:
+            if _resolved_paths is None:
+                finder = DriverFinder(Service(), chrome_options)
+                _resolved_paths = (finder.get_driver_path(), finder.get_browser_path())
+                logger.info(f"chromedriver: {_resolved_paths[0]}")
+            driver_path, browser_path = _resolved_paths
+        
+        if browser_path and not chrome_options.binary_location:
+            chrome_options.binary_location = browser_path
+        return Service(executable_path=driver_path)
+    
+    @contextmanager
+    def _observe(self, *names: str, kind: str = "devtools") -> Iterator[None]:
+        """Учет команд в self.metrics и span в self.tracer."""
+        if self.metrics:
+            for name in names:
+                self.metrics.count_command(name)
+        if self.tracer is None:
+            yield
+            return
+        # Пакет команд DevTools выполняется одним span
+        name = names[0] if len(names) == 1 else f"cdp:batch[{len(names)}]"
+        with self.tracer.span(name, kind=kind, commands=",".join(names)):
+            yield
+    
+    def _instrument_driver(self) -> None:
+        """Подсчет команд WebDriver в self.metrics и span для каждой в self.tracer."""
+        execute = self.driver.execute
+        
+        def instrumented(driver_command: str, params: Optional[Dict[str, Any]] = None) -> Any:
+            if driver_command == "executeCdpCommand":
+                name = f"cdp:{params['cmd']}"
+            else:
+                name = driver_command
+            with self._observe(name, kind="webdriver"):
+                return execute(driver_command, params)
+        
+        self.driver.execute = instrumented
+    
+    def _apply_command_timeout(self) -> None:
+        """
+        Ограничение времени команд WebDriver.
         
+        chromedriver прерывает загрузку страницы через command_timeout, а
+        HTTP запрос к нему - немного позже, чтобы сначала пришла ошибка
+        chromedriver, а не обрыв соединения.
+        """
+        self.driver.set_page_load_timeout(self.command_timeout)
+        # ClientConfig есть в Selenium 4.26+, в старых версиях таймаут HTTP
+        # задается только для всего процесса
+        config = getattr(self.driver.command_executor, "_client_config", None)
+        if config is not None:
+            config.timeout = self.command_timeout + COMMAND_TIMEOUT_MARGIN
+    
+    def _install_page_scripts(self) -> None:
+        """Скрипты, выполняемые в текущей вкладке до скриптов каждой страницы."""
+        if self.track_requests:
+            self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument",
+                {"source": NETWORK_TRACKER_SCRIPT}
+            )
+    
+    def _claim_profile_dir(self) -> str:
+        """Свободный подкаталог профиля (один профиль - один процесс Chrome)."""
+        with _claimed_profiles_lock:
+            index = 0
+            while True:
+                path = os.path.join(self.user_data_dir, f"profile-{index}")
+                if path not in _claimed_profiles:
+                    _claimed_profiles.add(path)
+                    return path
+                index += 1
+    
+    def _release_profile_dir(self) -> None:
+        if self._profile_dir:
+            with _claimed_profiles_lock:
+                _claimed_profiles.discard(self._profile_dir)
+            self._profile_dir = None
+        
+    @timed
     def start(self) -> Dict[str, Any]:
         """Запуск браузера Chrome."""
         try:
@@ -39,26 +282,62 @@ class BrowserManager:
                     "message": "Браузер уже запущен"
                 }
             
+            started_at = time.perf_counter()
             chrome_options = Options()
+            chrome_options.page_load_strategy = self.page_load_strategy
             
             if self.headless:
                 chrome_options.add_argument("--headless")
+                chrome_options.add_argument(
+                    f"--window-size={self.window_size[0]},{self.window_size[1]}"
+                )
+            else:
+                # Аргумент вместо maximize_window() экономит запрос к chromedriver
+                chrome_options.add_argument("--start-maximized")
             
             # Дополнительные опции для стабильной работы
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+            for argument in self.chrome_arguments:
+                chrome_options.add_argument(argument)
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.maximize_window()
+            service = self._build_service(chrome_options)
+            resolved_at = time.perf_counter()
             
-            logger.info("Chrome браузер успешно запущен")
+            if self.user_data_dir:
+                self._profile_dir = self._claim_profile_dir()
+                chrome_options.add_argument(f"--user-data-dir={self._profile_dir}")
+            
+            try:
+                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            except Exception:
+                self._release_profile_dir()
+                raise
+            if self.command_timeout:
+                self._apply_command_timeout()
+            if self.metrics or self.tracer:
+                self._instrument_driver()
+            self.devtools = DevToolsChannel(
+                self.driver,
+                websocket_enabled=self.devtools_websocket,
+                observe=self._observe if self.metrics or self.tracer else None
+            )
+            self.navigation_count = 0
+            self._blocking_state = NO_BLOCKING
+            self._install_page_scripts()
+            
+            finished_at = time.perf_counter()
+            self.startup_ms = round((finished_at - started_at) * 1000, 1)
+            
+            logger.info(f"Chrome браузер успешно запущен за {self.startup_ms} мс")
             return {
                 "success": True,
                 "message": "Chrome браузер успешно запущен",
-                "headless": self.headless
+                "headless": self.headless,
+                "startup_ms": self.startup_ms,
+                "driver_resolve_ms": round((resolved_at - started_at) * 1000, 1),
+                "launch_ms": round((finished_at - resolved_at) * 1000, 1),
+                "profile_dir": self._profile_dir
             }
             
         except Exception as e:
@@ -68,12 +347,24 @@ class BrowserManager:
                 "error": str(e)
             }
     
+    @timed
     def stop(self) -> Dict[str, Any]:
         """Остановка браузера."""
         try:
             if self.driver:
-                self.driver.quit()
-                self.driver = None
+                try:
+                    # devtools нет, если start() не дошел до его создания
+                    if self.devtools is not None:
+                        self.devtools.close()
+                    self.driver.quit()
+                finally:
+                    # Браузер, завершившийся аварийно, тоже считается остановленным
+                    self.devtools = None
+                    self.driver = None
+                    self._tab_contexts = {}
+                    self.snapshots.clear()
+                    self.elements.clear()
+                    self._release_profile_dir()
                 logger.info("Браузер остановлен")
                 return {
                     "success": True,
@@ -90,34 +381,290 @@ class BrowserManager:
                 "error": str(e)
             }
     
-    def navigate(self, url: str) -> Dict[str, Any]:
+    def is_alive(self) -> bool:
+        """
+        Проверка, что chromedriver и вкладка отвечают.
+        
+        Завершившийся процесс chromedriver определяется без запросов,
+        иначе выполняется один execute_script (падение Chrome или вкладки
+        дает ошибку).
+        """
+        if not self.driver:
+            return False
+        service = getattr(self.driver, "service", None)
+        process = getattr(service, "process", None)
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            self.driver.execute_script("return 1;")
+            return True
+        except Exception as e:
+            logger.warning(f"Браузер не отвечает: {e}")
+            return False
+    
+    def capture_state(self, storage: bool = True) -> Dict[str, Any]:
+        """
+        Состояние сессии для восстановления после перезапуска.
+        
+        Args:
+            storage: Кроме URL сохранить cookies всех доменов и
+                localStorage текущего origin
+        """
+        state: Dict[str, Any] = {}
+        page = self.devtools.evaluate(SESSION_STATE_SCRIPT)
+        state["url"] = page["url"]
+        if storage:
+            cookies = []
+            for cookie in self.devtools.execute("Storage.getCookies")["cookies"]:
+                param = {key: value for key, value in cookie.items() if key in COOKIE_PARAMS}
+                # Сессионные cookies (expires = -1) восстанавливаются без срока
+                if cookie.get("session"):
+                    param.pop("expires", None)
+                cookies.append(param)
+            state["cookies"] = cookies
+            state["local_storage"] = page["local_storage"]
+        return state
+    
+    def restore_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Восстановление cookies, localStorage и страницы из capture_state.
+        
+        localStorage записывается скриптом нового документа до скриптов
+        страницы, поэтому страница сразу видит восстановленные данные.
+        """
+        if not self.driver:
+            return {
+                "success": False,
+                "error": "Браузер не запущен"
+            }
+        if state.get("cookies"):
+            self.driver.execute_cdp_cmd("Storage.setCookies", {"cookies": state["cookies"]})
+        
+        identifier = None
+        local_storage = state.get("local_storage")
+        if local_storage and local_storage.get("items"):
+            identifier = self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                "source": RESTORE_STORAGE_SCRIPT % json.dumps(local_storage)
+            })["identifier"]
+        try:
+            if not state.get("url") or not state["url"].startswith(("http:", "https:", "file:")):
+                return {
+                    "success": True,
+                    "url": None
+                }
+            return self.navigate(state["url"])
+        finally:
+            if identifier:
+                self.driver.execute_cdp_cmd(
+                    "Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier}
+                )
+    
+    def _apply_blocking(
+        self,
+        block_types: List[str],
+        block_urls: List[str],
+        allow_urls: List[str]
+    ) -> None:
+        """Установка правил блокировки ресурсов для текущей вкладки."""
+        state = (tuple(block_types), tuple(block_urls), tuple(allow_urls))
+        if state == self._blocking_state:
+            return
+        
+        rules = build_block_rules(block_types, block_urls, allow_urls)
+        if rules["urlPatterns"]:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+        # urlPatterns (с разрешениями) имеют приоритет над urls; старые
+        # версии Chrome используют только urls
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {
+            "urlPatterns": rules["urlPatterns"],
+            "urls": rules["legacy_urls"]
+        })
+        self._blocking_state = state
+    
+    def _wait_navigation(
+        self,
+        wait_until: str,
+        wait_selector: Optional[str],
+        timeout: float
+    ) -> bool:
+        """
+        Ожидание условия завершения перехода.
+        
+        Returns:
+            True если условие выполнено, False по таймауту
+        """
+        if wait_until not in NAVIGATION_CONDITIONS:
+            raise ValueError(f"Неизвестное условие завершения перехода: {wait_until}")
+        if wait_until == "commit":
+            return True
+        
+        deadline = time.monotonic() + timeout
+        if self.page_load_strategy != "normal":
+            # driver.get не дождался загрузки: сначала ждем новый документ
+            state = "complete" if wait_until == "load" else "interactive"
+            if not self.waits.wait_for_ready_state(self.driver, state, timeout):
+                return False
+        
+        remaining = max(deadline - time.monotonic(), 0)
+        if wait_until == "selector":
+            if not wait_selector:
+                raise ValueError("Для wait_until = selector нужен wait_selector")
+            try:
+                self.waits.wait_for_element(self.driver, wait_selector, "css", "present", remaining)
+            except TimeoutException:
+                return False
+        elif wait_until == "networkidle":
+            return self.waits.wait_for_network_idle(self.driver, timeout=remaining)
+        return True
+    
+    @timed
+    def navigate(
+        self,
+        url: str,
+        block_resources: Optional[List[str]] = None,
+        block_urls: Optional[List[str]] = None,
+        allow_urls: Optional[List[str]] = None,
+        wait_until: Optional[str] = None,
+        wait_selector: Optional[str] = None,
+        timeout: Optional[float] = None,
+        load_timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
         Переход по URL.
         
         Args:
             url: Адрес страницы
+            block_resources: Не загружать ресурсы этих типов
+                (image, font, media, stylesheet, ads). None - значение
+                по умолчанию из self.blocking
+            block_urls: Не загружать URL по шаблонам (синтаксис URLPattern)
+            allow_urls: Загружать URL по шаблонам даже при совпадении с блокировкой
+            wait_until: Когда считать переход завершенным: commit, domcontentloaded,
+                load, selector (появился wait_selector) или networkidle.
+                Раньше load можно завершиться только при page_load_strategy
+                eager или none
+            wait_selector: CSS селектор для wait_until = selector
+            timeout: Таймаут ожидания wait_until, секунд
+            load_timeout: Таймаут загрузки страницы в этом переходе, секунд
+                (None - command_timeout)
         """
         try:
             if not self.driver:
                 self.start()
             
-            self.driver.get(url)
-            logger.info(f"Переход на страницу: {url}")
+            block_resources = self.blocking["types"] if block_resources is None else block_resources
+            block_urls = self.blocking["urls"] if block_urls is None else block_urls
+            allow_urls = self.blocking["allow"] if allow_urls is None else allow_urls
+            self._apply_blocking(block_resources, block_urls, allow_urls)
             
+            wait_until = wait_until or self.wait_until
+            timeout = self.navigation_timeout if timeout is None else timeout
+            
+            started_at = time.perf_counter()
+            if self.page_load_strategy != "normal":
+                self.devtools.evaluate(MARK_DOCUMENT_SCRIPT)
+            if load_timeout:
+                self.driver.set_page_load_timeout(load_timeout)
+                try:
+                    self.driver.get(url)
+                finally:
+                    self.driver.set_page_load_timeout(self.command_timeout or DEFAULT_PAGE_LOAD_TIMEOUT)
+            else:
+                self.driver.get(url)
+            self.navigation_count += 1
+            self._leave_page()
+            completed = self._wait_navigation(wait_until, wait_selector, timeout)
+            elapsed_ms = round((time.perf_counter() - started_at) * 1000, 1)
+            logger.info(f"Переход на страницу: {url} ({elapsed_ms} мс)")
+            
+            # URL, заголовок и Navigation Timing одним запросом
+            page = self.devtools.evaluate(NAVIGATION_RESULT_SCRIPT)
+            result = {
+                "success": True,
+                "url": page["url"],
+                "title": page["title"],
+                "wait_until": wait_until,
+                "completed": completed,
+                "ready_state": page["ready_state"],
+                "elapsed_ms": elapsed_ms,
+                "timing": page["timing"]
+            }
+            if block_resources or block_urls:
+                result["blocked"] = {
+                    "resources": block_resources,
+                    "urls": block_urls
+                }
+            return result
+        except Exception as e:
+            logger.error(f"Ошибка при переходе на {url}: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @timed
+    def open_tab(self, url: Optional[str] = None, isolated: bool = False) -> Dict[str, Any]:
+        """
+        Открытие новой вкладки и переключение на нее.
+        
+        Args:
+            url: Адрес для открытия во вкладке (опционально)
+            isolated: Создать вкладку в отдельном контексте браузера
+                со своими cookies и storage
+        """
+        try:
+            if not self.driver:
+                self.start()
+            
+            context_id = None
+            if isolated:
+                context_id = self.driver.execute_cdp_cmd(
+                    "Target.createBrowserContext", {"disposeOnDetach": False}
+                )["browserContextId"]
+                # В chromedriver window handle совпадает с targetId
+                tab_id = self.driver.execute_cdp_cmd("Target.createTarget", {
+                    "url": "about:blank",
+                    "browserContextId": context_id
+                })["targetId"]
+                self.driver.switch_to.window(tab_id)
+                self._tab_contexts[tab_id] = context_id
+            else:
+                self.driver.switch_to.new_window("tab")
+                tab_id = self.driver.current_window_handle
+            self.devtools.reset(tab_id)
+            
+            # Скрипты страниц регистрируются до перехода по url
+            self._blocking_state = NO_BLOCKING
+            self._install_page_scripts()
+            self._leave_page()
+            if url:
+                self.driver.get(url)
+                self.navigation_count += 1
+            
+            logger.info(f"Открыта вкладка {tab_id}" + (" (изолированная)" if isolated else ""))
             return {
                 "success": True,
+                "tab_id": tab_id,
+                "isolated": isolated,
+                "context_id": context_id,
                 "url": self.driver.current_url,
                 "title": self.driver.title
             }
         except Exception as e:
-            logger.error(f"Ошибка при переходе на {url}: {e}")
+            logger.error(f"Ошибка при открытии вкладки: {e}")
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    def get_page_info(self) -> Dict[str, Any]:
-        """Получение информации о текущей странице."""
+    @timed
+    def switch_tab(self, tab_id: str) -> Dict[str, Any]:
+        """
+        Переключение на вкладку.
+        
+        Args:
+            tab_id: Идентификатор вкладки (из open_tab или list_tabs)
+        """
         try:
             if not self.driver:
                 return {
@@ -125,11 +672,211 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
+            self.driver.switch_to.window(tab_id)
+            self.devtools.reset(tab_id)
+            self._blocking_state = None
+            self._leave_page()
             return {
                 "success": True,
+                "tab_id": tab_id,
                 "url": self.driver.current_url,
-                "title": self.driver.title,
-                "page_source_length": len(self.driver.page_source)
+                "title": self.driver.title
+            }
+        except Exception as e:
+            logger.error(f"Ошибка при переключении на вкладку {tab_id}: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @timed
+    def close_tab(self, tab_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Закрытие вкладки.
+        
+        Args:
+            tab_id: Идентификатор вкладки (по умолчанию текущая)
+        """
+        try:
+            if not self.driver:
+                return {
+                    "success": False,
+                    "error": "Браузер не запущен"
+                }
+            
+            handles = self.driver.window_handles
+            tab_id = tab_id or self.driver.current_window_handle
+            if tab_id not in handles:
+                return {
+                    "success": False,
+                    "error": f"Вкладка не найдена: {tab_id}"
+                }
+            if len(handles) == 1:
+                return {
+                    "success": False,
+                    "error": "Нельзя закрыть последнюю вкладку, используйте browser_stop"
+                }
+            
+            self.driver.switch_to.window(tab_id)
+            self.driver.close()
+            
+            remaining = [handle for handle in handles if handle != tab_id]
+            self.driver.switch_to.window(remaining[-1])
+            self.devtools.reset(remaining[-1])
+            self._blocking_state = None
+            self._leave_page()
+            
+            # Контекст удаляется вместе с последней своей вкладкой
+            context_id = self._tab_contexts.pop(tab_id, None)
+            if context_id and context_id not in self._tab_contexts.values():
+                self.driver.execute_cdp_cmd(
+                    "Target.disposeBrowserContext", {"browserContextId": context_id}
+                )
+            
+            logger.info(f"Вкладка {tab_id} закрыта")
+            return {
+                "success": True,
+                "closed": tab_id,
+                "tab_id": self.driver.current_window_handle,
+                "url": self.driver.current_url
+            }
+        except Exception as e:
+            logger.error(f"Ошибка при закрытии вкладки {tab_id}: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @timed
+    def list_tabs(self) -> Dict[str, Any]:
+        """Список открытых вкладок."""
+        try:
+            if not self.driver:
+                return {
+                    "success": False,
+                    "error": "Браузер не запущен"
+                }
+            
+            handles = self.driver.window_handles
+            current = self.driver.current_window_handle
+            # Один запрос Target.getTargets вместо переключения на каждую вкладку
+            targets = {
+                info["targetId"]: info
+                for info in self.driver.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+            }
+            
+            tabs = []
+            for handle in handles:
+                info = targets.get(handle, {})
+                tabs.append({
+                    "tab_id": handle,
+                    "url": info.get("url"),
+                    "title": info.get("title"),
+                    "isolated": handle in self._tab_contexts,
+                    "current": handle == current
+                })
+            
+            return {
+                "success": True,
+                "count": len(tabs),
+                "tabs": tabs
+            }
+        except Exception as e:
+            logger.error(f"Ошибка при получении списка вкладок: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def get_memory_usage(self) -> Optional[float]:
+        """Объем JS heap текущей страницы в мегабайтах (None если недоступно)."""
+        if not self.driver:
+            return None
+        try:
+            usage = self.devtools.execute("Runtime.getHeapUsage")
+            return usage["usedSize"] / (1024 * 1024)
+        except Exception as e:
+            logger.debug(f"Не удалось получить использование памяти: {e}")
+            return None
+    
+    @timed
+    def free_memory(self) -> Dict[str, Any]:
+        """Очистка кэша браузера и сборка мусора JS текущей вкладки."""
+        try:
+            if not self.driver:
+                return {
+                    "success": False,
+                    "error": "Браузер не запущен"
+                }
+            
+            self.devtools.batch([
+                ("Network.clearBrowserCache", {}),
+                ("HeapProfiler.collectGarbage", {})
+            ])
+            return {
+                "success": True
+            }
+        except Exception as e:
+            logger.error(f"Ошибка при освобождении памяти: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @timed
+    def close_background_tabs(self) -> Dict[str, Any]:
+        """Закрытие всех вкладок, кроме текущей, без переключения на них."""
+        try:
+            if not self.driver:
+                return {
+                    "success": False,
+                    "error": "Браузер не запущен"
+                }
+            
+            current = self.driver.current_window_handle
+            closed = [handle for handle in self.driver.window_handles if handle != current]
+            for tab_id in closed:
+                self.driver.execute_cdp_cmd("Target.closeTarget", {"targetId": tab_id})
+            
+            for context_id in {self._tab_contexts.pop(tab_id, None) for tab_id in closed} - {None}:
+                if context_id not in self._tab_contexts.values():
+                    self.driver.execute_cdp_cmd(
+                        "Target.disposeBrowserContext", {"browserContextId": context_id}
+                    )
+            
+            if closed:
+                logger.info(f"Закрыты фоновые вкладки: {len(closed)}")
+            return {
+                "success": True,
+                "closed": closed,
+                "tab_id": current
+            }
+        except Exception as e:
+            logger.error(f"Ошибка при закрытии фоновых вкладок: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @timed
+    def get_page_info(self) -> Dict[str, Any]:
+        """
+        Состояние текущей страницы одним execute_script.
+        
+        URL, заголовок, readyState, число элементов DOM, размер документа,
+        высота прокрутки и число незавершенных fetch/XHR. DOM страницы не
+        передается, поэтому вызов подходит для частой проверки состояния.
+        """
+        try:
+            if not self.driver:
+                return {
+                    "success": False,
+                    "error": "Браузер не запущен"
+                }
+            
+            return {
+                "success": True,
+                **self.devtools.evaluate(PAGE_INFO_SCRIPT)
             }
         except Exception as e:
             logger.error(f"Ошибка при получении информации о странице: {e}")
@@ -138,10 +885,63 @@ class BrowserManager:
                 "error": str(e)
             }
     
+    def _relocate(self, entry: ElementEntry, condition: str, timeout: float) -> Any:
+        """Повторный поиск элемента, ссылка на который устарела."""
+        if entry.selector is None:
+            raise HandleError("Элемент удален со страницы, получите новую модель get_page_model")
+        if entry.index == 0:
+            return self.waits.wait_for_element(
+                self.driver, entry.selector, entry.by, condition, timeout
+            )
+        by_type = BY_MAPPING.get(entry.by.lower(), By.CSS_SELECTOR)
+        elements = self.driver.find_elements(by_type, entry.selector)
+        if len(elements) <= entry.index:
+            raise NoSuchElementException(
+                f"Элемент {entry.index} не найден: {entry.selector}"
+            )
+        return elements[entry.index]
+    
+    def _with_element(
+        self,
+        selector: Optional[str],
+        by: str,
+        condition: str,
+        timeout: Optional[float],
+        element_id: Optional[str],
+        action: Callable[[Any], Any]
+    ) -> Tuple[Any, str]:
+        """
+        Выполнение action над элементом по element_id или селектору.
+        
+        Элемент из реестра используется без поиска и ожидания. Если ссылка
+        устарела (элемент перерисован на той же странице), элемент ищется
+        заново по исходному селектору, handle остается прежним.
+        
+        Returns:
+            (результат action, handle элемента)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if element_id:
+            entry = self.elements.get(element_id)
+            try:
+                return action(entry.element), element_id
+            except StaleElementReferenceException:
+                logger.debug(f"Ссылка на {element_id} устарела, повторный поиск: {entry.selector}")
+                element = self._relocate(entry, condition, timeout)
+                self.elements.update(element_id, element)
+                return action(element), element_id
+        
+        if not selector:
+            raise ValueError("Нужен selector или element_id")
+        element = self.waits.wait_for_element(self.driver, selector, by, condition, timeout)
+        return action(element), self.elements.register(element, selector, by)
+    
+    @timed
     def find_element(
         self, 
         selector: str, 
-        by: str = "css"
+        by: str = "css",
+        timeout: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Поиск элемента на странице.
@@ -149,6 +949,11 @@ class BrowserManager:
         Args:
             selector: Селектор элемента
             by: Тип селектора (css, xpath, id, name, class, tag)
+            timeout: Таймаут ожидания в секундах (по умолчанию self.timeout)
+        
+        Returns:
+            Информация об элементе и его element_id для click, type_text
+            и get_text
         """
         try:
             if not self.driver:
@@ -157,28 +962,20 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
-            by_mapping = {
-                "css": By.CSS_SELECTOR,
-                "xpath": By.XPATH,
-                "id": By.ID,
-                "name": By.NAME,
-                "class": By.CLASS_NAME,
-                "tag": By.TAG_NAME
-            }
-            
-            by_type = by_mapping.get(by.lower(), By.CSS_SELECTOR)
-            
-            wait = WebDriverWait(self.driver, self.timeout)
-            element = wait.until(
-                EC.presence_of_element_located((by_type, selector))
+            info, element_id = self._with_element(
+                selector, by, "present", timeout, None,
+                lambda element: {
+                    "text": element.text,
+                    "tag": element.tag_name,
+                    "visible": element.is_displayed()
+                }
             )
             
             return {
                 "success": True,
                 "found": True,
-                "text": element.text,
-                "tag": element.tag_name,
-                "visible": element.is_displayed()
+                "element_id": element_id,
+                **info
             }
             
         except TimeoutException:
@@ -194,10 +991,13 @@ class BrowserManager:
                 "error": str(e)
             }
     
+    @timed
     def click(
         self, 
-        selector: str, 
-        by: str = "css"
+        selector: Optional[str] = None, 
+        by: str = "css",
+        timeout: Optional[float] = None,
+        element_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Клик по элементу.
@@ -205,7 +1005,11 @@ class BrowserManager:
         Args:
             selector: Селектор элемента
             by: Тип селектора
+            timeout: Таймаут ожидания в секундах (по умолчанию self.timeout)
+            element_id: Handle из find_element или get_elements_info
+                вместо селектора
         """
+        target = element_id or selector
         try:
             if not self.driver:
                 return {
@@ -213,42 +1017,35 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
-            by_mapping = {
-                "css": By.CSS_SELECTOR,
-                "xpath": By.XPATH,
-                "id": By.ID,
-                "name": By.NAME,
-                "class": By.CLASS_NAME,
-                "tag": By.TAG_NAME
-            }
-            
-            by_type = by_mapping.get(by.lower(), By.CSS_SELECTOR)
-            
-            wait = WebDriverWait(self.driver, self.timeout)
-            element = wait.until(
-                EC.element_to_be_clickable((by_type, selector))
+            _, element_id = self._with_element(
+                selector, by, "clickable", timeout, element_id,
+                lambda element: element.click()
             )
-            element.click()
+            self.snapshots.invalidate()
             
-            logger.info(f"Клик по элементу: {selector}")
+            logger.info(f"Клик по элементу: {target}")
             return {
                 "success": True,
-                "message": f"Выполнен клик по элементу: {selector}"
+                "message": f"Выполнен клик по элементу: {target}",
+                "element_id": element_id
             }
             
         except Exception as e:
-            logger.error(f"Ошибка при клике по {selector}: {e}")
+            logger.error(f"Ошибка при клике по {target}: {e}")
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    @timed
     def type_text(
         self, 
-        selector: str, 
+        selector: Optional[str], 
         text: str, 
         by: str = "css",
-        clear_first: bool = True
+        clear_first: bool = True,
+        timeout: Optional[float] = None,
+        element_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Ввод текста в элемент.
@@ -258,7 +1055,11 @@ class BrowserManager:
             text: Текст для ввода
             by: Тип селектора
             clear_first: Очистить поле перед вводом
+            timeout: Таймаут ожидания в секундах (по умолчанию self.timeout)
+            element_id: Handle из find_element или get_elements_info
+                вместо селектора
         """
+        target = element_id or selector
         try:
             if not self.driver:
                 return {
@@ -266,46 +1067,118 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
-            by_mapping = {
-                "css": By.CSS_SELECTOR,
-                "xpath": By.XPATH,
-                "id": By.ID,
-                "name": By.NAME,
-                "class": By.CLASS_NAME,
-                "tag": By.TAG_NAME
-            }
-            
-            by_type = by_mapping.get(by.lower(), By.CSS_SELECTOR)
+            def send(element) -> None:
+                if clear_first:
+                    element.clear()
+                element.send_keys(text)
             
-            wait = WebDriverWait(self.driver, self.timeout)
-            element = wait.until(
-                EC.presence_of_element_located((by_type, selector))
+            _, element_id = self._with_element(
+                selector, by, "present", timeout, element_id, send
             )
+            self.snapshots.invalidate()
             
-            if clear_first:
-                element.clear()
+            logger.info(f"Введен текст в элемент: {target}")
+            return {
+                "success": True,
+                "message": f"Текст введен в элемент: {target}",
+                "element_id": element_id
+            }
             
-            element.send_keys(text)
+        except Exception as e:
+            logger.error(f"Ошибка при вводе текста в {target}: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @timed
+    def wait_for(
+        self,
+        condition: str = "visible",
+        selector: Optional[str] = None,
+        by: str = "css",
+        timeout: Optional[float] = None,
+        idle_ms: int = 500
+    ) -> Dict[str, Any]:
+        """
+        Ожидание состояния страницы.
+        
+        Args:
+            condition: present, visible, clickable, gone (элемент исчез)
+                или network_idle (нет новых запросов idle_ms миллисекунд)
+            selector: Селектор элемента (не нужен для network_idle)
+            by: Тип селектора
+            timeout: Таймаут в секундах (по умолчанию self.timeout)
+            idle_ms: Длительность простоя сети для network_idle
+        """
+        try:
+            if not self.driver:
+                return {
+                    "success": False,
+                    "error": "Браузер не запущен"
+                }
+            
+            timeout = self.timeout if timeout is None else timeout
+            started_at = time.perf_counter()
+            
+            if condition == "network_idle":
+                satisfied = self.waits.wait_for_network_idle(self.driver, idle_ms, timeout)
+            elif not selector:
+                return {
+                    "success": False,
+                    "error": f"Для условия {condition} нужен селектор"
+                }
+            else:
+                try:
+                    self.waits.wait_for_element(self.driver, selector, by, condition, timeout)
+                    satisfied = True
+                except TimeoutException:
+                    satisfied = False
             
-            logger.info(f"Введен текст в элемент: {selector}")
             return {
                 "success": True,
-                "message": f"Текст введен в элемент: {selector}"
+                "condition": condition,
+                "satisfied": satisfied,
+                "elapsed_ms": round((time.perf_counter() - started_at) * 1000, 1)
             }
             
         except Exception as e:
-            logger.error(f"Ошибка при вводе текста в {selector}: {e}")
+            logger.error(f"Ошибка при ожидании {condition}: {e}")
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    def screenshot(self, filename: Optional[str] = None) -> Dict[str, Any]:
+    @timed
+    def screenshot(
+        self,
+        filename: Optional[str] = None,
+        format: Optional[str] = None,
+        quality: Optional[int] = None,
+        selector: Optional[str] = None,
+        by: str = "css",
+        clip: Optional[Dict[str, float]] = None,
+        scale: Optional[float] = None,
+        full_page: bool = False,
+        return_image: bool = True
+    ) -> Dict[str, Any]:
         """
-        Создание скриншота страницы.
+        Создание скриншота страницы через Page.captureScreenshot.
+        
+        Снимок делается один раз: одни и те же данные возвращаются и
+        сохраняются в файл.
         
         Args:
             filename: Имя файла для сохранения (опционально)
+            format: png, jpeg или webp (по умолчанию из screenshot_defaults)
+            quality: Качество jpeg и webp, 0-100
+            selector: Снять только область элемента
+            by: Тип селектора
+            clip: Снять прямоугольник {"x", "y", "width", "height"} в CSS
+                пикселях документа
+            scale: Масштаб изображения (0.5 - вдвое меньше по каждой стороне)
+            full_page: Снять всю страницу, а не только видимую область
+            return_image: Вернуть изображение в ответе (False - только файл)
         """
         try:
             if not self.driver:
@@ -314,16 +1187,52 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
-            screenshot_base64 = self.driver.get_screenshot_as_base64()
+            format = (format or self.screenshot_defaults["format"]).lower()
+            if format not in SCREENSHOT_FORMATS:
+                return {
+                    "success": False,
+                    "error": f"Неизвестный формат: {format}. Допустимые: {', '.join(SCREENSHOT_FORMATS)}"
+                }
+            scale = scale or self.screenshot_defaults["scale"]
+            
+            # URL и область снимка одним вызовом
+            area = self.devtools.evaluate(
+                SCREENSHOT_AREA_SCRIPT,
+                selector, by.lower(), full_page
+            )
+            if clip:
+                area["clip"] = {key: clip[key] for key in ("x", "y", "width", "height")}
+            elif area["clip"] is None:
+                return {
+                    "success": False,
+                    "error": f"Элемент не найден: {selector}"
+                }
+            
+            params: Dict[str, Any] = {
+                "format": format,
+                "clip": {**area["clip"], "scale": scale},
+                # Область за пределами окна (элемент ниже видимой части, вся страница)
+                "captureBeyondViewport": bool(selector or clip or full_page)
+            }
+            if format != "png":
+                params["quality"] = quality if quality is not None else self.screenshot_defaults["quality"]
+            
+            data = self.devtools.execute("Page.captureScreenshot", params)["data"]
             
             result = {
                 "success": True,
-                "screenshot_base64": screenshot_base64,
-                "url": self.driver.current_url
+                "mime_type": SCREENSHOT_FORMATS[format],
+                "clip": area["clip"],
+                "scale": scale,
+                "size_bytes": len(data) * 3 // 4 - data[-2:].count("="),
+                "url": area["url"]
             }
+            if return_image:
+                result["screenshot_base64"] = data
             
             if filename:
-                self.driver.save_screenshot(filename)
+                with open(filename, "wb") as f:
+                    f.write(base64.b64decode(data))
                 result["filename"] = filename
                 logger.info(f"Скриншот сохранен: {filename}")
             
@@ -336,6 +1245,7 @@ class BrowserManager:
                 "error": str(e)
             }
     
+    @timed
     def execute_script(self, script: str) -> Dict[str, Any]:
         """
         Выполнение JavaScript на странице.
@@ -350,7 +1260,11 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
+            # Через WebDriver: Promise дожидается, элементы DOM возвращаются
+            # как WebElement, открытый alert сразу дает ошибку
             result = self.driver.execute_script(script)
+            # Скрипт мог изменить состояние, не видимое MutationObserver
+            self.snapshots.invalidate()
             
             logger.info("JavaScript выполнен")
             return {
@@ -365,14 +1279,25 @@ class BrowserManager:
                 "error": str(e)
             }
     
-    def get_text(self, selector: str, by: str = "css") -> Dict[str, Any]:
+    @timed
+    def get_text(
+        self,
+        selector: Optional[str] = None,
+        by: str = "css",
+        timeout: Optional[float] = None,
+        element_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Получение текста элемента.
         
         Args:
             selector: Селектор элемента
             by: Тип селектора
+            timeout: Таймаут ожидания в секундах (по умолчанию self.timeout)
+            element_id: Handle из find_element или get_elements_info
+                вместо селектора
         """
+        target = element_id or selector
         try:
             if not self.driver:
                 return {
@@ -380,34 +1305,25 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
-            by_mapping = {
-                "css": By.CSS_SELECTOR,
-                "xpath": By.XPATH,
-                "id": By.ID,
-                "name": By.NAME,
-                "class": By.CLASS_NAME,
-                "tag": By.TAG_NAME
-            }
-            
-            by_type = by_mapping.get(by.lower(), By.CSS_SELECTOR)
-            
-            wait = WebDriverWait(self.driver, self.timeout)
-            element = wait.until(
-                EC.presence_of_element_located((by_type, selector))
+            text, element_id = self._with_element(
+                selector, by, "present", timeout, element_id,
+                lambda element: element.text
             )
             
             return {
                 "success": True,
-                "text": element.text
+                "text": text,
+                "element_id": element_id
             }
             
         except Exception as e:
-            logger.error(f"Ошибка при получении текста из {selector}: {e}")
+            logger.error(f"Ошибка при получении текста из {target}: {e}")
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    @timed
     def back(self) -> Dict[str, Any]:
         """Возврат на предыдущую страницу."""
         try:
@@ -418,6 +1334,7 @@ class BrowserManager:
                 }
             
             self.driver.back()
+            self._leave_page()
             return {
                 "success": True,
                 "url": self.driver.current_url
@@ -429,6 +1346,7 @@ class BrowserManager:
                 "error": str(e)
             }
     
+    @timed
     def forward(self) -> Dict[str, Any]:
         """Переход на следующую страницу."""
         try:
@@ -439,6 +1357,7 @@ class BrowserManager:
                 }
             
             self.driver.forward()
+            self._leave_page()
             return {
                 "success": True,
                 "url": self.driver.current_url
@@ -450,6 +1369,7 @@ class BrowserManager:
                 "error": str(e)
             }
     
+    @timed
     def refresh(self) -> Dict[str, Any]:
         """Обновление страницы."""
         try:
@@ -460,6 +1380,7 @@ class BrowserManager:
                 }
             
             self.driver.refresh()
+            self._leave_page()
             return {
                 "success": True,
                 "url": self.driver.current_url
@@ -471,12 +1392,146 @@ class BrowserManager:
                 "error": str(e)
             }
     
-    def get_page_html(self, clean: bool = True) -> Dict[str, Any]:
+    def _leave_page(self) -> None:
+        """
+        Переход на другую страницу или вкладку: handles элементов прежней
+        недействительны (повторный поиск по селектору нашел бы элемент
+        новой страницы), снимки не переиспользуются.
+        """
+        self.elements.clear()
+        self.snapshots.invalidate()
+    
+    def _page_version(self) -> Optional[Dict[str, Any]]:
+        """URL, заголовок и версия DOM текущей страницы (None если недоступно)."""
+        try:
+            return self.devtools.evaluate(DOM_VERSION_SCRIPT)
+        except Exception as e:
+            logger.debug(f"Не удалось получить версию DOM: {e}")
+            return None
+    
+    @staticmethod
+    def _version_tag(version: Any) -> str:
+        """Версия DOM для курсора: из состояния страницы или версии снимка."""
+        if isinstance(version, dict):
+            version = (version["document"], version["version"])
+        if not version or version[0] is None:
+            return ""
+        return f"{version[0]}.{version[1]}"
+    
+    def _snapshot(
+        self,
+        kind: Hashable,
+        extract: Callable[[], Tuple[Any, Dict[str, Any]]],
+        use_cache: bool = True
+    ) -> Tuple[Snapshot, bool]:
+        """
+        Снимок страницы из кэша или новое извлечение.
+        
+        Снимок переиспользуется, пока не изменились URL, документ и счетчик
+        изменений DOM, и после действий на странице (invalidate) не
+        используется.
+        
+        Args:
+            kind: Вид содержимого
+            extract: Извлечение содержимого со страницы -> (content, meta)
+            use_cache: Использовать и сохранять снимки
+        
+        Returns:
+            Снимок и признак того, что он взят из кэша
+        """
+        if not use_cache:
+            content, meta = extract()
+            return Snapshot("", content, meta), False
+        
+        # Версия читается до извлечения: изменения во время него дадут промах
+        state = self._page_version()
+        key = (kind, state["url"] if state else None)
+        version = (state["document"], state["version"]) if state else None
+        
+        snapshot = self.snapshots.lookup(key, version)
+        if snapshot is not None:
+            return snapshot, True
+        
+        content, meta = extract()
+        return self.snapshots.put(key, content, meta, version), False
+    
+    def _paged_content(
+        self,
+        kind: Tuple[str, bool],
+        field: str,
+        extract: Callable[[], Tuple[str, Dict[str, Any]]],
+        offset: int,
+        max_length: Optional[int],
+        cursor: Optional[str],
+        use_cache: bool
+    ) -> Dict[str, Any]:
+        """
+        Постраничная выдача извлеченного содержимого.
+        
+        Args:
+            kind: Вид содержимого
+            field: Имя поля ответа с содержимым
+            extract: Извлечение содержимого со страницы -> (content, meta)
+            offset: Начало фрагмента
+            max_length: Максимальная длина фрагмента (None - self.max_text_length, 0 - без ограничения)
+            cursor: Курсор продолжения из предыдущего ответа
+            use_cache: Переиспользовать снимок без изменений DOM и сохранить
+                его для чтения продолжения по курсору
+        """
+        max_length = self.max_text_length if max_length is None else max_length
+        kind_tag = f"{kind[0]}{int(kind[1])}"
+        
+        if cursor:
+            # Продолжение читается из кэша без повторного извлечения
+            cursor_kind, snapshot_id, version_tag, offset = parse_cursor(cursor)
+            if cursor_kind != kind_tag:
+                raise CursorError("Курсор выдан для другого вида содержимого, передайте его в тот же инструмент с теми же параметрами")
+            snapshot = self.snapshots.get(snapshot_id)
+            if snapshot is None:
+                raise CursorError("Снимок страницы устарел, запросите содержимое заново без cursor")
+            if version_tag and version_tag != self._version_tag(self._page_version()):
+                raise CursorError("Страница изменилась после выдачи курсора, запросите содержимое заново без cursor")
+            cached = True
+        else:
+            snapshot, cached = self._snapshot(kind, extract, use_cache)
+            version_tag = self._version_tag(snapshot.version)
+        
+        part, next_offset = chunk(snapshot.content, offset, max_length)
+        result = {
+            "success": True,
+            field: part,
+            "length": len(snapshot.content),
+            "offset": offset,
+            **snapshot.meta,
+            "cached": cached
+        }
+        if next_offset is not None:
+            result["truncated"] = True
+            result["next_offset"] = next_offset
+            if snapshot.snapshot_id:
+                result["next_cursor"] = make_cursor(kind_tag, snapshot.snapshot_id, version_tag, next_offset)
+        return result
+    
+    @timed
+    def get_page_html(
+        self,
+        clean: bool = True,
+        offset: int = 0,
+        max_length: Optional[int] = None,
+        cursor: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
         """
         Получение HTML кода страницы.
         
         Args:
             clean: Очистить скрипты и стили для уменьшения размера
+            offset: Начало возвращаемого фрагмента
+            max_length: Максимальная длина фрагмента (по умолчанию
+                self.max_text_length, 0 - без ограничения)
+            cursor: Курсор продолжения (next_cursor предыдущего ответа)
+            use_cache: Переиспользовать снимок, если DOM не изменился, и
+                сохранить его на сервере для чтения по курсору
         """
         try:
             if not self.driver:
@@ -485,23 +1540,21 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
-            if clean:
-                # Получаем HTML без script и style тегов для меньшего размера
-                html = self.driver.execute_script("""
-                    const clone = document.documentElement.cloneNode(true);
-                    clone.querySelectorAll('script, style, noscript').forEach(el => el.remove());
-                    return clone.outerHTML;
-                """)
-            else:
+            def extract() -> Tuple[str, Dict[str, Any]]:
+                if clean:
+                    # Получаем HTML без script и style тегов для меньшего размера
+                    page = self.devtools.evaluate("""
+                        const clone = document.documentElement.cloneNode(true);
+                        clone.querySelectorAll('script, style, noscript').forEach(el => el.remove());
+                        return {html: clone.outerHTML, url: location.href, title: document.title};
+                    """)
+                    return page["html"], {"url": page["url"], "title": page["title"]}
                 html = self.driver.page_source
+                return html, {"url": self.driver.current_url, "title": self.driver.title}
             
-            return {
-                "success": True,
-                "html": html,
-                "length": len(html),
-                "url": self.driver.current_url,
-                "title": self.driver.title
-            }
+            return self._paged_content(
+                ("html", clean), "html", extract, offset, max_length, cursor, use_cache
+            )
             
         except Exception as e:
             logger.error(f"Ошибка при получении HTML: {e}")
@@ -510,12 +1563,26 @@ class BrowserManager:
                 "error": str(e)
             }
     
-    def get_all_text(self, visible_only: bool = True) -> Dict[str, Any]:
+    @timed
+    def get_all_text(
+        self,
+        visible_only: bool = True,
+        offset: int = 0,
+        max_length: Optional[int] = None,
+        cursor: Optional[str] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
         """
         Получение всего текстового содержимого страницы.
         
         Args:
             visible_only: Получить только видимый текст
+            offset: Начало возвращаемого фрагмента
+            max_length: Максимальная длина фрагмента (по умолчанию
+                self.max_text_length, 0 - без ограничения)
+            cursor: Курсор продолжения (next_cursor предыдущего ответа)
+            use_cache: Переиспользовать снимок, если DOM не изменился, и
+                сохранить его на сервере для чтения по курсору
         """
         try:
             if not self.driver:
@@ -524,36 +1591,79 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
-            if visible_only:
-                # Получаем только видимый текст
-                text = self.driver.execute_script("""
-                    return document.body.innerText;
-                """)
-            else:
-                # Получаем весь текст включая скрытый
-                text = self.driver.execute_script("""
-                    return document.body.textContent;
-                """)
+            def extract() -> Tuple[str, Dict[str, Any]]:
+                if visible_only:
+                    # Получаем только видимый текст
+                    page = self.devtools.evaluate("""
+                        return {text: document.body.innerText, url: location.href};
+                    """)
+                else:
+                    # Получаем весь текст включая скрытый
+                    page = self.devtools.evaluate("""
+                        return {text: document.body.textContent, url: location.href};
+                    """)
+                return page["text"], {"url": page["url"]}
+            
+            return self._paged_content(
+                ("text", visible_only), "text", extract, offset, max_length, cursor, use_cache
+            )
+            
+        except Exception as e:
+            logger.error(f"Ошибка при получении текста: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @timed
+    def get_page_changes(self, max_items: int = 50) -> Dict[str, Any]:
+        """
+        Изменения страницы с последнего чтения (get_all_text, get_page_html,
+        get_page_structure) или вызова get_page_changes.
+        
+        Изменения собираются MutationObserver на странице, поэтому размер
+        ответа зависит от объема изменений, а не от размера страницы.
+        
+        Args:
+            max_items: Максимальное число элементов в каждом списке ответа
+        """
+        try:
+            if not self.driver:
+                return {
+                    "success": False,
+                    "error": "Браузер не запущен"
+                }
+            
+            changes = self.devtools.evaluate(PAGE_CHANGES_SCRIPT, max_items)
+            if changes["baseline"]:
+                changes["message"] = (
+                    "Изменения страницы отслеживаются с этого момента, "
+                    "текущее содержимое получите через get_all_text или get_page_structure"
+                )
+            elif changes["overflow"]:
+                changes["message"] = "Слишком много изменений, прочитайте страницу целиком"
             
             return {
                 "success": True,
-                "text": text,
-                "length": len(text),
-                "url": self.driver.current_url
+                **changes
             }
             
         except Exception as e:
-            logger.error(f"Ошибка при получении текста: {e}")
+            logger.error(f"Ошибка при получении изменений страницы: {e}")
             return {
                 "success": False,
                 "error": str(e)
             }
     
+    @timed
     def get_elements_info(
         self, 
         selector: str, 
         by: str = "css",
-        max_elements: int = 50
+        max_elements: int = 50,
+        offset: int = 0,
+        attributes: Optional[List[str]] = None,
+        use_script: bool = True
     ) -> Dict[str, Any]:
         """
         Получение информации о нескольких элементах.
@@ -562,6 +1672,14 @@ class BrowserManager:
             selector: Селектор элементов
             by: Тип селектора
             max_elements: Максимальное количество элементов
+            offset: Количество пропускаемых элементов (для постраничного чтения)
+            attributes: Список атрибутов (по умолчанию id, class, href, src, type, value)
+            use_script: Собрать данные одним execute_script вместо
+                ~12 запросов WebDriver на каждый элемент
+        
+        Returns:
+            Данные элементов, у каждого element_id для click, type_text
+            и get_text
         """
         try:
             if not self.driver:
@@ -570,47 +1688,30 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
-            by_mapping = {
-                "css": By.CSS_SELECTOR,
-                "xpath": By.XPATH,
-                "id": By.ID,
-                "name": By.NAME,
-                "class": By.CLASS_NAME,
-                "tag": By.TAG_NAME
-            }
-            
-            by_type = by_mapping.get(by.lower(), By.CSS_SELECTOR)
-            
-            elements = self.driver.find_elements(by_type, selector)
+            attributes = list(attributes or DEFAULT_ELEMENT_ATTRIBUTES)
             
-            # Ограничиваем количество элементов
-            elements = elements[:max_elements]
-            
-            elements_data = []
-            for idx, element in enumerate(elements):
-                try:
-                    elements_data.append({
-                        "index": idx,
-                        "tag": element.tag_name,
-                        "text": element.text[:200] if element.text else "",  # Ограничиваем длину
-                        "visible": element.is_displayed(),
-                        "enabled": element.is_enabled(),
-                        "attributes": {
-                            "id": element.get_attribute("id"),
-                            "class": element.get_attribute("class"),
-                            "href": element.get_attribute("href"),
-                            "src": element.get_attribute("src"),
-                            "type": element.get_attribute("type"),
-                            "value": element.get_attribute("value"),
-                        }
-                    })
-                except:
-                    # Пропускаем элементы с ошибками
-                    continue
+            if use_script:
+                data = self.driver.execute_script(
+                    ELEMENTS_INFO_SCRIPT,
+                    selector, by.lower(), offset, max_elements, attributes
+                )
+                total = data["total"]
+                elements_data = data["elements"]
+                for info, element in zip(elements_data, data["nodes"]):
+                    info["element_id"] = self.elements.register(
+                        element, selector, by, info["index"]
+                    )
+            else:
+                total, elements_data = self._get_elements_info_webdriver(
+                    selector, by, max_elements, offset, attributes
+                )
             
             return {
                 "success": True,
                 "count": len(elements_data),
+                "total": total,
+                "offset": offset,
+                "has_more": offset + len(elements_data) < total,
                 "elements": elements_data,
                 "selector": selector
             }
@@ -622,10 +1723,118 @@ class BrowserManager:
                 "error": str(e)
             }
     
-    def get_page_structure(self) -> Dict[str, Any]:
+    def _get_elements_info_webdriver(
+        self,
+        selector: str,
+        by: str,
+        max_elements: int,
+        offset: int,
+        attributes: List[str]
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Сбор информации об элементах отдельными командами WebDriver."""
+        by_type = BY_MAPPING.get(by.lower(), By.CSS_SELECTOR)
+        
+        elements = self.driver.find_elements(by_type, selector)
+        total = len(elements)
+        
+        # Ограничиваем количество элементов
+        elements = elements[offset:offset + max_elements]
+        
+        elements_data = []
+        for idx, element in enumerate(elements, start=offset):
+            try:
+                text = element.text
+                elements_data.append({
+                    "index": idx,
+                    "element_id": self.elements.register(element, selector, by, idx),
+                    "tag": element.tag_name,
+                    "text": text[:200] if text else "",  # Ограничиваем длину
+                    "visible": element.is_displayed(),
+                    "enabled": element.is_enabled(),
+                    "attributes": {
+                        name: element.get_attribute(name) for name in attributes
+                    }
+                })
+            except:
+                # Пропускаем элементы с ошибками
+                continue
+        
+        return total, elements_data
+    
+    @timed
+    def get_page_model(
+        self,
+        max_elements: int = 200,
+        visible_only: bool = False,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Пронумерованный список интерактивных элементов страницы.
+        
+        Строится одним вызовом DOMSnapshot.captureSnapshot: включает кнопки,
+        ссылки, поля ввода, ARIA виджеты и элементы с обработчиками click,
+        в том числе внутри shadow root и iframe того же процесса.
+        
+        Args:
+            max_elements: Максимальное количество элементов
+            visible_only: Только видимые элементы
+            use_cache: Вернуть сохраненный снимок, если DOM не изменился
+        
+        Returns:
+            Элементы с ролью, именем, областью (x, y, ширина, высота в CSS
+            пикселях документа), видимостью и element_id для click,
+            type_text и get_text
+        """
+        try:
+            if not self.driver:
+                return {
+                    "success": False,
+                    "error": "Браузер не запущен"
+                }
+            
+            def extract() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+                capture = self.devtools.execute(
+                    "DOMSnapshot.captureSnapshot", {"computedStyles": COMPUTED_STYLES}
+                )
+                elements, total = build_page_model(capture, max_elements, visible_only)
+                return {"elements": elements, "total": total}, {}
+            
+            snapshot, cached = self._snapshot(("model", max_elements, visible_only), extract, use_cache)
+            
+            # Регистрация и для снимка из кэша: его element_id могли быть вытеснены
+            elements = []
+            for index, element in enumerate(snapshot.content["elements"]):
+                node = NodeElement(self.devtools, element["backend_node_id"], element["tag"])
+                item = {key: value for key, value in element.items() if key != "backend_node_id"}
+                elements.append({
+                    "index": index,
+                    "element_id": self.elements.register(node, None, "node", index),
+                    **item
+                })
+            
+            return {
+                "success": True,
+                "count": len(elements),
+                "total": snapshot.content["total"],
+                "elements": elements,
+                "cached": cached
+            }
+            
+        except Exception as e:
+            logger.error(f"Ошибка при построении модели страницы: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @timed
+    def get_page_structure(self, use_cache: bool = True) -> Dict[str, Any]:
         """
         Получение структурированной информации о странице.
         Возвращает заголовки, ссылки, формы, изображения и т.д.
+        
+        Args:
+            use_cache: Вернуть сохраненный снимок, если DOM не изменился
         """
         try:
             if not self.driver:
@@ -634,45 +1843,50 @@ class BrowserManager:
                     "error": "Браузер не запущен"
                 }
             
-            structure = self.driver.execute_script("""
-                return {
-                    url: window.location.href,
-                    title: document.title,
-                    headings: {
-                        h1: Array.from(document.querySelectorAll('h1')).map(h => h.textContent.trim()).slice(0, 10),
-                        h2: Array.from(document.querySelectorAll('h2')).map(h => h.textContent.trim()).slice(0, 20),
-                        h3: Array.from(document.querySelectorAll('h3')).map(h => h.textContent.trim()).slice(0, 20)
-                    },
-                    links: Array.from(document.querySelectorAll('a[href]')).slice(0, 50).map(a => ({
-                        text: a.textContent.trim().substring(0, 100),
-                        href: a.href,
-                        internal: a.hostname === window.location.hostname
-                    })),
-                    images: Array.from(document.querySelectorAll('img[src]')).slice(0, 30).map(img => ({
-                        src: img.src,
-                        alt: img.alt
-                    })),
-                    forms: Array.from(document.querySelectorAll('form')).slice(0, 10).map(form => ({
-                        action: form.action,
-                        method: form.method,
-                        inputs: Array.from(form.querySelectorAll('input, textarea, select')).map(input => ({
-                            type: input.type,
-                            name: input.name,
-                            id: input.id,
-                            placeholder: input.placeholder
-                        }))
-                    })),
-                    meta: {
-                        description: document.querySelector('meta[name="description"]')?.content || '',
-                        keywords: document.querySelector('meta[name="keywords"]')?.content || '',
-                        viewport: document.querySelector('meta[name="viewport"]')?.content || ''
-                    }
-                };
-            """)
+            def extract() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+                structure = self.devtools.evaluate("""
+                    return {
+                        url: window.location.href,
+                        title: document.title,
+                        headings: {
+                            h1: Array.from(document.querySelectorAll('h1')).map(h => h.textContent.trim()).slice(0, 10),
+                            h2: Array.from(document.querySelectorAll('h2')).map(h => h.textContent.trim()).slice(0, 20),
+                            h3: Array.from(document.querySelectorAll('h3')).map(h => h.textContent.trim()).slice(0, 20)
+                        },
+                        links: Array.from(document.querySelectorAll('a[href]')).slice(0, 50).map(a => ({
+                            text: a.textContent.trim().substring(0, 100),
+                            href: a.href,
+                            internal: a.hostname === window.location.hostname
+                        })),
+                        images: Array.from(document.querySelectorAll('img[src]')).slice(0, 30).map(img => ({
+                            src: img.src,
+                            alt: img.alt
+                        })),
+                        forms: Array.from(document.querySelectorAll('form')).slice(0, 10).map(form => ({
+                            action: form.action,
+                            method: form.method,
+                            inputs: Array.from(form.querySelectorAll('input, textarea, select')).map(input => ({
+                                type: input.type,
+                                name: input.name,
+                                id: input.id,
+                                placeholder: input.placeholder
+                            }))
+                        })),
+                        meta: {
+                            description: document.querySelector('meta[name="description"]')?.content || '',
+                            keywords: document.querySelector('meta[name="keywords"]')?.content || '',
+                            viewport: document.querySelector('meta[name="viewport"]')?.content || ''
+                        }
+                    };
+                """)
+                return structure, {}
+            
+            snapshot, cached = self._snapshot("structure", extract, use_cache)
             
             return {
                 "success": True,
-                "structure": structure
+                "structure": snapshot.content,
+                "cached": cached
             }
             
         except Exception as e:
@@ -0,0 +1,281 @@
+"""Пул браузеров Chrome с привязкой к сессиям."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from browser_manager import BrowserManager
+from memory import MemoryGovernor
+
+logger = logging.getLogger(__name__)
+
+
+class PoolExhaustedError(Exception):
+    """В пуле нет свободных браузеров."""
+
+
+@dataclass
+class _Lease:
+    """Браузер, закрепленный за сессией."""
+
+    browser: BrowserManager
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class BrowserPool:
+    """
+    Пул экземпляров BrowserManager.
+
+    Каждая сессия (MCP сессия или явный session_id) получает собственный
+    браузер и работает с ним до освобождения. Пул заранее запускает
+    size браузеров, пересоздает их после max_navigations переходов и
+    закрывает простаивающие сессии. Замеры и лимиты памяти, а также
+    перезапуск с восстановлением сессии выполняет MemoryGovernor (memory).
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], BrowserManager] = BrowserManager,
+        size: int = 0,
+        max_size: int = 4,
+        max_navigations: int = 0,
+        idle_timeout: float = 900,
+        memory: Optional[MemoryGovernor] = None
+    ):
+        """
+        Инициализация пула.
+
+        Args:
+            factory: Функция создания BrowserManager
+            size: Количество заранее запущенных браузеров
+            max_size: Максимальное количество браузеров
+            max_navigations: Пересоздавать браузер после N переходов (0 - никогда)
+            idle_timeout: Освобождать сессии без вызовов дольше N секунд
+            memory: Замеры и лимиты памяти браузеров сессий (по умолчанию
+                без замеров и лимитов)
+        """
+        self.factory = factory
+        self.size = size
+        self.max_size = max_size
+        self.max_navigations = max_navigations
+        self.idle_timeout = idle_timeout
+        self.memory = memory if memory is not None else MemoryGovernor()
+
+        self._idle: List[BrowserManager] = []
+        self._leases: Dict[str, _Lease] = {}
+        self._starting = 0
+        self._lock = threading.Lock()
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._leases) + self._starting
+
+    def warm_up(self) -> Dict[str, Any]:
+        """Запуск браузеров до size свободных экземпляров."""
+        started = 0
+        while True:
+            with self._lock:
+                if len(self._idle) + self._starting >= self.size or self._total() >= self.max_size:
+                    break
+                self._starting += 1
+
+            browser = self.factory()
+            result = browser.start()
+
+            with self._lock:
+                self._starting -= 1
+                if result["success"]:
+                    self._idle.append(browser)
+                    started += 1
+
+            if not result["success"]:
+                logger.error(f"Не удалось запустить браузер для пула: {result['error']}")
+                break
+
+        if started:
+            logger.info(f"Пул браузеров: запущено {started}, свободно {len(self._idle)}")
+        return {
+            "success": True,
+            "started": started,
+            "idle": len(self._idle)
+        }
+
+    def needs_warm_up(self) -> bool:
+        """Свободных и запускаемых браузеров меньше size."""
+        with self._lock:
+            return (
+                len(self._idle) + self._starting < self.size
+                and self._total() < self.max_size
+            )
+
+    def acquire(self, session_id: str) -> BrowserManager:
+        """
+        Получение браузера сессии.
+
+        Повторные вызовы с тем же session_id возвращают тот же браузер.
+
+        Raises:
+            PoolExhaustedError: Если все max_size браузеров заняты
+        """
+        with self._lock:
+            lease = self._leases.get(session_id)
+            if lease is None:
+                if self._idle:
+                    browser = self._idle.pop()
+                elif self._total() < self.max_size:
+                    # Браузер запустится при первом browser_start/navigate
+                    browser = self.factory()
+                else:
+                    raise PoolExhaustedError(
+                        f"Все браузеры пула заняты ({self.max_size})"
+                    )
+                lease = _Lease(browser)
+                self._leases[session_id] = lease
+                logger.info(f"Браузер выдан сессии {session_id}")
+
+            lease.last_used = time.monotonic()
+            return lease.browser
+
+    def acquire_idle(self, session_id: str) -> Optional[BrowserManager]:
+        """
+        Выдача сессии уже запущенного свободного браузера.
+
+        Returns:
+            Браузер (None - свободных запущенных браузеров нет)
+        """
+        with self._lock:
+            if session_id in self._leases or not self._idle:
+                return None
+            browser = self._idle.pop()
+            self._leases[session_id] = _Lease(browser)
+        logger.info(f"Браузер выдан сессии {session_id}")
+        return browser
+
+    def release(self, session_id: str) -> None:
+        """
+        Освобождение браузера сессии.
+
+        Браузер останавливается, чтобы cookies и storage сессии не
+        достались следующей. Пул пополняется вызовом warm_up.
+        """
+        with self._lock:
+            lease = self._leases.pop(session_id, None)
+
+        if lease:
+            with lease.browser.lock:
+                lease.browser.stop()
+            self.memory.forget(session_id)
+            logger.info(f"Браузер сессии {session_id} освобожден")
+
+    def replace(self, session_id: str) -> Optional[BrowserManager]:
+        """
+        Замена браузера сессии, вызов в котором превысил таймаут.
+
+        Зависший вызов держит блокировку браузера, поэтому следующий вызов
+        сессии получает новый BrowserManager: он перезапускается с
+        восстановлением сессии (restart_pending), не дожидаясь старого.
+        Старый браузер останавливается, когда зависший вызов завершится.
+
+        Returns:
+            Новый браузер сессии (None - сессия не найдена)
+        """
+        with self._lock:
+            lease = self._leases.get(session_id)
+            if lease is None:
+                return None
+            old = lease.browser
+            browser = self.factory()
+            browser.session_state = dict(old.session_state)
+            browser.restart_count = old.restart_count
+            browser.restart_pending = old.driver is not None
+            lease.browser = browser
+
+        logger.warning(f"Вызов в браузере сессии {session_id} завис, браузер заменен")
+        threading.Thread(
+            target=self._stop_when_free, args=(old,), name="browser-stop", daemon=True
+        ).start()
+        return browser
+
+    @staticmethod
+    def _stop_when_free(browser: BrowserManager) -> None:
+        with browser.lock:
+            browser.stop()
+
+    def recycle_if_needed(self, browser: BrowserManager) -> bool:
+        """
+        Пересоздание браузера при превышении лимитов.
+
+        Вызывается из рабочего потока после выполнения инструмента.
+
+        Returns:
+            True если браузер был перезапущен
+        """
+        if not browser.driver:
+            return False
+
+        recycled = False
+        if self.max_navigations and browser.navigation_count >= self.max_navigations:
+            logger.info(f"Пересоздание браузера: {browser.navigation_count} переходов")
+            self.memory.recycle(browser)
+            recycled = True
+
+        session_id = self._session_of(browser)
+        if session_id is not None:
+            # После перезапуска замер обновляется сразу
+            recycled = "recycle" in self.memory.check(browser, session_id, force=recycled) or recycled
+        return recycled
+
+    def _session_of(self, browser: BrowserManager) -> Optional[str]:
+        with self._lock:
+            for session_id, lease in self._leases.items():
+                if lease.browser is browser:
+                    return session_id
+        return None
+
+    def reap_idle(self) -> List[str]:
+        """Освобождение сессий, простаивающих дольше idle_timeout."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                session_id for session_id, lease in self._leases.items()
+                if now - lease.last_used > self.idle_timeout
+            ]
+
+        for session_id in expired:
+            logger.info(f"Сессия {session_id} простаивает, браузер закрывается")
+            self.release(session_id)
+
+        if expired:
+            self.warm_up()
+        return expired
+
+    def stats(self) -> Dict[str, Any]:
+        """Состояние пула."""
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "leased": len(self._leases),
+                "starting": self._starting,
+                "max_size": self.max_size,
+                "sessions": {
+                    session_id: {
+                        "running": lease.browser.driver is not None,
+                        "navigations": lease.browser.navigation_count,
+                        "restarts": lease.browser.restart_count,
+                        "startup_ms": lease.browser.startup_ms,
+                        "idle_seconds": round(time.monotonic() - lease.last_used, 1)
+                    }
+                    for session_id, lease in self._leases.items()
+                }
+            }
+
+    def shutdown(self) -> None:
+        """Остановка всех браузеров пула."""
+        with self._lock:
+            browsers = self._idle + [lease.browser for lease in self._leases.values()]
+            self._idle = []
+            self._leases = {}
+
+        for browser in browsers:
+            browser.stop()
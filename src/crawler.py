@@ -0,0 +1,177 @@
+"""Параллельная загрузка нескольких страниц и извлечение данных."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from dispatcher import ToolTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Режимы извлечения: mode -> (browser, max_length) -> dict
+EXTRACTORS: Dict[str, Callable[[Any, int], Dict[str, Any]]] = {
+    "text": lambda b, n: b.get_all_text(max_length=n, use_cache=False),
+    "html": lambda b, n: b.get_page_html(max_length=n, use_cache=False),
+    "structure": lambda b, n: b.get_page_structure(use_cache=False),
+    "model": lambda b, n: b.get_page_model(visible_only=True, use_cache=False),
+    "info": lambda b, n: b.get_page_info(),
+}
+
+# Служебные поля ответов извлечения, не нужные в результатах пакета
+_DROPPED_FIELDS = ("success", "cached", "snapshot_id", "next_cursor")
+
+
+def fetch_page(
+    browser: Any,
+    url: str,
+    mode: str = "text",
+    max_length: int = 20000,
+    timeout: Optional[float] = None,
+    block_resources: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Переход по URL и извлечение данных (блокирующий вызов).
+
+    Args:
+        browser: BrowserManager
+        url: Адрес страницы
+        mode: text, html, structure, model или info
+        max_length: Максимальная длина text и html
+        timeout: Таймаут загрузки страницы и ожидания ее готовности, секунд
+        block_resources: Не загружать ресурсы этих типов
+    """
+    started_at = time.perf_counter()
+    page = browser.navigate(url, block_resources=block_resources, timeout=timeout, load_timeout=timeout)
+    if not page["success"]:
+        return {"url": url, "success": False, "error": page["error"]}
+
+    extracted = EXTRACTORS[mode](browser, max_length)
+    if not extracted["success"]:
+        return {"url": url, "success": False, "error": extracted["error"]}
+
+    result = {
+        "url": url,
+        "success": True,
+        "final_url": page["url"],
+        "title": page["title"],
+        "completed": page["completed"],
+    }
+    result.update(
+        (key, value) for key, value in extracted.items() if key not in _DROPPED_FIELDS
+    )
+    result["elapsed_ms"] = round((time.perf_counter() - started_at) * 1000, 1)
+    return result
+
+
+class HostThrottle:
+    """
+    Вежливость к сайтам: не более max_per_host одновременных загрузок
+    с одного хоста и не чаще одной загрузки в delay секунд.
+    """
+
+    def __init__(self, max_per_host: int = 2, delay: float = 0):
+        self.max_per_host = max_per_host
+        self.delay = delay
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def _host(self, url: str) -> str:
+        return urlsplit(url).hostname or ""
+
+    def slot(self, url: str) -> asyncio.Semaphore:
+        """Семафор одновременных загрузок хоста."""
+        host = self._host(url)
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._semaphores[host]
+
+    async def wait_turn(self, url: str) -> None:
+        """Ожидание, пока с начала прошлой загрузки хоста не пройдет delay."""
+        if not self.delay:
+            return
+        host = self._host(url)
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        loop = asyncio.get_running_loop()
+        async with lock:
+            pause = self._next_start.get(host, 0) - loop.time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            self._next_start[host] = loop.time() + self.delay
+
+
+async def fetch_many(
+    urls: List[str],
+    browsers: List[Any],
+    run: Callable[..., Awaitable[Dict[str, Any]]],
+    fetch: Callable[[Any, str], Dict[str, Any]],
+    throttle: HostThrottle,
+    on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+    discard: Optional[Callable[[Any], None]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Загрузка URL на нескольких браузерах параллельно.
+
+    Каждый браузер одновременно обрабатывает одну страницу, поэтому число
+    браузеров ограничивает параллельность. Браузер, вызов в котором
+    превысил таймаут, продолжает его выполнять и больше не используется.
+
+    Args:
+        urls: Адреса страниц
+        browsers: Браузеры-исполнители
+        run: Выполнение блокирующего fetch(browser, url) вне event loop,
+            например ToolDispatcher.run с блокировкой и таймаутом браузера
+        fetch: Загрузка одной страницы
+        throttle: Ограничения по хостам
+        on_result: Вызывается с каждым результатом сразу после его получения
+        discard: Вызывается с браузером, вызов в котором превысил таймаут
+            (например, для его замены в пуле)
+
+    Returns:
+        Результаты в порядке завершения, у каждого index - номер URL
+    """
+    free: "asyncio.Queue" = asyncio.Queue()
+    for browser in browsers:
+        free.put_nowait(browser)
+    workers = len(browsers)
+    results: List[Dict[str, Any]] = []
+
+    async def process(index: int, url: str) -> None:
+        nonlocal workers
+        async with throttle.slot(url):
+            await throttle.wait_turn(url)
+            browser = await free.get()
+            if browser is None:
+                # Браузеров не осталось: None получит и следующая загрузка
+                free.put_nowait(None)
+                result = {"url": url, "success": False, "error": "Все браузеры заняты зависшими загрузками"}
+            else:
+                hung = False
+                try:
+                    result = await run(fetch, browser, url)
+                except ToolTimeoutError as e:
+                    logger.error(f"Загрузка {url} зависла, браузер больше не используется: {e}")
+                    result = {"url": url, "success": False, "error": str(e)}
+                    hung = True
+                except Exception as e:
+                    logger.error(f"Ошибка при загрузке {url}: {e}")
+                    result = {"url": url, "success": False, "error": str(e)}
+
+                if not hung:
+                    free.put_nowait(browser)
+                else:
+                    workers -= 1
+                    if discard:
+                        discard(browser)
+                    if workers == 0:
+                        free.put_nowait(None)
+
+        result = {"index": index, **result}
+        results.append(result)
+        if on_result:
+            await on_result(result)
+
+    await asyncio.gather(*(process(index, url) for index, url in enumerate(urls)))
+    return results
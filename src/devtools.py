@@ -0,0 +1,305 @@
+"""Команды Chrome DevTools Protocol напрямую по WebSocket."""
+
+import itertools
+import json
+import logging
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple
+
+import websocket
+from selenium.common.exceptions import (
+    JavascriptException,
+    TimeoutException,
+    UnexpectedAlertPresentException,
+    WebDriverException,
+)
+
+logger = logging.getLogger(__name__)
+
+# Таймаут ответа на команду, секунд
+COMMAND_TIMEOUT = 60
+
+# Таймаут ответа на скрипт, секунд. Скрипты чтения страницы синхронные и
+# быстрые, а без ответа (диалог JavaScript, открытый до подключения)
+# вызов не должен держать блокировку браузера COMMAND_TIMEOUT
+EVALUATE_TIMEOUT = 10
+
+# Скрипт в стиле execute_script (тело функции с arguments) для Runtime.evaluate
+_EVALUATE_TEMPLATE = "(function() {{\n{script}\n}}).apply(null, {args})"
+
+
+class CdpError(WebDriverException):
+    """Ошибка команды CDP (как WebDriverException у execute_cdp_cmd)."""
+
+
+def evaluate_params(script: str, args: Tuple[Any, ...]) -> Dict[str, Any]:
+    """Параметры Runtime.evaluate для скрипта в стиле execute_script."""
+    return {
+        "expression": _EVALUATE_TEMPLATE.format(script=script, args=json.dumps(list(args))),
+        "returnByValue": True,
+        "awaitPromise": False,
+        "userGesture": True
+    }
+
+
+def evaluate_value(result: Dict[str, Any]) -> Any:
+    """Значение из ответа Runtime.evaluate (JavascriptException при ошибке)."""
+    if "exceptionDetails" in result:
+        details = result["exceptionDetails"]
+        message = details.get("exception", {}).get("description") or details.get("text")
+        raise JavascriptException(f"javascript error: {message}")
+    return result["result"].get("value")
+
+
+def dialog_error(dialog: Dict[str, Any]) -> UnexpectedAlertPresentException:
+    """Ошибка открытого диалога JavaScript (как у WebDriver)."""
+    return UnexpectedAlertPresentException(
+        f"Открыт диалог JavaScript ({dialog.get('type')}): {dialog.get('message')}",
+        alert_text=dialog.get("message")
+    )
+
+
+class CdpConnection:
+    """
+    Постоянное соединение DevTools с вкладкой.
+
+    Команды отправляются без ожидания предыдущих ответов: ответы
+    сопоставляются с командами по id в отдельном потоке чтения. Из
+    событий CDP отслеживаются только диалоги JavaScript (после
+    Page.enable): пока открыт alert, confirm или prompt, Chrome не
+    отвечает на скрипты, поэтому ожидающие ответа команды завершаются
+    ошибкой при открытии диалога.
+    """
+
+    def __init__(self, socket):
+        self._socket = socket
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self.closed = False
+        # Параметры Page.javascriptDialogOpening открытого диалога
+        self.dialog: Optional[Dict[str, Any]] = None
+        self._reader = threading.Thread(target=self._read, name="cdp-reader", daemon=True)
+        self._reader.start()
+
+    @classmethod
+    def connect(cls, url: str, timeout: float = 10) -> "CdpConnection":
+        # Без заголовка Origin: иначе Chrome 111+ требует --remote-allow-origins
+        socket = websocket.create_connection(url, timeout=timeout, suppress_origin=True)
+        # Таймаут только на подключение: поток чтения ждет ответов без ограничения
+        socket.settimeout(None)
+        return cls(socket)
+
+    def _read(self) -> None:
+        while True:
+            try:
+                message = json.loads(self._socket.recv())
+            except Exception as e:
+                self._fail_pending(e)
+                return
+            if "id" not in message:
+                self._on_event(message.get("method"), message.get("params", {}))
+                continue
+            future = self._pending.pop(message["id"], None)
+            # Ожидание могло быть отменено (таймаут asyncio.wait_for)
+            if future is None or future.cancelled():
+                continue
+            if "error" in message:
+                future.set_exception(CdpError(message["error"].get("message", str(message["error"]))))
+            else:
+                future.set_result(message.get("result", {}))
+
+    def _on_event(self, method: Optional[str], params: Dict[str, Any]) -> None:
+        if method == "Page.javascriptDialogOpening":
+            self.dialog = params
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.cancelled():
+                    future.set_exception(dialog_error(params))
+        elif method == "Page.javascriptDialogClosed":
+            self.dialog = None
+
+    def _fail_pending(self, error: Exception) -> None:
+        with self._lock:
+            self.closed = True
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.cancelled():
+                future.set_exception(CdpError(f"Соединение DevTools закрыто: {error}"))
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Future:
+        """Отправка команды; результат - в возвращаемом Future."""
+        future: Future = Future()
+        with self._lock:
+            if self.closed:
+                raise ConnectionError("Соединение DevTools закрыто")
+            command_id = next(self._ids)
+            self._pending[command_id] = future
+            try:
+                self._socket.send(json.dumps({"id": command_id, "method": method, "params": params or {}}))
+            except Exception:
+                self._pending.pop(command_id, None)
+                raise
+        return future
+
+    def close(self) -> None:
+        try:
+            self._socket.close()
+        except Exception:
+            pass
+        self._fail_pending(ConnectionError("закрыто клиентом"))
+
+
+class DevToolsChannel:
+    """
+    CDP команды и скрипты текущей вкладки.
+
+    По умолчанию команды идут напрямую в Chrome по WebSocket (адрес
+    отладки из capabilities chromedriver), минуя HTTP запросы к
+    chromedriver. Если соединение недоступно или на странице открыт
+    диалог JavaScript, используется execute_cdp_cmd/execute_script
+    WebDriver: chromedriver сразу возвращает ошибку и закрывает диалог
+    (unhandledPromptBehavior по умолчанию).
+
+    Состояние, привязанное к сессии CDP (скрипты новых документов,
+    блокировка URL), устанавливается через chromedriver: оно исчезает
+    при закрытии соединения, а соединение chromedriver живет столько же,
+    сколько вкладка.
+    """
+
+    def __init__(
+        self,
+        driver,
+        websocket_enabled: bool = True,
+        observe: Optional[Callable[..., ContextManager]] = None
+    ):
+        """
+        Args:
+            driver: WebDriver (резервный транспорт и адрес отладки Chrome)
+            websocket_enabled: Отправлять команды по WebSocket
+            observe: Контекст для учета команд WebSocket в метриках и
+                трассировке: observe(*names)
+        """
+        self.driver = driver
+        self.websocket_enabled = websocket_enabled
+        self.observe = observe or (lambda *names: nullcontext())
+        self._connection: Optional[CdpConnection] = None
+        # targetId текущей вкладки (None - узнать у chromedriver)
+        self._target: Optional[str] = None
+        # Подключение не удалось: WebDriver до следующей смены вкладки
+        self._unavailable = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.closed
+
+    @property
+    def connection(self) -> Optional[CdpConnection]:
+        """Открытое соединение WebSocket (без подключения; None - нет)."""
+        return self._connection if self.connected else None
+
+    def _connect(self) -> Optional[CdpConnection]:
+        if not self.websocket_enabled or self._unavailable:
+            return None
+        if self.connected:
+            return self._connection
+        try:
+            address = self.driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+            # В chromedriver window handle совпадает с targetId
+            self._target = self._target or self.driver.current_window_handle
+            self._connection = CdpConnection.connect(f"ws://{address}/devtools/page/{self._target}")
+            # События открытия и закрытия диалогов JavaScript
+            self._connection.send("Page.enable")
+            logger.debug(f"Соединение DevTools с вкладкой {self._target}")
+            return self._connection
+        except Exception as e:
+            logger.info(f"CDP по WebSocket недоступен, используется chromedriver: {e}")
+            self._unavailable = True
+            self._connection = None
+            return None
+
+    def reset(self, target: Optional[str] = None) -> None:
+        """
+        Смена текущей вкладки: соединение будет открыто заново.
+
+        Args:
+            target: window handle новой вкладки (если известен)
+        """
+        self.close()
+        self._target = target
+        self._unavailable = False
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def dialog(self) -> Optional[Dict[str, Any]]:
+        """Открытый диалог JavaScript текущей вкладки (None - нет или неизвестно)."""
+        return self._connection.dialog if self.connected else None
+
+    def _wait(self, future: Future, timeout: float) -> Dict[str, Any]:
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            raise TimeoutException(f"Нет ответа DevTools за {timeout} с")
+
+    def execute(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = COMMAND_TIMEOUT
+    ) -> Dict[str, Any]:
+        """Команда CDP (как execute_cdp_cmd)."""
+        return self.batch([(method, params or {})], timeout)[0]
+
+    def batch(
+        self,
+        commands: List[Tuple[str, Dict[str, Any]]],
+        timeout: float = COMMAND_TIMEOUT
+    ) -> List[Dict[str, Any]]:
+        """
+        Несколько независимых команд CDP.
+
+        По WebSocket все команды отправляются сразу, затем собираются
+        ответы (каждый не дольше timeout секунд); через chromedriver
+        выполняются по очереди.
+        """
+        connection = self._connect()
+        if connection is not None and connection.dialog is not None:
+            logger.debug("Открыт диалог JavaScript, команды идут через chromedriver")
+            connection = None
+        if connection is not None:
+            futures: List[Future] = []
+            try:
+                with self.observe(*(f"cdp:{method}" for method, _ in commands)):
+                    for method, params in commands:
+                        futures.append(connection.send(method, params))
+                    return [self._wait(future, timeout) for future in futures]
+            except (OSError, websocket.WebSocketException) as e:
+                self.close()
+                if futures:
+                    # Часть команд уже выполнена: повторять их нельзя
+                    raise CdpError(f"Соединение DevTools потеряно: {e}")
+                logger.info(f"Соединение DevTools потеряно, используется chromedriver: {e}")
+        return [self.driver.execute_cdp_cmd(method, params) for method, params in commands]
+
+    def evaluate(self, script: str, *args: Any, timeout: float = EVALUATE_TIMEOUT) -> Any:
+        """
+        Скрипт в стиле execute_script: тело функции, аргументы в arguments.
+
+        По WebSocket результат возвращается по значению (JSON), поэтому
+        элементы DOM в результате становятся пустыми объектами.
+
+        Args:
+            timeout: Таймаут ответа по WebSocket, секунд
+        """
+        connection = self._connect()
+        if connection is None or connection.dialog is not None:
+            return self.driver.execute_script(script, *args)
+        return evaluate_value(self.execute("Runtime.evaluate", evaluate_params(script, args), timeout))
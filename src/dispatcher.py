@@ -0,0 +1,94 @@
+"""Выполнение блокирующих вызовов Selenium вне event loop."""
+
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ToolTimeoutError(Exception):
+    """Вызов инструмента не уложился в отведенное время."""
+
+
+class ToolDispatcher:
+    """
+    Диспетчер вызовов инструментов на ограниченном пуле потоков.
+
+    Selenium блокирует поток на каждом HTTP запросе к chromedriver и на
+    WebDriverWait, поэтому все обращения к браузеру выполняются в
+    отдельных потоках, а event loop остается свободным для чтения stdio,
+    list_tools и обработки отмены.
+    """
+
+    def __init__(self, max_workers: int = 4, timeout: float = 60):
+        """
+        Инициализация диспетчера.
+
+        Args:
+            max_workers: Максимальное количество рабочих потоков
+            timeout: Таймаут вызова по умолчанию в секундах
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="browser-worker"
+        )
+
+    @staticmethod
+    def _call(
+        func: Callable[..., Any],
+        args: tuple,
+        lock: Optional[threading.RLock]
+    ) -> Any:
+        """Вызов функции в рабочем потоке под блокировкой браузера."""
+        if lock is None:
+            return func(*args)
+        with lock:
+            return func(*args)
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        lock: Optional[threading.RLock] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Выполнение функции в пуле потоков.
+
+        Args:
+            func: Блокирующая функция
+            *args: Аргументы функции
+            lock: Блокировка браузера (WebDriver не потокобезопасен)
+            timeout: Таймаут в секундах (по умолчанию self.timeout)
+
+        Raises:
+            ToolTimeoutError: Если вызов не завершился за timeout секунд
+        """
+        timeout = self.timeout if timeout is None else timeout
+        # Контекст вызывающей задачи (текущий span трассировки) виден в потоке
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, self._call, func, args, lock)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # Если задача еще в очереди, она не будет запущена. Уже идущую
+            # команду WebDriver прервать нельзя: поток завершит ее сам
+            # (BrowserManager.command_timeout), а сервер заменяет браузер
+            # сессии (BrowserPool.replace), чтобы не ждать его блокировку.
+            future.cancel()
+            raise ToolTimeoutError(f"Превышено время ожидания ({timeout} с)")
+        except asyncio.CancelledError:
+            future.cancel()
+            logger.info("Вызов отменен клиентом")
+            raise
+
+    def shutdown(self) -> None:
+        """Остановка пула потоков без ожидания текущих задач."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
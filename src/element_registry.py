@@ -0,0 +1,99 @@
+"""Короткие идентификаторы найденных элементов страницы."""
+
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+class HandleError(Exception):
+    """Неизвестный или вытесненный идентификатор элемента."""
+
+
+@dataclass
+class ElementEntry:
+    """Элемент и способ найти его заново."""
+
+    element: Any
+    # None - элемент из модели страницы, найти его заново нельзя
+    selector: Optional[str]
+    by: str
+    # Номер среди элементов, найденных по селектору
+    index: int = 0
+
+
+class ElementRegistry:
+    """
+    Реестр элементов: handle ("e1", "e2", ...) -> WebElement.
+
+    Повторно найденный элемент получает тот же handle. Хранится не
+    более max_size элементов, давно не использованные вытесняются.
+    Номера handles не используются повторно, поэтому handle со страницы,
+    с которой ушел браузер (clear), не указывает на элемент новой.
+    """
+
+    def __init__(self, max_size: int = 500):
+        """
+        Args:
+            max_size: Максимальное число элементов в реестре
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, ElementEntry]" = OrderedDict()
+        # WebElement.id -> handle
+        self._handles: Dict[str, str] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def register(self, element: Any, selector: Optional[str], by: str = "css", index: int = 0) -> str:
+        """Регистрация элемента, возвращает его handle."""
+        with self._lock:
+            handle = self._handles.get(element.id)
+            if handle is None:
+                handle = f"e{next(self._ids)}"
+                self._handles[element.id] = handle
+            self._entries[handle] = ElementEntry(element, selector, by, index)
+            self._entries.move_to_end(handle)
+
+            while len(self._entries) > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._handles.pop(evicted.element.id, None)
+            return handle
+
+    def get(self, handle: str) -> ElementEntry:
+        """
+        Элемент по handle.
+
+        Raises:
+            HandleError: Если handle неизвестен
+        """
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                raise HandleError(
+                    f"Неизвестный handle элемента: {handle} (handles действуют до перехода "
+                    f"на другую страницу или вкладку, найдите элемент заново)"
+                )
+            self._entries.move_to_end(handle)
+            return entry
+
+    def update(self, handle: str, element: Any) -> None:
+        """Замена устаревшей ссылки на элемент, найденный заново."""
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return
+            self._handles.pop(entry.element.id, None)
+            self._handles[element.id] = handle
+            entry.element = element
+
+    def find(self, element: Any) -> Optional[str]:
+        """Handle уже зарегистрированного элемента."""
+        with self._lock:
+            return self._handles.get(element.id)
+
+    def clear(self) -> None:
+        """Удаление всех элементов."""
+        with self._lock:
+            self._entries.clear()
+            self._handles.clear()
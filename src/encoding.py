@@ -0,0 +1,128 @@
+"""Кодирование результатов инструментов в содержимое MCP ответа."""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from mcp.types import ImageContent, TextContent
+
+# Поля с двоичными данными (base64): отдаются отдельным ImageContent
+BINARY_FIELDS = {
+    "screenshot_base64": "image/png",
+}
+
+# Ограничения размера по инструментам: поле -> максимальная длина строк
+# (для вложенных значений - каждой строки) и списков
+TRUNCATION_POLICIES: Dict[str, Dict[str, int]] = {
+    "execute_javascript": {"result": 20000},
+}
+
+# Поля, которые выбор fields никогда не отбрасывает
+ALWAYS_INCLUDED = ("success", "error")
+
+
+def select_fields(result: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """
+    Выбор полей ответа.
+
+    Args:
+        result: Результат инструмента
+        fields: Имена полей верхнего уровня (None - все поля)
+    """
+    if not fields:
+        return result
+    wanted = set(fields).union(ALWAYS_INCLUDED)
+    return {key: value for key, value in result.items() if key in wanted}
+
+
+def truncate(value: Any, limit: int) -> Any:
+    """
+    Усечение строк и списков до limit элементов.
+
+    Строка заканчивается меткой с числом отброшенных символов, список -
+    такой же строкой последним элементом.
+    """
+    if limit <= 0:
+        return value
+    if isinstance(value, str):
+        if len(value) <= limit:
+            return value
+        return f"{value[:limit]}…[+{len(value) - limit}]"
+    if isinstance(value, list):
+        items = [truncate(item, limit) for item in value[:limit]]
+        if len(value) > limit:
+            items.append(f"…[+{len(value) - limit}]")
+        return items
+    if isinstance(value, dict):
+        return {key: truncate(item, limit) for key, item in value.items()}
+    return value
+
+
+def apply_policy(tool: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Усечение полей результата по TRUNCATION_POLICIES инструмента."""
+    policy = TRUNCATION_POLICIES.get(tool)
+    if not policy:
+        return result
+
+    result = dict(result)
+    truncated = []
+    for key, limit in policy.items():
+        if key in result:
+            value = truncate(result[key], limit)
+            if value != result[key]:
+                result[key] = value
+                truncated.append(key)
+    if truncated:
+        result["truncated_fields"] = truncated
+    return result
+
+
+def extract_binary(value: Any, images: List[ImageContent]) -> Any:
+    """
+    Перенос двоичных полей (в том числе вложенных, например в шагах
+    run_actions) в images.
+
+    image_index - позиция изображения в содержимом ответа, где первым
+    идет TextContent с JSON.
+    """
+    if isinstance(value, list):
+        return [extract_binary(item, images) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    data = {}
+    for key, item in value.items():
+        if key in BINARY_FIELDS and isinstance(item, str):
+            mime_type = value.get("mime_type") or BINARY_FIELDS[key]
+            images.append(ImageContent(type="image", data=item, mimeType=mime_type))
+            data["image_index"] = len(images)
+        else:
+            data[key] = extract_binary(item, images)
+    return data
+
+
+def to_json(value: Any) -> str:
+    """Компактный JSON без экранирования не-ASCII символов."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def encode_result(
+    tool: str,
+    result: Dict[str, Any],
+    fields: Optional[Iterable[str]] = None
+) -> List[Union[TextContent, ImageContent]]:
+    """
+    Содержимое MCP ответа для результата инструмента.
+
+    Двоичные поля (BINARY_FIELDS) выносятся из JSON в ImageContent
+    (на его позицию в содержимом ответа указывает image_index), остальное кодируется
+    компактным JSON.
+
+    Args:
+        tool: Имя инструмента
+        result: Результат инструмента
+        fields: Возвращаемые поля верхнего уровня (None - все)
+    """
+    images: List[ImageContent] = []
+    data = extract_binary(select_fields(result, fields), images)
+    data = apply_policy(tool, data)
+    return [TextContent(type="text", text=to_json(data)), *images]
@@ -0,0 +1,212 @@
+"""Контроль памяти Chrome: замеры процессов и JS heap, лимиты."""
+
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from browser_manager import BrowserManager
+from metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+# Действия при превышении лимита, от наименее заметного для сессии
+ACTIONS = ("clear_cache", "close_background_tabs", "recycle")
+
+
+def _process_type(pid: int) -> str:
+    """browser, renderer или other (gpu-process, utility, zygote, ...)."""
+    with open(f"/proc/{pid}/cmdline", "rb") as f:
+        args = f.read().split(b"\0")
+    for arg in args:
+        if arg.startswith(b"--type="):
+            return "renderer" if arg == b"--type=renderer" else "other"
+    return "browser"
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status", "rb") as f:
+        for line in f:
+            if line.startswith(b"VmRSS:"):
+                return int(line.split()[1]) / 1024
+    # У завершающегося процесса (зомби) VmRSS нет
+    return 0.0
+
+
+def process_memory(root_pid: int) -> Optional[Dict[str, Any]]:
+    """
+    RSS процессов Chrome, запущенных chromedriver root_pid, в мегабайтах.
+
+    Дерево процессов строится по /proc (Linux), на других системах
+    возвращается None. RSS процессов суммируется, поэтому общие
+    страницы учитываются несколько раз.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+
+    children: Dict[int, List[int]] = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Имя процесса в скобках может содержать пробелы
+        ppid = int(stat.rsplit(b")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    result: Dict[str, Any] = {"browser_mb": 0.0, "renderer_mb": 0.0, "other_mb": 0.0, "renderers": 0}
+    stack = list(children.get(root_pid, ()))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, ()))
+        try:
+            kind = _process_type(pid)
+            rss = _rss_mb(pid)
+        except OSError:
+            continue
+        result[f"{kind}_mb"] += rss
+        result["renderers"] += kind == "renderer"
+
+    for key in ("browser_mb", "renderer_mb", "other_mb"):
+        result[key] = round(result[key], 1)
+    result["rss_mb"] = round(result["browser_mb"] + result["renderer_mb"] + result["other_mb"], 1)
+    return result
+
+
+class MemoryGovernor:
+    """
+    Замеры памяти браузера между вызовами инструментов и лимиты.
+
+    Замер (не чаще раза в interval секунд на сессию) - RSS процессов
+    Chrome и JS heap текущей вкладки. При превышении max_rss_mb или
+    max_heap_mb действия из actions выполняются по порядку, пока память
+    не опустится ниже лимитов: очистка кэша и сборка мусора, закрытие
+    фоновых вкладок, перезапуск браузера с восстановлением страницы,
+    cookies и localStorage. Без метрик и лимитов замеры не выполняются.
+    """
+
+    def __init__(
+        self,
+        max_rss_mb: float = 0,
+        max_heap_mb: float = 0,
+        actions: Sequence[str] = ACTIONS,
+        interval: float = 30,
+        metrics: Optional[Metrics] = None
+    ):
+        """
+        Args:
+            max_rss_mb: Лимит суммарного RSS процессов Chrome, МБ (0 - нет)
+            max_heap_mb: Лимит JS heap текущей вкладки, МБ (0 - нет)
+            actions: Действия при превышении лимита (из ACTIONS)
+            interval: Минимальный период замеров одной сессии, секунд
+            metrics: Метрики для публикации замеров
+        """
+        unknown = set(actions) - set(ACTIONS)
+        if unknown:
+            raise ValueError(f"Неизвестные действия memory.actions: {sorted(unknown)}")
+        self.max_rss_mb = max_rss_mb
+        self.max_heap_mb = max_heap_mb
+        self.actions = tuple(actions)
+        self.interval = interval
+        self.metrics = metrics
+        self._sampled_at: Dict[str, float] = {}
+
+    def sample(self, browser: BrowserManager) -> Dict[str, Any]:
+        """Замер памяти запущенного браузера (RSS - None, если недоступен)."""
+        process = getattr(getattr(browser.driver, "service", None), "process", None)
+        processes = process_memory(process.pid) if process is not None else None
+        heap = browser.get_memory_usage()
+        return {
+            **(processes or {"rss_mb": None}),
+            "heap_mb": round(heap, 1) if heap is not None else None,
+        }
+
+    def exceeded(self, sample: Dict[str, Any]) -> Optional[str]:
+        """Описание превышенного лимита (None - в пределах)."""
+        if self.max_rss_mb and sample["rss_mb"] is not None and sample["rss_mb"] >= self.max_rss_mb:
+            return f"RSS {sample['rss_mb']:.0f} МБ"
+        if self.max_heap_mb and sample["heap_mb"] is not None and sample["heap_mb"] >= self.max_heap_mb:
+            return f"JS heap {sample['heap_mb']:.0f} МБ"
+        return None
+
+    def check(self, browser: BrowserManager, session: str, force: bool = False) -> List[str]:
+        """
+        Замер и, при превышении лимитов, освобождение памяти.
+
+        Вызывается из рабочего потока после выполнения инструмента.
+
+        Args:
+            browser: Браузер сессии
+            session: Идентификатор сессии (метка замеров в метриках)
+            force: Замерить без учета interval
+
+        Returns:
+            Выполненные действия
+        """
+        if self.metrics is None and not (self.max_rss_mb or self.max_heap_mb):
+            return []
+        now = time.monotonic()
+        last = self._sampled_at.get(session)
+        if not browser.driver or (not force and last is not None and now - last < self.interval):
+            return []
+        self._sampled_at[session] = now
+
+        done: List[str] = []
+        with browser.lock:
+            sample = self.sample(browser)
+            reason = self.exceeded(sample)
+            for action in self.actions:
+                if reason is None:
+                    break
+                logger.info(f"Память браузера сессии {session}: {reason}, действие {action}")
+                self._apply(browser, action)
+                done.append(action)
+                if self.metrics is not None:
+                    self.metrics.count_memory_action(action)
+                if not browser.driver:
+                    break
+                sample = self.sample(browser)
+                reason = self.exceeded(sample)
+            if reason is not None:
+                logger.warning(f"Память браузера сессии {session} выше лимита после {done}: {reason}")
+
+        if self.metrics is not None:
+            self.metrics.record_memory(session, sample if browser.driver else None)
+        return done
+
+    def _apply(self, browser: BrowserManager, action: str) -> None:
+        if action == "clear_cache":
+            browser.free_memory()
+        elif action == "close_background_tabs":
+            browser.close_background_tabs()
+        elif action == "recycle":
+            self.recycle(browser)
+
+    def recycle(self, browser: BrowserManager) -> Dict[str, Any]:
+        """
+        Перезапуск браузера с восстановлением страницы, cookies и
+        localStorage.
+
+        Returns:
+            Результат start
+        """
+        with browser.lock:
+            try:
+                state = browser.capture_state(storage=True)
+            except Exception as e:
+                logger.warning(f"Состояние сессии не сохранено перед перезапуском: {e}")
+                state = {}
+            browser.stop()
+            result = browser.start()
+            if result["success"] and state:
+                browser.restore_state(state)
+        return result
+
+    def forget(self, session: str) -> None:
+        """Сессия освобождена: ее замеры больше не публикуются."""
+        self._sampled_at.pop(session, None)
+        if self.metrics is not None:
+            self.metrics.record_memory(session, None)
@@ -0,0 +1,261 @@
+"""Метрики вызовов инструментов и методов BrowserManager."""
+
+import bisect
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Верхние границы корзин гистограммы времени, мс
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами (как histogram в Prometheus)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        # Последняя корзина - значения больше всех границ (+Inf)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Оценка квантиля q (0-1) линейной интерполяцией внутри корзины."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[index - 1] if index else 0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return round(lower + (upper - lower) * (rank - seen) / count, 1)
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max, 1),
+            "mean_ms": round(self.total / self.count, 1) if self.count else None,
+        }
+
+
+class _Series:
+    """Метрики одного инструмента или метода."""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.commands: Dict[str, int] = {}
+
+    def summary(self) -> Dict[str, Any]:
+        result = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.calls, 3) if self.calls else 0,
+            **self.latency.summary(),
+        }
+        if self.bytes:
+            result["bytes_total"] = self.bytes
+            result["bytes_mean"] = round(self.bytes / self.calls)
+        if self.commands:
+            result["webdriver_commands"] = sum(self.commands.values())
+            result["commands_per_call"] = round(sum(self.commands.values()) / self.calls, 1)
+        return result
+
+
+class Metrics:
+    """
+    Метрики сервера: время, объем ответов, ошибки, команды WebDriver и
+    память браузеров.
+
+    Команды WebDriver относятся к инструменту, выполняемому в текущем
+    потоке (tool_scope): один вызов инструмента выполняется целиком в
+    одном рабочем потоке диспетчера.
+    """
+
+    def __init__(self):
+        self._tools: Dict[str, _Series] = {}
+        self._methods: Dict[str, _Series] = {}
+        self._commands: Dict[str, int] = {}
+        # Последний замер памяти браузера каждой сессии (MemoryGovernor)
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._memory_actions: Dict[str, int] = {}
+        self._current = threading.local()
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    @contextmanager
+    def tool_scope(self, name: str) -> Iterator[None]:
+        """Команды WebDriver внутри блока относятся к инструменту name."""
+        previous = getattr(self._current, "tool", None)
+        self._current.tool = name
+        try:
+            yield
+        finally:
+            self._current.tool = previous
+
+    def record_tool(self, name: str, seconds: float, size: int, success: bool) -> None:
+        """Вызов инструмента: время, размер ответа в байтах и результат."""
+        with self._lock:
+            series = self._tools.setdefault(name, _Series())
+            series.calls += 1
+            series.errors += not success
+            series.bytes += size
+            series.latency.observe(seconds * 1000)
+
+    def record_method(self, name: str, seconds: float, success: bool) -> None:
+        """Вызов метода BrowserManager."""
+        with self._lock:
+            series = self._methods.setdefault(name, _Series())
+            series.calls += 1
+            series.errors += not success
+            series.latency.observe(seconds * 1000)
+
+    def count_command(self, command: str) -> None:
+        """Команда WebDriver (или CDP через chromedriver)."""
+        tool = getattr(self._current, "tool", None)
+        with self._lock:
+            self._commands[command] = self._commands.get(command, 0) + 1
+            if tool:
+                series = self._tools.setdefault(tool, _Series())
+                series.commands[command] = series.commands.get(command, 0) + 1
+
+    def record_memory(self, session: str, sample: Optional[Dict[str, Any]]) -> None:
+        """Замер памяти браузера сессии (None - браузер остановлен)."""
+        with self._lock:
+            if sample is None:
+                self._memory.pop(session, None)
+            else:
+                self._memory[session] = dict(sample)
+
+    def count_memory_action(self, action: str) -> None:
+        """Действие при превышении лимита памяти."""
+        with self._lock:
+            self._memory_actions[action] = self._memory_actions.get(action, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Сводка всех метрик."""
+        with self._lock:
+            return {
+                "uptime_s": round(time.time() - self.started_at, 1),
+                "tools": {name: series.summary() for name, series in sorted(self._tools.items())},
+                "methods": {name: series.summary() for name, series in sorted(self._methods.items())},
+                "webdriver_commands": dict(sorted(self._commands.items(), key=lambda item: -item[1])),
+                "memory": {session: dict(sample) for session, sample in sorted(self._memory.items())},
+                "memory_actions": dict(self._memory_actions),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self._methods.clear()
+            self._commands.clear()
+            # Замеры памяти - текущее состояние, а не накопленные значения
+            self._memory_actions.clear()
+            self.started_at = time.time()
+
+    def to_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus."""
+        lines: List[str] = []
+        with self._lock:
+            for kind, series_map in (("tool", self._tools), ("method", self._methods)):
+                metric = f"chrome_mcp_{kind}"
+                lines.append(f"# TYPE {metric}_duration_ms histogram")
+                for name, series in sorted(series_map.items()):
+                    label = f'{kind}="{name}"'
+                    cumulative = 0
+                    for bound, count in zip(series.latency.buckets, series.latency.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_duration_ms_bucket{{{label},le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_duration_ms_bucket{{{label},le="+Inf"}} {series.latency.count}')
+                    lines.append(f"{metric}_duration_ms_sum{{{label}}} {round(series.latency.total, 3)}")
+                    lines.append(f"{metric}_duration_ms_count{{{label}}} {series.latency.count}")
+                lines.append(f"# TYPE {metric}_errors_total counter")
+                for name, series in sorted(series_map.items()):
+                    lines.append(f'{metric}_errors_total{{{kind}="{name}"}} {series.errors}')
+
+            lines.append("# TYPE chrome_mcp_tool_response_bytes_total counter")
+            for name, series in sorted(self._tools.items()):
+                lines.append(f'chrome_mcp_tool_response_bytes_total{{tool="{name}"}} {series.bytes}')
+            lines.append("# TYPE chrome_mcp_webdriver_commands_total counter")
+            for command, count in sorted(self._commands.items()):
+                lines.append(f'chrome_mcp_webdriver_commands_total{{command="{command}"}} {count}')
+
+            lines.append("# TYPE chrome_mcp_browser_rss_mb gauge")
+            for session, sample in sorted(self._memory.items()):
+                if sample.get("rss_mb") is None:
+                    continue
+                for process in ("browser", "renderer", "other"):
+                    lines.append(f'chrome_mcp_browser_rss_mb{{session="{session}",process="{process}"}} {sample[f"{process}_mb"]}')
+            lines.append("# TYPE chrome_mcp_browser_renderers gauge")
+            for session, sample in sorted(self._memory.items()):
+                if sample.get("renderers") is not None:
+                    lines.append(f'chrome_mcp_browser_renderers{{session="{session}"}} {sample["renderers"]}')
+            lines.append("# TYPE chrome_mcp_js_heap_mb gauge")
+            for session, sample in sorted(self._memory.items()):
+                if sample.get("heap_mb") is not None:
+                    lines.append(f'chrome_mcp_js_heap_mb{{session="{session}"}} {sample["heap_mb"]}')
+            lines.append("# TYPE chrome_mcp_memory_actions_total counter")
+            for action, count in sorted(self._memory_actions.items()):
+                lines.append(f'chrome_mcp_memory_actions_total{{action="{action}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, format: str = "prometheus") -> None:
+        """
+        Запись метрик в файл.
+
+        Args:
+            path: Путь к файлу
+            format: prometheus (файл перезаписывается) или jsonl (строка
+                со сводкой дописывается в конец)
+        """
+        if format == "jsonl":
+            line = json.dumps({"time": time.time(), **self.snapshot()}, ensure_ascii=False)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+
+
+def timed(method: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+    """
+    Замер метода BrowserManager в self.metrics и span в self.tracer
+    (если они включены).
+
+    Ошибкой считается ответ с success = False.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        metrics = self.metrics
+        tracer = getattr(self, "tracer", None)
+        if metrics is None and tracer is None:
+            return method(self, *args, **kwargs)
+        started_at = time.perf_counter()
+        result = None
+        try:
+            with tracer.span(method.__name__, kind="method") if tracer else nullcontext() as span:
+                result = method(self, *args, **kwargs)
+                if span is not None and isinstance(result, dict) and not result.get("success", True):
+                    span.error = result.get("error")
+            return result
+        finally:
+            if metrics is not None:
+                success = isinstance(result, dict) and result.get("success", True)
+                metrics.record_method(method.__name__, time.perf_counter() - started_at, success)
+    return wrapper
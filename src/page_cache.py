@@ -0,0 +1,135 @@
+"""Кэш снимков страницы: повторные чтения и постраничная выдача."""
+
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class CursorError(Exception):
+    """Курсор некорректен или его снимок уже вытеснен из кэша."""
+
+
+@dataclass
+class Snapshot:
+    """Извлеченное содержимое страницы."""
+
+    snapshot_id: str
+    content: Any
+    meta: Dict[str, Any] = field(default_factory=dict)
+    # Версия DOM на момент извлечения (None - снимок нельзя переиспользовать)
+    version: Optional[Hashable] = None
+
+
+class SnapshotStore:
+    """
+    Последние снимки страницы по ключам (вид содержимого и URL).
+
+    Для каждого ключа хранится только последний снимок: новое извлечение
+    делает курсоры предыдущего недействительными. Снимок переиспользуется
+    вместо повторного извлечения, пока версия DOM страницы не изменилась.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        """
+        Args:
+            max_entries: Максимальное число снимков (старые вытесняются)
+        """
+        self.max_entries = max_entries
+        self._snapshots: "OrderedDict[Hashable, Snapshot]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def put(
+        self,
+        key: Hashable,
+        content: Any,
+        meta: Optional[Dict[str, Any]] = None,
+        version: Optional[Hashable] = None
+    ) -> Snapshot:
+        """Сохранение снимка с ключом key."""
+        with self._lock:
+            snapshot = Snapshot(f"s{next(self._ids)}", content, meta or {}, version)
+            self._snapshots.pop(key, None)
+            self._snapshots[key] = snapshot
+            while len(self._snapshots) > self.max_entries:
+                self._snapshots.popitem(last=False)
+            return snapshot
+
+    def lookup(self, key: Hashable, version: Optional[Hashable]) -> Optional[Snapshot]:
+        """Снимок с ключом key, если версия DOM не изменилась."""
+        if version is None:
+            return None
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None or snapshot.version != version:
+                return None
+            self._snapshots.move_to_end(key)
+            return snapshot
+
+    def get(self, snapshot_id: str) -> Optional[Snapshot]:
+        """Снимок по идентификатору (None если вытеснен)."""
+        with self._lock:
+            for snapshot in self._snapshots.values():
+                if snapshot.snapshot_id == snapshot_id:
+                    return snapshot
+        return None
+
+    def invalidate(self) -> None:
+        """
+        Запрет переиспользования снимков (после действий на странице).
+
+        Продолжение по курсорам остается доступным.
+        """
+        with self._lock:
+            for snapshot in self._snapshots.values():
+                snapshot.version = None
+
+    def clear(self) -> None:
+        """Удаление всех снимков."""
+        with self._lock:
+            self._snapshots.clear()
+
+
+def make_cursor(kind: str, snapshot_id: str, version: str, offset: int) -> str:
+    """
+    Курсор продолжения: вид содержимого, снимок, версия DOM страницы на
+    момент извлечения (пустая строка - неизвестна) и смещение.
+    """
+    return f"{kind}:{snapshot_id}:{version}:{offset}"
+
+
+def parse_cursor(cursor: str) -> Tuple[str, str, str, int]:
+    """
+    Разбор курсора продолжения.
+
+    Returns:
+        Вид содержимого, снимок, версия DOM и смещение
+
+    Raises:
+        CursorError: Если курсор некорректен
+    """
+    parts = cursor.split(":")
+    if len(parts) != 4 or not parts[0] or not parts[1] or not parts[3].isdigit():
+        raise CursorError(f"Некорректный курсор: {cursor}")
+    kind, snapshot_id, version, offset = parts
+    return kind, snapshot_id, version, int(offset)
+
+
+def chunk(content: str, offset: int, max_length: int) -> Tuple[str, Optional[int]]:
+    """
+    Фрагмент содержимого.
+
+    Args:
+        content: Полное содержимое
+        offset: Начало фрагмента
+        max_length: Максимальная длина фрагмента (0 - без ограничения)
+
+    Returns:
+        Фрагмент и смещение следующего (None если это последний)
+    """
+    offset = max(offset, 0)
+    end = len(content) if max_length <= 0 else offset + max_length
+    next_offset = end if end < len(content) else None
+    return content[offset:end], next_offset
@@ -0,0 +1,304 @@
+"""Модель страницы: интерактивные элементы из DOMSnapshot.captureSnapshot."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+# Вычисляемые стили, запрашиваемые в DOMSnapshot.captureSnapshot (порядок важен)
+COMPUTED_STYLES = ["visibility"]
+
+# ARIA роли, по которым элемент считается интерактивным
+INTERACTIVE_ROLES = {
+    "button", "checkbox", "combobox", "link", "listbox", "menuitem",
+    "menuitemcheckbox", "menuitemradio", "option", "radio", "scrollbar",
+    "searchbox", "slider", "spinbutton", "switch", "tab", "textbox", "treeitem",
+}
+
+# Неявные роли элементов без атрибута role
+TAG_ROLES = {
+    "button": "button",
+    "select": "combobox",
+    "textarea": "textbox",
+    "summary": "button",
+    "option": "option",
+}
+
+INPUT_ROLES = {
+    "button": "button",
+    "submit": "button",
+    "reset": "button",
+    "image": "button",
+    "checkbox": "checkbox",
+    "radio": "radio",
+    "range": "slider",
+    "number": "spinbutton",
+    "search": "searchbox",
+}
+
+# Атрибуты, по которым строится имя элемента, если нет текста
+NAME_ATTRIBUTES = ("aria-label", "title", "alt", "placeholder", "value", "name")
+
+MAX_NAME_LENGTH = 100
+
+
+def _rare_indexes(data: Optional[Dict[str, Any]]) -> set:
+    return set(data["index"]) if data else set()
+
+
+def _rare_values(data: Optional[Dict[str, Any]]) -> Dict[int, Any]:
+    return dict(zip(data["index"], data["value"])) if data else {}
+
+
+def _role(tag: str, attributes: Dict[str, str], clickable: bool) -> Optional[str]:
+    """Роль интерактивного элемента (None - элемент не интерактивный)."""
+    role = attributes.get("role", "").split(" ")[0]
+    if role in INTERACTIVE_ROLES:
+        return role
+    if tag == "input":
+        input_type = attributes.get("type", "text").lower()
+        if input_type == "hidden":
+            return None
+        return INPUT_ROLES.get(input_type, "textbox")
+    if tag == "a" and "href" in attributes:
+        return "link"
+    if tag == "select" and "multiple" in attributes:
+        return "listbox"
+    if tag in TAG_ROLES:
+        return TAG_ROLES[tag]
+    if attributes.get("contenteditable", "false").lower() in ("", "true", "plaintext-only"):
+        return "textbox"
+    # Обработчик click или попадание в порядок обхода по Tab
+    if clickable or attributes.get("tabindex", "-1").isdigit():
+        return role or "generic"
+    return None
+
+
+def build_page_model(
+    capture: Dict[str, Any],
+    max_elements: int = 200,
+    visible_only: bool = False
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Интерактивные элементы из результата DOMSnapshot.captureSnapshot.
+
+    В снимок входят содержимое shadow root и iframe того же процесса;
+    координаты iframe пересчитываются в координаты документа страницы.
+
+    Args:
+        capture: Ответ DOMSnapshot.captureSnapshot
+        max_elements: Максимальное количество элементов
+        visible_only: Только видимые элементы
+
+    Returns:
+        (элементы по порядку документа, общее количество найденных)
+        Элементы содержат backend_node_id для управления через CDP.
+    """
+    strings = capture["strings"]
+    documents = capture["documents"]
+
+    def string(index: int) -> str:
+        return strings[index] if index >= 0 else ""
+
+    # Смещение документа iframe: позиция iframe в родительском документе
+    parents: Dict[int, Tuple[int, int]] = {}
+    for doc_index, document in enumerate(documents):
+        for node_index, child in _rare_values(document["nodes"].get("contentDocumentIndex")).items():
+            parents[child] = (doc_index, node_index)
+
+    boxes: List[Dict[int, List[float]]] = []
+    styles: List[Dict[int, List[int]]] = []
+    for document in documents:
+        layout = document["layout"]
+        doc_boxes: Dict[int, List[float]] = {}
+        doc_styles: Dict[int, List[int]] = {}
+        for position, node_index in enumerate(layout["nodeIndex"]):
+            # У узла может быть несколько объектов layout, первый - сам элемент
+            if node_index not in doc_boxes:
+                doc_boxes[node_index] = layout["bounds"][position]
+                doc_styles[node_index] = layout["styles"][position]
+        boxes.append(doc_boxes)
+        styles.append(doc_styles)
+
+    offsets: Dict[int, Tuple[float, float]] = {}
+
+    def offset(doc_index: int) -> Tuple[float, float]:
+        if doc_index not in offsets:
+            offsets[doc_index] = (0.0, 0.0)
+            if doc_index in parents:
+                parent_doc, frame_node = parents[doc_index]
+                parent_x, parent_y = offset(parent_doc)
+                frame_box = boxes[parent_doc].get(frame_node, [0, 0, 0, 0])
+                offsets[doc_index] = (parent_x + frame_box[0], parent_y + frame_box[1])
+        return offsets[doc_index]
+
+    elements: List[Dict[str, Any]] = []
+    total = 0
+    for doc_index, document in enumerate(documents):
+        nodes = document["nodes"]
+        parent_index = nodes["parentIndex"]
+        clickable = _rare_indexes(nodes.get("isClickable"))
+        input_values = _rare_values(nodes.get("inputValue"))
+        checked = _rare_indexes(nodes.get("inputChecked"))
+
+        candidates: Dict[int, Dict[str, Any]] = {}
+        for node_index, node_type in enumerate(nodes["nodeType"]):
+            if node_type != 1:
+                continue
+            tag = string(nodes["nodeName"][node_index]).lower()
+            flat = nodes["attributes"][node_index]
+            attributes = {string(flat[i]).lower(): string(flat[i + 1]) for i in range(0, len(flat), 2)}
+            role = _role(tag, attributes, node_index in clickable)
+            if role is None:
+                continue
+
+            box = boxes[doc_index].get(node_index)
+            style = styles[doc_index].get(node_index)
+            visible = bool(
+                box and box[2] > 0 and box[3] > 0
+                and (not style or string(style[0]) != "hidden")
+            )
+            if visible_only and not visible:
+                continue
+
+            x, y = offset(doc_index)
+            element: Dict[str, Any] = {
+                "role": role,
+                "tag": tag,
+                "name": "",
+                "visible": visible,
+                "box": [round(x + box[0]), round(y + box[1]), round(box[2]), round(box[3])] if box else None,
+                "backend_node_id": nodes["backendNodeId"][node_index],
+            }
+            if "href" in attributes:
+                element["href"] = attributes["href"]
+            if node_index in input_values:
+                element["value"] = string(input_values[node_index])
+            if role in ("checkbox", "radio", "switch"):
+                element["checked"] = node_index in checked or attributes.get("aria-checked") == "true"
+            if "disabled" in attributes or attributes.get("aria-disabled") == "true":
+                element["disabled"] = True
+            if doc_index:
+                element["frame"] = doc_index
+            element["_attributes"] = attributes
+            candidates[node_index] = element
+
+        # Текст узла достается ближайшему интерактивному предку
+        texts: Dict[int, List[str]] = {}
+        for node_index, node_type in enumerate(nodes["nodeType"]):
+            if node_type != 3:
+                continue
+            ancestor = parent_index[node_index]
+            while ancestor >= 0 and ancestor not in candidates:
+                ancestor = parent_index[ancestor]
+            if ancestor >= 0:
+                value = string(nodes["nodeValue"][node_index]).strip()
+                if value:
+                    texts.setdefault(ancestor, []).append(value)
+
+        for node_index, element in candidates.items():
+            attributes = element.pop("_attributes")
+            name = " ".join(texts.get(node_index, []))
+            if not name or "aria-label" in attributes:
+                name = next(
+                    (attributes[key] for key in NAME_ATTRIBUTES if attributes.get(key)),
+                    name
+                )
+            element["name"] = " ".join(name.split())[:MAX_NAME_LENGTH]
+
+            total += 1
+            if len(elements) < max_elements:
+                elements.append(element)
+
+    return elements, total
+
+
+class NodeElement:
+    """
+    Элемент модели страницы, управляемый через CDP по backendNodeId.
+
+    Повторяет нужную инструментам часть интерфейса WebElement, поэтому
+    хранится в ElementRegistry наравне с найденными по селектору
+    элементами. Работает и внутри shadow root и iframe, куда не
+    достают селекторы WebDriver.
+    """
+
+    def __init__(self, devtools, backend_node_id: int, tag: str = ""):
+        """
+        Args:
+            devtools: DevToolsChannel вкладки
+            backend_node_id: backendNodeId узла
+            tag: Имя тега
+        """
+        self.devtools = devtools
+        self.backend_node_id = backend_node_id
+        self.tag_name = tag
+
+    @property
+    def id(self) -> str:
+        return f"node:{self.backend_node_id}"
+
+    def _call(self, declaration: str, *args: Any) -> Any:
+        """Вызов функции с this = элемент, результат по значению."""
+        try:
+            object_id = self.devtools.execute(
+                "DOM.resolveNode", {"backendNodeId": self.backend_node_id}
+            )["object"]["objectId"]
+        except WebDriverException as e:
+            raise StaleElementReferenceException(
+                f"Узел {self.backend_node_id} удален со страницы"
+            ) from e
+        result = self.devtools.execute("Runtime.callFunctionOn", {
+            "objectId": object_id,
+            "functionDeclaration": declaration,
+            "arguments": [{"value": arg} for arg in args],
+            "returnByValue": True,
+            "awaitPromise": False
+        })
+        if "exceptionDetails" in result:
+            raise WebDriverException(result["exceptionDetails"].get("text", "JavaScript error"))
+        return result["result"].get("value")
+
+    @property
+    def text(self) -> str:
+        return self._call(
+            "function() { return (this.innerText ?? this.textContent ?? '').trim(); }"
+        )
+
+    def is_displayed(self) -> bool:
+        return self._call("""function() {
+            const style = getComputedStyle(this);
+            return style.visibility !== 'hidden' && style.display !== 'none'
+                && this.getClientRects().length > 0;
+        }""")
+
+    def click(self) -> None:
+        """Клик мышью в центр элемента (как WebElement.click)."""
+        self._call("function() { this.scrollIntoView({block: 'center', inline: 'center'}); }")
+        quads = self.devtools.execute(
+            "DOM.getContentQuads", {"backendNodeId": self.backend_node_id}
+        )["quads"]
+        if not quads:
+            raise WebDriverException(f"Элемент {self.backend_node_id} не отображается")
+        quad = quads[0]
+        x = sum(quad[0::2]) / 4
+        y = sum(quad[1::2]) / 4
+        # События мыши отправляются пакетом без ожидания каждого ответа
+        self.devtools.batch([("Input.dispatchMouseEvent", {"type": "mouseMoved", "x": x, "y": y})] + [
+            ("Input.dispatchMouseEvent", {"type": event, "x": x, "y": y, "button": "left", "clickCount": 1})
+            for event in ("mousePressed", "mouseReleased")
+        ])
+
+    def clear(self) -> None:
+        self._call("""function() {
+            this.focus();
+            if ('value' in this) {
+                this.value = '';
+            } else if (this.isContentEditable) {
+                this.textContent = '';
+            }
+            this.dispatchEvent(new Event('input', {bubbles: true}));
+        }""")
+
+    def send_keys(self, text: str) -> None:
+        self._call("function() { this.focus(); }")
+        self.devtools.execute("Input.insertText", {"text": text})
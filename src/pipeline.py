@@ -0,0 +1,157 @@
+"""Выполнение последовательности действий за один вызов инструмента."""
+
+import logging
+import re
+from typing import Any, Callable, Collection, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ${<шаг>.<путь>}: шаг - номер (с 1) или id шага, путь - ключи и индексы
+REFERENCE_PATTERN = re.compile(r"\$\{([\w-]+)((?:\.[\w-]+)*)\}")
+
+# Инструменты, которые нельзя вызывать внутри пакета
+EXCLUDED_ACTIONS = {"run_actions"}
+
+
+class StepReferenceError(Exception):
+    """Ссылка на результат шага не может быть разрешена."""
+
+
+def _lookup(results: Dict[str, Any], step: str, path: str) -> Any:
+    """Значение по пути в результате шага."""
+    if step not in results:
+        raise StepReferenceError(f"Шаг {step} не выполнен или не существует")
+
+    value = results[step]
+    for key in filter(None, path.split(".")):
+        try:
+            if isinstance(value, list):
+                value = value[int(key)]
+            else:
+                value = value[key]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise StepReferenceError(f"Нет значения {step}{path}")
+    return value
+
+
+def resolve_references(value: Any, results: Dict[str, Any]) -> Any:
+    """
+    Подстановка результатов предыдущих шагов в аргументы.
+
+    Строка, целиком состоящая из одной ссылки, заменяется значением
+    с сохранением типа. Ссылки внутри строки подставляются как текст.
+
+    Args:
+        value: Аргументы шага (dict, list, строка или скаляр)
+        results: Результаты выполненных шагов по номеру и id
+    """
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results) for item in value]
+    if not isinstance(value, str):
+        return value
+
+    match = REFERENCE_PATTERN.fullmatch(value)
+    if match:
+        return _lookup(results, match.group(1), match.group(2))
+
+    return REFERENCE_PATTERN.sub(
+        lambda m: str(_lookup(results, m.group(1), m.group(2))),
+        value
+    )
+
+
+def validate_steps(steps: List[Dict[str, Any]], unsupported: Collection[str] = ()) -> Optional[str]:
+    """
+    Проверка шагов до выполнения пакета.
+
+    Args:
+        steps: Шаги пакета
+        unsupported: Инструменты сервера, которые не выполняются в
+            браузере сессии и поэтому недоступны в пакете
+
+    Returns:
+        Описание ошибки (None - все шаги допустимы)
+    """
+    for number, step in enumerate(steps, start=1):
+        action = step.get("action")
+        if action in EXCLUDED_ACTIONS or action in unsupported:
+            return f"Шаг {number}: инструмент {action} нельзя выполнять в run_actions"
+    return None
+
+
+def run_actions(
+    handlers: Dict[str, Callable[[Any, dict], dict]],
+    browser: Any,
+    steps: List[Dict[str, Any]],
+    stop_on_error: bool = True,
+    unsupported: Collection[str] = ()
+) -> Dict[str, Any]:
+    """
+    Последовательное выполнение шагов на одном браузере.
+
+    Если хотя бы один шаг ссылается на недоступный в пакете инструмент,
+    ни один шаг не выполняется.
+
+    Args:
+        handlers: Обработчики инструментов (action -> handler)
+        browser: BrowserManager
+        steps: Шаги вида {"action": ..., "arguments": {...}, "id": ...}
+        stop_on_error: Прекратить выполнение после первой ошибки
+        unsupported: Инструменты, недоступные в пакете (см. validate_steps)
+    """
+    error = validate_steps(steps, unsupported)
+    if error:
+        return {
+            "success": False,
+            "error": error,
+            "completed": 0,
+            "failed": 0,
+            "total": len(steps),
+            "steps": []
+        }
+
+    results: Dict[str, Any] = {}
+    report = []
+    failed = 0
+
+    for number, step in enumerate(steps, start=1):
+        action = step.get("action")
+        entry: Dict[str, Any] = {"step": number, "action": action}
+        if step.get("id"):
+            entry["id"] = step["id"]
+
+        try:
+            handler = handlers.get(action)
+            if handler is None:
+                raise ValueError(f"Неизвестное действие: {action}")
+
+            arguments = resolve_references(step.get("arguments", {}), results)
+            result = handler(browser, arguments)
+        except Exception as e:
+            logger.error(f"Ошибка в шаге {number} ({action}): {e}")
+            result = {
+                "success": False,
+                "error": str(e)
+            }
+
+        results[str(number)] = result
+        if step.get("id"):
+            results[str(step["id"])] = result
+
+        entry["result"] = result
+        report.append(entry)
+
+        if not result.get("success", False):
+            failed += 1
+            if stop_on_error:
+                break
+
+    return {
+        "success": failed == 0 and len(report) == len(steps),
+        "completed": len(report),
+        "failed": failed,
+        "total": len(steps),
+        "steps": report
+    }
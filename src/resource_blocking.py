@@ -0,0 +1,104 @@
+"""Правила блокировки загрузки ресурсов страницы."""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+# Расширения файлов по типам ресурсов
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "ogg", "mp3", "wav", "m4a", "m3u8", "mpd"],
+    "stylesheet": ["css"],
+}
+
+# Домены рекламы и аналитики для типа "ads"
+AD_HOSTS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "connect.facebook.net",
+    "mc.yandex.ru",
+    "an.yandex.ru",
+    "hotjar.com",
+    "scorecardresearch.com",
+    "amazon-adsystem.com",
+    "adnxs.com",
+    "criteo.com",
+    "taboola.com",
+    "outbrain.com",
+]
+
+RESOURCE_TYPES = sorted(list(RESOURCE_TYPE_EXTENSIONS) + ["ads"])
+
+
+def _type_patterns(resource_types: Iterable[str]) -> List[str]:
+    """Шаблоны URLPattern для типов ресурсов."""
+    patterns = []
+    for resource_type in resource_types:
+        if resource_type == "ads":
+            for host in AD_HOSTS:
+                patterns.append(f"*://{host}/*")
+                patterns.append(f"*://*.{host}/*")
+        elif resource_type in RESOURCE_TYPE_EXTENSIONS:
+            for extension in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+                patterns.append(f"*://*/*.{extension}")
+        else:
+            raise ValueError(
+                f"Неизвестный тип ресурса: {resource_type}. "
+                f"Допустимые: {', '.join(RESOURCE_TYPES)}"
+            )
+    return patterns
+
+
+def _legacy_type_patterns(resource_types: Iterable[str]) -> List[str]:
+    """Шаблоны с '*' для старого параметра Network.setBlockedURLs.urls."""
+    patterns = []
+    for resource_type in resource_types:
+        if resource_type == "ads":
+            patterns.extend(f"*{host}/*" for host in AD_HOSTS)
+        else:
+            for extension in RESOURCE_TYPE_EXTENSIONS.get(resource_type, []):
+                patterns.append(f"*.{extension}")
+                patterns.append(f"*.{extension}?*")
+    return patterns
+
+
+def build_block_rules(
+    block_types: Optional[Iterable[str]] = None,
+    block_urls: Optional[Iterable[str]] = None,
+    allow_urls: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    Параметры Network.setBlockedURLs.
+
+    Разрешающие шаблоны проверяются первыми и имеют приоритет над
+    блокирующими.
+
+    Args:
+        block_types: Типы ресурсов (image, font, media, stylesheet, ads)
+        block_urls: Блокируемые URL (синтаксис URLPattern, например *://*.example.com/*)
+        allow_urls: URL, которые загружаются даже при совпадении с блокировкой
+
+    Returns:
+        {"urlPatterns": [...]} для Chrome с поддержкой BlockPattern и
+        "legacy_urls" для старых версий (без списка разрешений)
+    """
+    block_types = list(block_types or [])
+    block_urls = list(block_urls or [])
+    allow_urls = list(allow_urls or [])
+
+    blocked = _type_patterns(block_types) + block_urls
+    if not blocked:
+        return {"urlPatterns": [], "legacy_urls": []}
+
+    url_patterns = (
+        [{"urlPattern": pattern, "block": False} for pattern in allow_urls]
+        + [{"urlPattern": pattern, "block": True} for pattern in blocked]
+    )
+    return {
+        "urlPatterns": url_patterns,
+        "legacy_urls": _legacy_type_patterns(block_types) + block_urls
+    }
@@ -0,0 +1,483 @@
+"""JavaScript, выполняемый на странице."""
+
+# Общие функции поиска элементов (by: css, xpath, id, name, class, tag)
+DOM_HELPERS = """
+function findAll(selector, by) {
+    if (by === 'xpath') {
+        const result = document.evaluate(
+            selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        const nodes = [];
+        for (let i = 0; i < result.snapshotLength; i++) {
+            nodes.push(result.snapshotItem(i));
+        }
+        return nodes;
+    }
+    const css = {
+        id: () => '#' + CSS.escape(selector),
+        name: () => '[name="' + CSS.escape(selector) + '"]',
+        class: () => '.' + CSS.escape(selector),
+    }[by];
+    return Array.from(document.querySelectorAll(css ? css() : selector));
+}
+
+function isVisible(el) {
+    const style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none'
+        && el.getClientRects().length > 0;
+}
+"""
+
+# Поиск элементов и сбор их свойств за один вызов execute_script.
+# arguments: selector, by, offset, limit, attributes
+ELEMENTS_INFO_SCRIPT = DOM_HELPERS + """
+const [selector, by, offset, limit, attributes] = arguments;
+
+// Как WebElement.get_attribute: сначала свойство, затем атрибут
+function attribute(el, name) {
+    const prop = name === 'class' ? 'className' : name;
+    const value = el[prop];
+    if (value !== undefined && value !== null
+            && typeof value !== 'object' && typeof value !== 'function') {
+        return String(value);
+    }
+    return el.getAttribute(name);
+}
+
+const all = findAll(selector, by);
+const nodes = all.slice(offset, offset + limit);
+const elements = nodes.map((el, i) => {
+    const text = el.innerText !== undefined ? el.innerText : el.textContent;
+    const attrs = {};
+    for (const name of attributes) {
+        attrs[name] = attribute(el, name);
+    }
+    return {
+        index: offset + i,
+        tag: el.tagName.toLowerCase(),
+        text: (text || '').trim().substring(0, 200),
+        visible: isVisible(el),
+        enabled: !el.disabled,
+        attributes: attrs
+    };
+});
+// nodes возвращаются ссылками на элементы (WebElement) для реестра handle
+return {total: all.length, elements: elements, nodes: nodes};
+"""
+
+# Ожидание элемента по событиям MutationObserver (execute_async_script).
+# Условие проверяется сразу, после каждой пачки изменений DOM и раз в
+# pollMs (для изменений без мутаций, например CSS анимаций).
+# arguments: selector, by, condition, timeoutMs, pollMs, callback
+# Результат: элемент (true для condition = gone) или null по таймауту.
+WAIT_FOR_ELEMENT_SCRIPT = DOM_HELPERS + """
+const [selector, by, condition, timeoutMs, pollMs, done] = arguments;
+
+function satisfied(el) {
+    if (condition === 'gone') {
+        return !el || !isVisible(el);
+    }
+    if (!el) {
+        return false;
+    }
+    if (condition === 'present') {
+        return true;
+    }
+    if (!isVisible(el)) {
+        return false;
+    }
+    return condition !== 'clickable' || !el.disabled;
+}
+
+let finished = false;
+let observer = null;
+let poller = null;
+let timer = null;
+
+function finish(value) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) observer.disconnect();
+    clearInterval(poller);
+    clearTimeout(timer);
+    done(value);
+}
+
+function check() {
+    const el = findAll(selector, by)[0] || null;
+    if (satisfied(el)) {
+        finish(condition === 'gone' ? true : el);
+    }
+}
+
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document, {childList: true, subtree: true, attributes: true});
+    poller = setInterval(check, pollMs);
+    timer = setTimeout(() => finish(null), timeoutMs);
+}
+"""
+
+# Ожидание простоя сети: нет незавершенных fetch/XHR (если установлен
+# NETWORK_TRACKER_SCRIPT) и новых ресурсов в течение idleMs.
+# arguments: idleMs, timeoutMs, callback. Результат: true или false по таймауту.
+WAIT_FOR_NETWORK_IDLE_SCRIPT = """
+const [idleMs, timeoutMs, done] = arguments;
+const started = performance.now();
+let quietSince = started;
+
+// PerformanceObserver не ограничен размером буфера resource timing
+const observer = new PerformanceObserver(() => { quietSince = performance.now(); });
+observer.observe({type: 'resource'});
+
+const timer = setInterval(() => {
+    const now = performance.now();
+    if ((window.__mcpPendingRequests || 0) > 0 || document.readyState !== 'complete') {
+        quietSince = now;
+    }
+    if (now - quietSince >= idleMs || now - started >= timeoutMs) {
+        clearInterval(timer);
+        observer.disconnect();
+        done(now - quietSince >= idleMs);
+    }
+}, 50);
+"""
+
+# Счетчик незавершенных fetch/XHR. Устанавливается через
+# Page.addScriptToEvaluateOnNewDocument до выполнения скриптов страницы.
+NETWORK_TRACKER_SCRIPT = """
+(() => {
+    if (window.__mcpPendingRequests !== undefined) {
+        return;
+    }
+    window.__mcpPendingRequests = 0;
+    const decrement = () => { window.__mcpPendingRequests--; };
+
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function (...args) {
+            window.__mcpPendingRequests++;
+            return originalFetch.apply(this, args).finally(decrement);
+        };
+    }
+
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        window.__mcpPendingRequests++;
+        this.addEventListener('loadend', decrement, {once: true});
+        return originalSend.apply(this, args);
+    };
+})();
+"""
+
+# Метка текущего документа: по ней ожидание отличает старую страницу
+# от новой при page_load_strategy = none.
+MARK_DOCUMENT_SCRIPT = "window.__mcpPreviousDocument = true;"
+
+# Ожидание document.readyState на новой странице.
+# arguments: state (interactive | complete), timeoutMs, callback
+# Результат: true, false по таймауту или null если это еще старый документ.
+WAIT_FOR_READY_STATE_SCRIPT = """
+const [state, timeoutMs, done] = arguments;
+if (window.__mcpPreviousDocument) {
+    // Старый документ: ждем его выгрузки (скрипт завершится ошибкой)
+    setTimeout(() => done(null), Math.min(timeoutMs, 100));
+    return;
+}
+const reached = () => state === 'interactive'
+    ? document.readyState !== 'loading'
+    : document.readyState === 'complete';
+if (reached()) {
+    done(true);
+    return;
+}
+const timer = setTimeout(() => done(false), timeoutMs);
+document.addEventListener('readystatechange', () => {
+    if (reached()) {
+        clearTimeout(timer);
+        done(true);
+    }
+});
+"""
+
+# URL, заголовок и тайминги навигации (Navigation Timing) одним вызовом
+NAVIGATION_RESULT_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const round = value => value > 0 ? Math.round(value) : null;
+let timing = null;
+if (nav) {
+    const resources = performance.getEntriesByType('resource');
+    timing = {
+        ttfb_ms: round(nav.responseStart - nav.startTime),
+        dom_content_loaded_ms: round(nav.domContentLoadedEventEnd - nav.startTime),
+        load_ms: round(nav.loadEventEnd - nav.startTime),
+        resources: resources.length,
+        transfer_bytes: resources.reduce(
+            (sum, entry) => sum + (entry.transferSize || 0), nav.transferSize || 0
+        )
+    };
+}
+return {url: location.href, title: document.title, ready_state: document.readyState, timing: timing};
+"""
+
+# Состояние страницы одним вызовом без передачи DOM: размер документа -
+# decodedBodySize ответа (null для about:blank и data: URL), число
+# незавершенных fetch/XHR - null, если NETWORK_TRACKER_SCRIPT не установлен.
+PAGE_INFO_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const pending = window.__mcpPendingRequests;
+return {
+    url: location.href,
+    title: document.title,
+    ready_state: document.readyState,
+    dom_nodes: document.getElementsByTagName('*').length,
+    document_bytes: nav && nav.decodedBodySize ? nav.decodedBodySize : null,
+    scroll_height: Math.max(
+        document.documentElement ? document.documentElement.scrollHeight : 0,
+        document.body ? document.body.scrollHeight : 0
+    ),
+    pending_requests: pending === undefined ? null : Math.max(pending, 0)
+};
+"""
+
+# URL и localStorage текущего origin для восстановления сессии
+SESSION_STATE_SCRIPT = """
+let items = null;
+try {
+    items = Object.assign({}, window.localStorage);
+} catch (e) {
+    // about:blank, data: URL и sandbox без доступа к storage
+}
+return {url: location.href, local_storage: {origin: location.origin, items: items}};
+"""
+
+# Скрипт нового документа: запись сохраненного localStorage до скриптов
+# страницы. Подставляется результат SESSION_STATE_SCRIPT.local_storage.
+RESTORE_STORAGE_SCRIPT = """
+(() => {
+    const saved = %s;
+    if (location.origin !== saved.origin) {
+        return;
+    }
+    for (const [key, value] of Object.entries(saved.items)) {
+        if (localStorage.getItem(key) === null) {
+            localStorage.setItem(key, value);
+        }
+    }
+})();
+"""
+
+# Область скриншота в CSS пикселях документа (для Page.captureScreenshot clip).
+# arguments: selector (null - видимая область), by, fullPage
+# Результат: {url, clip: {x, y, width, height}} или clip = null если
+# элемент не найден.
+SCREENSHOT_AREA_SCRIPT = DOM_HELPERS + """
+const [selector, by, fullPage] = arguments;
+let clip;
+if (selector) {
+    const el = findAll(selector, by)[0];
+    if (el) {
+        const rect = el.getBoundingClientRect();
+        clip = {
+            x: rect.left + window.scrollX,
+            y: rect.top + window.scrollY,
+            width: rect.width,
+            height: rect.height
+        };
+    } else {
+        clip = null;
+    }
+} else if (fullPage) {
+    const root = document.documentElement;
+    clip = {
+        x: 0,
+        y: 0,
+        width: Math.max(root.scrollWidth, document.body ? document.body.scrollWidth : 0),
+        height: Math.max(root.scrollHeight, document.body ? document.body.scrollHeight : 0)
+    };
+} else {
+    clip = {x: window.scrollX, y: window.scrollY, width: window.innerWidth, height: window.innerHeight};
+}
+return {url: location.href, clip: clip};
+"""
+
+# Запись изменений DOM. MutationObserver устанавливается при первом
+# вызове в документе: он увеличивает счетчик версии и накапливает записи
+# для get_page_changes. Новый документ получает новый document id, поэтому
+# пара (document, version) меняется при любом изменении или переходе.
+CHANGE_RECORDER = """
+const MAX_CHANGE_RECORDS = 2000;
+
+function installRecorder() {
+    if (window.__mcpDomVersion !== undefined) {
+        return false;
+    }
+    window.__mcpDomVersion = 0;
+    window.__mcpDocumentId = Date.now().toString(36) + Math.random().toString(36).slice(2);
+    resetChanges();
+    new MutationObserver(records => {
+        window.__mcpDomVersion += records.length;
+        const log = window.__mcpChangeLog;
+        for (const record of records) {
+            if (log.length >= MAX_CHANGE_RECORDS) {
+                window.__mcpChangeOverflow = true;
+                break;
+            }
+            log.push(record);
+        }
+    }).observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true,
+        attributeOldValue: true, characterDataOldValue: true
+    });
+    return true;
+}
+
+function resetChanges() {
+    window.__mcpChangeLog = [];
+    window.__mcpChangeOverflow = false;
+}
+
+function pageState() {
+    return {
+        url: location.href,
+        title: document.title,
+        document: window.__mcpDocumentId,
+        version: window.__mcpDomVersion
+    };
+}
+"""
+
+# Версия DOM для кэша снимков. Чтение страницы начинает новое окно
+# изменений для get_page_changes.
+DOM_VERSION_SCRIPT = CHANGE_RECORDER + """
+installRecorder();
+resetChanges();
+return pageState();
+"""
+
+# Изменения DOM с последнего чтения страницы или вызова get_page_changes.
+# Добавленные и удаленные узлы сворачиваются до верхних в поддереве,
+# узлы, добавленные и удаленные в одном окне, не попадают в ответ.
+# arguments: maxItems (ограничение каждого списка)
+PAGE_CHANGES_SCRIPT = CHANGE_RECORDER + """
+const [maxItems] = arguments;
+
+if (installRecorder()) {
+    // Новый документ: изменения отслеживаются с этого момента
+    return Object.assign(pageState(), {baseline: true});
+}
+
+const log = window.__mcpChangeLog;
+const overflow = window.__mcpChangeOverflow;
+resetChanges();
+
+const clip = (text, length) => (text || '').trim().replace(/\\s+/g, ' ').substring(0, length);
+
+function within(node, nodes) {
+    for (let parent = node.parentNode; parent; parent = parent.parentNode) {
+        if (nodes.has(parent)) {
+            return true;
+        }
+    }
+    return false;
+}
+
+function describe(node) {
+    if (node.nodeType === Node.TEXT_NODE) {
+        return {tag: '#text', parent: node.parentNode ? node.parentNode.nodeName.toLowerCase() : null,
+                text: clip(node.data, 200)};
+    }
+    const info = {tag: node.tagName.toLowerCase(), text: clip(node.innerText || node.textContent, 200)};
+    if (node.id) {
+        info.id = node.id;
+    }
+    return info;
+}
+
+const meaningful = node => node.nodeType === Node.ELEMENT_NODE
+    || (node.nodeType === Node.TEXT_NODE && node.data.trim() !== '');
+
+const added = new Set();
+const removed = new Set();
+const texts = new Map();
+const attributes = new Map();
+
+for (const record of log) {
+    if (record.type === 'childList') {
+        record.addedNodes.forEach(node => removed.has(node) ? removed.delete(node) : added.add(node));
+        record.removedNodes.forEach(node => added.has(node) ? added.delete(node) : removed.add(node));
+    } else if (record.type === 'characterData') {
+        if (!texts.has(record.target)) {
+            texts.set(record.target, record.oldValue);
+        }
+    } else if (record.type === 'attributes') {
+        const key = record.target;
+        if (!attributes.has(key)) {
+            attributes.set(key, new Map());
+        }
+        if (!attributes.get(key).has(record.attributeName)) {
+            attributes.get(key).set(record.attributeName, record.oldValue);
+        }
+    }
+}
+
+const addedNodes = [...added].filter(node => node.isConnected && meaningful(node) && !within(node, added));
+const removedNodes = [...removed].filter(node => meaningful(node) && !within(node, removed));
+
+const textChanged = [];
+texts.forEach((old, node) => {
+    if (node.isConnected && node.data !== old && !within(node, added)) {
+        textChanged.push({parent: node.parentNode.nodeName.toLowerCase(), old: clip(old, 200), new: clip(node.data, 200)});
+    }
+});
+
+const attributeChanged = [];
+attributes.forEach((names, el) => {
+    if (!el.isConnected || within(el, added)) {
+        return;
+    }
+    names.forEach((old, name) => {
+        const value = el.getAttribute(name);
+        if (value !== old) {
+            attributeChanged.push({tag: el.tagName.toLowerCase(), id: el.id || undefined,
+                                   attribute: name, old: old, new: value});
+        }
+    });
+});
+
+const links = [];
+const forms = [];
+for (const node of addedNodes) {
+    if (node.nodeType !== Node.ELEMENT_NODE) {
+        continue;
+    }
+    for (const a of [node, ...node.querySelectorAll('a[href]')].filter(el => el.matches('a[href]'))) {
+        links.push({text: clip(a.textContent, 100), href: a.href});
+    }
+    for (const form of [node, ...node.querySelectorAll('form')].filter(el => el.matches('form'))) {
+        forms.push({action: form.action, method: form.method,
+                    inputs: form.querySelectorAll('input, textarea, select').length});
+    }
+}
+
+const lists = {
+    added: addedNodes.map(describe),
+    removed: removedNodes.map(describe),
+    text_changed: textChanged,
+    attributes_changed: attributeChanged,
+    links: links,
+    forms: forms
+};
+const result = Object.assign(pageState(), {baseline: false, overflow: overflow, counts: {}});
+let total = 0;
+for (const [name, items] of Object.entries(lists)) {
+    result.counts[name] = items.length;
+    result[name] = items.slice(0, maxItems);
+    total += items.length;
+}
+result.changed = total > 0 || overflow;
+return result;
+"""
@@ -2,13 +2,28 @@
 
 import asyncio
 import logging
-from typing import Any, Optional
+import time
+import uuid
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, Optional
 from mcp.server import Server
-from mcp.types import Tool, TextContent
+from mcp.types import Tool, TextContent, ImageContent
 from pydantic import AnyUrl
 import mcp.server.stdio
 
 from browser_manager import BrowserManager
+from browser_pool import BrowserPool
+from crawler import EXTRACTORS, HostThrottle, fetch_many, fetch_page
+from dispatcher import ToolDispatcher, ToolTimeoutError
+from encoding import encode_result
+from memory import MemoryGovernor
+from metrics import Metrics
+from pipeline import run_actions
+from resource_blocking import RESOURCE_TYPES
+from waits import WaitEngine
+from settings import load_settings
+from tracing import EXPORTERS, Tracer
+from watchdog import Watchdog
 
 # Настройка логирования
 logging.basicConfig(
@@ -19,7 +34,71 @@ logger = logging.getLogger(__name__)
 
 # Создание сервера
 server = Server("chrome-automation")
-browser = BrowserManager()
+settings = load_settings()
+metrics = Metrics() if settings["metrics"]["enabled"] else None
+watchdog = Watchdog(
+    max_restarts=settings["watchdog"]["max_restarts"],
+    backoff=settings["watchdog"]["backoff"],
+    restore_url=settings["watchdog"]["restore_url"],
+    restore_storage=settings["watchdog"]["restore_storage"],
+    retry_idempotent=settings["watchdog"]["retry_idempotent"]
+) if settings["watchdog"]["enabled"] else None
+tracer = (
+    Tracer(EXPORTERS[settings["tracing"]["format"]](settings["tracing"]["file"]))
+    if settings["tracing"]["enabled"] else None
+)
+
+
+def _create_browser() -> BrowserManager:
+    """Создание BrowserManager с настройками из конфигурации."""
+    browser = BrowserManager(
+        headless=settings["headless"],
+        user_data_dir=settings["startup"]["user_data_dir"],
+        driver_path=settings["startup"]["driver_path"],
+        chrome_arguments=settings["chrome_options"],
+        window_size=(
+            settings["window_size"]["width"],
+            settings["window_size"]["height"]
+        ),
+        waits=WaitEngine(
+            event_driven=settings["waits"]["event_driven"],
+            poll_frequency=settings["waits"]["poll_frequency"]
+        ),
+        track_requests=settings["waits"]["track_requests"],
+        blocking=settings["blocking"],
+        page_load_strategy=settings["navigation"]["page_load_strategy"],
+        wait_until=settings["navigation"]["wait_until"],
+        navigation_timeout=settings["navigation"]["timeout"],
+        max_text_length=settings["output"]["max_text_length"],
+        screenshot=settings["screenshot"],
+        metrics=metrics,
+        tracer=tracer,
+        devtools_websocket=settings["devtools"]["websocket"],
+        command_timeout=settings["server"]["tool_timeout"]
+    )
+    browser.timeout = settings["timeout"]
+    return browser
+
+
+pool = BrowserPool(
+    factory=_create_browser,
+    size=settings["pool"]["size"],
+    max_size=settings["pool"]["max_size"],
+    max_navigations=settings["pool"]["max_navigations"],
+    idle_timeout=settings["pool"]["idle_timeout"],
+    memory=MemoryGovernor(
+        max_rss_mb=settings["memory"]["max_rss_mb"],
+        # pool.max_memory_mb - прежнее название лимита JS heap
+        max_heap_mb=settings["memory"]["max_heap_mb"] or settings["pool"].get("max_memory_mb", 0),
+        actions=settings["memory"]["actions"],
+        interval=settings["memory"]["interval"],
+        metrics=metrics
+    ) if settings["memory"]["enabled"] else None
+)
+dispatcher = ToolDispatcher(
+    max_workers=settings["server"]["max_workers"],
+    timeout=settings["server"]["tool_timeout"]
+)
 
 
 # Определение инструментов
@@ -55,6 +134,37 @@ TOOLS = [
                 "url": {
                     "type": "string",
                     "description": "URL страницы для открытия"
+                },
+                "block_resources": {
+                    "type": "array",
+                    "items": {
+                        "type": "string",
+                        "enum": RESOURCE_TYPES
+                    },
+                    "description": "Не загружать ресурсы этих типов (по умолчанию из настроек). Для извлечения текста: [\"image\", \"font\", \"media\", \"ads\"]"
+                },
+                "block_urls": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Не загружать URL по шаблонам, например *://*.example.com/*"
+                },
+                "allow_urls": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Загружать URL по шаблонам даже если они попадают под блокировку"
+                },
+                "wait_until": {
+                    "type": "string",
+                    "description": "Когда считать переход завершенным (по умолчанию из настроек). Раньше load возможно только при page_load_strategy eager/none",
+                    "enum": ["commit", "domcontentloaded", "load", "selector", "networkidle"]
+                },
+                "wait_selector": {
+                    "type": "string",
+                    "description": "CSS селектор элемента для wait_until = selector"
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "Таймаут ожидания wait_until в секундах"
                 }
             },
             "required": ["url"]
@@ -62,7 +172,7 @@ TOOLS = [
     ),
     Tool(
         name="click_element",
-        description="Кликнуть по элементу на странице. Поддерживает различные типы селекторов.",
+        description="Кликнуть по элементу на странице. Поддерживает различные типы селекторов или element_id ранее найденного элемента.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -75,9 +185,16 @@ TOOLS = [
                     "description": "Тип селектора: css, xpath, id, name, class, tag",
                     "default": "css",
                     "enum": ["css", "xpath", "id", "name", "class", "tag"]
+                },
+                "element_id": {
+                    "type": "string",
+                    "description": "Идентификатор элемента из find_element или get_elements_info (вместо selector, без повторного поиска)"
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "Таймаут ожидания элемента в секундах (по умолчанию из настроек)"
                 }
-            },
-            "required": ["selector"]
+            }
         }
     ),
     Tool(
@@ -104,14 +221,22 @@ TOOLS = [
                     "type": "boolean",
                     "description": "Очистить поле перед вводом",
                     "default": True
+                },
+                "element_id": {
+                    "type": "string",
+                    "description": "Идентификатор элемента из find_element или get_elements_info (вместо selector, без повторного поиска)"
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "Таймаут ожидания элемента в секундах (по умолчанию из настроек)"
                 }
             },
-            "required": ["selector", "text"]
+            "required": ["text"]
         }
     ),
     Tool(
         name="find_element",
-        description="Найти элемент на странице и получить информацию о нем (текст, тег, видимость).",
+        description="Найти элемент на странице и получить информацию о нем (текст, тег, видимость) и element_id для click_element, type_text и get_text.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -124,6 +249,10 @@ TOOLS = [
                     "description": "Тип селектора: css, xpath, id, name, class, tag",
                     "default": "css",
                     "enum": ["css", "xpath", "id", "name", "class", "tag"]
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "Таймаут ожидания элемента в секундах (по умолчанию из настроек)"
                 }
             },
             "required": ["selector"]
@@ -144,20 +273,107 @@ TOOLS = [
                     "description": "Тип селектора: css, xpath, id, name, class, tag",
                     "default": "css",
                     "enum": ["css", "xpath", "id", "name", "class", "tag"]
+                },
+                "element_id": {
+                    "type": "string",
+                    "description": "Идентификатор элемента из find_element или get_elements_info (вместо selector, без повторного поиска)"
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "Таймаут ожидания элемента в секундах (по умолчанию из настроек)"
                 }
-            },
-            "required": ["selector"]
+            }
+        }
+    ),
+    Tool(
+        name="wait_for",
+        description="Дождаться состояния страницы: появления, видимости или исчезновения элемента либо простоя сети. Завершается сразу после изменения DOM, без опроса.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "condition": {
+                    "type": "string",
+                    "description": "present - элемент в DOM, visible - видим, clickable - видим и активен, gone - исчез или скрыт, network_idle - нет новых запросов",
+                    "default": "visible",
+                    "enum": ["present", "visible", "clickable", "gone", "network_idle"]
+                },
+                "selector": {
+                    "type": "string",
+                    "description": "Селектор элемента (не нужен для network_idle)"
+                },
+                "by": {
+                    "type": "string",
+                    "description": "Тип селектора: css, xpath, id, name, class, tag",
+                    "default": "css",
+                    "enum": ["css", "xpath", "id", "name", "class", "tag"]
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "Таймаут в секундах (по умолчанию из настроек)"
+                },
+                "idle_ms": {
+                    "type": "integer",
+                    "description": "Сколько миллисекунд сеть должна простаивать для network_idle",
+                    "default": 500
+                }
+            }
         }
     ),
     Tool(
         name="screenshot",
-        description="Сделать скриншот текущей страницы. Можно указать имя файла для сохранения.",
+        description="Сделать скриншот текущей страницы, элемента или всей страницы. JPEG/WebP и уменьшенный масштаб заметно сокращают размер. Можно указать имя файла для сохранения.",
         inputSchema={
             "type": "object",
             "properties": {
                 "filename": {
                     "type": "string",
                     "description": "Путь для сохранения скриншота (опционально)"
+                },
+                "format": {
+                    "type": "string",
+                    "enum": ["png", "jpeg", "webp"],
+                    "description": "Формат изображения (по умолчанию из конфигурации)"
+                },
+                "quality": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "maximum": 100,
+                    "description": "Качество jpeg и webp"
+                },
+                "selector": {
+                    "type": "string",
+                    "description": "Снять только область элемента"
+                },
+                "by": {
+                    "type": "string",
+                    "enum": ["css", "xpath", "id", "name", "class", "tag"],
+                    "default": "css"
+                },
+                "clip": {
+                    "type": "object",
+                    "description": "Прямоугольник в CSS пикселях документа",
+                    "properties": {
+                        "x": {"type": "number"},
+                        "y": {"type": "number"},
+                        "width": {"type": "number"},
+                        "height": {"type": "number"}
+                    },
+                    "required": ["x", "y", "width", "height"]
+                },
+                "scale": {
+                    "type": "number",
+                    "exclusiveMinimum": 0,
+                    "description": "Масштаб изображения (0.5 - вдвое меньше по каждой стороне)"
+                },
+                "full_page": {
+                    "type": "boolean",
+                    "description": "Снять всю страницу целиком",
+                    "default": False
+                },
+                "return_image": {
+                    "type": "boolean",
+                    "description": "Вернуть изображение в ответе (false - только сохранить в файл)",
+                    "default": True
                 }
             }
         }
@@ -178,7 +394,7 @@ TOOLS = [
     ),
     Tool(
         name="get_page_info",
-        description="Получить информацию о текущей странице (URL, заголовок, размер).",
+        description="Получить состояние текущей страницы (URL, заголовок, readyState, число элементов, размер документа, высота прокрутки, незавершенные запросы) без передачи HTML. Подходит для частой проверки.",
         inputSchema={
             "type": "object",
             "properties": {}
@@ -208,9 +424,62 @@ TOOLS = [
             "properties": {}
         }
     ),
+    Tool(
+        name="tab_open",
+        description="Открыть новую вкладку и переключиться на нее. Изолированная вкладка получает отдельные cookies и storage в том же процессе Chrome.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "url": {
+                    "type": "string",
+                    "description": "URL для открытия во вкладке (опционально)"
+                },
+                "isolated": {
+                    "type": "boolean",
+                    "description": "Создать вкладку в отдельном контексте браузера (как инкогнито)",
+                    "default": False
+                }
+            }
+        }
+    ),
+    Tool(
+        name="tab_switch",
+        description="Переключиться на вкладку по ее идентификатору.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "tab_id": {
+                    "type": "string",
+                    "description": "Идентификатор вкладки из tab_open или tab_list"
+                }
+            },
+            "required": ["tab_id"]
+        }
+    ),
+    Tool(
+        name="tab_close",
+        description="Закрыть вкладку (по умолчанию текущую). Изолированный контекст удаляется вместе с последней вкладкой.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "tab_id": {
+                    "type": "string",
+                    "description": "Идентификатор вкладки (опционально)"
+                }
+            }
+        }
+    ),
+    Tool(
+        name="tab_list",
+        description="Получить список открытых вкладок (идентификатор, URL, заголовок).",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
     Tool(
         name="get_page_html",
-        description="Получить HTML код страницы. Можно получить очищенный от скриптов HTML для анализа структуры.",
+        description="Получить HTML код страницы. Можно получить очищенный от скриптов HTML для анализа структуры. Большой HTML выдается фрагментами: продолжение по next_cursor.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -218,13 +487,31 @@ TOOLS = [
                     "type": "boolean",
                     "description": "Очистить от script и style тегов для уменьшения размера",
                     "default": True
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Начало фрагмента (символ)",
+                    "default": 0
+                },
+                "max_length": {
+                    "type": "integer",
+                    "description": "Максимальная длина фрагмента (по умолчанию из конфигурации, 0 - без ограничения)"
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "next_cursor из предыдущего ответа этого инструмента с теми же параметрами: следующий фрагмент того же снимка без повторного извлечения (ошибка, если DOM изменился)"
+                },
+                "use_cache": {
+                    "type": "boolean",
+                    "description": "Вернуть сохраненный снимок, если DOM страницы не изменился",
+                    "default": True
                 }
             }
         }
     ),
     Tool(
         name="get_all_text",
-        description="Получить весь текстовый контент страницы. Быстрая альтернатива скриншоту для анализа содержимого.",
+        description="Получить весь текстовый контент страницы. Быстрая альтернатива скриншоту для анализа содержимого. Большой текст выдается фрагментами: продолжение по next_cursor.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -232,13 +519,31 @@ TOOLS = [
                     "type": "boolean",
                     "description": "Получить только видимый текст (без скрытых элементов)",
                     "default": True
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Начало фрагмента (символ)",
+                    "default": 0
+                },
+                "max_length": {
+                    "type": "integer",
+                    "description": "Максимальная длина фрагмента (по умолчанию из конфигурации, 0 - без ограничения)"
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "next_cursor из предыдущего ответа этого инструмента с теми же параметрами: следующий фрагмент того же снимка без повторного извлечения (ошибка, если DOM изменился)"
+                },
+                "use_cache": {
+                    "type": "boolean",
+                    "description": "Вернуть сохраненный снимок, если DOM страницы не изменился",
+                    "default": True
                 }
             }
         }
     ),
     Tool(
         name="get_elements_info",
-        description="Получить информацию о нескольких элементах (текст, атрибуты, видимость). Полезно для анализа списков, таблиц, форм.",
+        description="Получить информацию о нескольких элементах (текст, атрибуты, видимость) и их element_id. Полезно для анализа списков, таблиц, форм.",
         inputSchema={
             "type": "object",
             "properties": {
@@ -256,131 +561,632 @@ TOOLS = [
                     "type": "integer",
                     "description": "Максимальное количество элементов для возврата",
                     "default": 50
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Сколько элементов пропустить (для постраничного чтения больших списков)",
+                    "default": 0
+                },
+                "attributes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Атрибуты для возврата (по умолчанию id, class, href, src, type, value)"
+                },
+                "use_script": {
+                    "type": "boolean",
+                    "description": "Собрать данные одним JavaScript вызовом (быстро). false - отдельные команды WebDriver для каждого элемента",
+                    "default": True
                 }
             },
             "required": ["selector"]
         }
     ),
+    Tool(
+        name="run_actions",
+        description="Выполнить последовательность действий за один вызов. Каждый шаг - инструмент этого сервера с его аргументами, кроме fetch_many, server_stats и run_actions (пакет с ними не выполняется). Таймаут пакета - server.tool_timeout на каждый шаг. В аргументах можно ссылаться на результаты предыдущих шагов: ${2.text} (номер шага с 1) или ${search.elements.0.attributes.href} (id шага).",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "steps": {
+                    "type": "array",
+                    "description": "Шаги в порядке выполнения",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "action": {
+                                "type": "string",
+                                "description": "Имя инструмента (navigate, click_element, type_text, get_text, ...)"
+                            },
+                            "arguments": {
+                                "type": "object",
+                                "description": "Аргументы инструмента"
+                            },
+                            "id": {
+                                "type": "string",
+                                "description": "Имя шага для ссылок (опционально)"
+                            }
+                        },
+                        "required": ["action"]
+                    }
+                },
+                "stop_on_error": {
+                    "type": "boolean",
+                    "description": "Остановиться на первом неуспешном шаге",
+                    "default": True
+                }
+            },
+            "required": ["steps"]
+        }
+    ),
+    Tool(
+        name="get_page_changes",
+        description="Получить только изменения страницы с последнего чтения (после click_element, type_text и т.д.): добавленные и удаленные элементы, измененный текст и атрибуты, новые ссылки и формы. Намного меньше повторного get_all_text.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "max_items": {
+                    "type": "integer",
+                    "description": "Максимальное число элементов в каждом списке",
+                    "default": 50
+                }
+            }
+        }
+    ),
     Tool(
         name="get_page_structure",
         description="Получить структурированную информацию о странице: заголовки, ссылки, формы, изображения, мета-данные. Лучшая альтернатива скриншоту для понимания содержимого.",
         inputSchema={
             "type": "object",
-            "properties": {}
+            "properties": {
+                "use_cache": {
+                    "type": "boolean",
+                    "description": "Вернуть сохраненный снимок, если DOM страницы не изменился",
+                    "default": True
+                }
+            }
+        }
+    ),
+    Tool(
+        name="fetch_many",
+        description="Загрузить несколько страниц параллельно (в отдельной вкладке браузера сессии и в запущенных свободных браузерах пула) и извлечь из каждой текст, HTML, структуру или модель. Соблюдает лимиты на хост и таймаут на страницу; о каждой загруженной странице сообщает уведомлением о прогрессе.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "urls": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Адреса страниц"
+                },
+                "mode": {
+                    "type": "string",
+                    "description": "Что извлечь: text (get_all_text), html (get_page_html), structure (get_page_structure), model (get_page_model), info (get_page_info)",
+                    "default": "text",
+                    "enum": list(EXTRACTORS)
+                },
+                "max_length": {
+                    "type": "integer",
+                    "description": "Максимальная длина text и html каждой страницы (0 - без ограничения)",
+                    "default": 20000
+                },
+                "concurrency": {
+                    "type": "integer",
+                    "description": "Сколько страниц загружать одновременно (по умолчанию из настроек, не больше 1 + число запущенных свободных браузеров пула)"
+                },
+                "max_per_host": {
+                    "type": "integer",
+                    "description": "Максимум одновременных загрузок с одного хоста (по умолчанию из настроек)"
+                },
+                "host_delay": {
+                    "type": "number",
+                    "description": "Минимальный интервал между загрузками с одного хоста, секунд (по умолчанию из настроек)"
+                },
+                "timeout": {
+                    "type": "number",
+                    "description": "Таймаут загрузки и извлечения одной страницы, секунд (по умолчанию из настроек)"
+                },
+                "block_resources": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": RESOURCE_TYPES},
+                    "description": "Не загружать ресурсы этих типов, например [\"image\", \"font\", \"media\"]"
+                }
+            },
+            "required": ["urls"]
+        }
+    ),
+    Tool(
+        name="server_stats",
+        description="Статистика сервера по каждому инструменту и методу браузера: число вызовов, доля ошибок, p50/p95/max времени, объем ответов, число команд WebDriver; память браузеров сессий (RSS процессов Chrome, JS heap); состояние пула браузеров.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "reset": {
+                    "type": "boolean",
+                    "description": "Обнулить статистику после получения",
+                    "default": False
+                }
+            }
+        }
+    ),
+    Tool(
+        name="get_page_model",
+        description="Получить пронумерованный список интерактивных элементов страницы (кнопки, ссылки, поля, ARIA виджеты, элементы с обработчиками click, включая shadow DOM и iframe) с ролью, именем, координатами и видимостью. Каждый элемент имеет element_id для click_element, type_text и get_text. Меньше HTML и полнее get_page_structure.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "max_elements": {
+                    "type": "integer",
+                    "description": "Максимальное количество элементов",
+                    "default": 200
+                },
+                "visible_only": {
+                    "type": "boolean",
+                    "description": "Только видимые элементы",
+                    "default": False
+                },
+                "use_cache": {
+                    "type": "boolean",
+                    "description": "Вернуть сохраненный снимок, если DOM страницы не изменился",
+                    "default": True
+                }
+            }
         }
     )
 ]
 
 
+# Каждый инструмент принимает session_id для явной привязки к браузеру пула
+# и fields для выбора полей ответа
+for _tool in TOOLS:
+    _tool.inputSchema["properties"]["session_id"] = {
+        "type": "string",
+        "description": "Идентификатор сессии браузера (по умолчанию - текущая MCP сессия)"
+    }
+    _tool.inputSchema["properties"]["fields"] = {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Вернуть только эти поля ответа (success и error возвращаются всегда)"
+    }
+
+
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """Список доступных инструментов."""
     return TOOLS
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Обработка вызовов инструментов."""
+def _browser_start(browser: BrowserManager, arguments: dict) -> dict:
+    headless = arguments.get("headless", settings["headless"])
+    if browser.driver and browser.headless != headless:
+        # Прогретый браузер запущен в другом режиме
+        browser.stop()
+    browser.headless = headless
+    return browser.start()
+
+
+def _navigate(browser: BrowserManager, arguments: dict) -> dict:
+    return browser.navigate(
+        arguments["url"],
+        arguments.get("block_resources"),
+        arguments.get("block_urls"),
+        arguments.get("allow_urls"),
+        arguments.get("wait_until"),
+        arguments.get("wait_selector"),
+        arguments.get("timeout")
+    )
+
+
+def _click_element(browser: BrowserManager, arguments: dict) -> dict:
+    return browser.click(
+        arguments.get("selector"),
+        arguments.get("by", "css"),
+        arguments.get("timeout"),
+        arguments.get("element_id")
+    )
+
+
+def _type_text(browser: BrowserManager, arguments: dict) -> dict:
+    return browser.type_text(
+        arguments.get("selector"),
+        arguments["text"],
+        arguments.get("by", "css"),
+        arguments.get("clear_first", True),
+        arguments.get("timeout"),
+        arguments.get("element_id")
+    )
+
+
+def _screenshot(browser: BrowserManager, arguments: dict) -> dict:
+    return browser.screenshot(
+        arguments.get("filename"),
+        arguments.get("format"),
+        arguments.get("quality"),
+        arguments.get("selector"),
+        arguments.get("by", "css"),
+        arguments.get("clip"),
+        arguments.get("scale"),
+        arguments.get("full_page", False),
+        arguments.get("return_image", True)
+    )
+
+
+def _get_elements_info(browser: BrowserManager, arguments: dict) -> dict:
+    return browser.get_elements_info(
+        arguments["selector"],
+        arguments.get("by", "css"),
+        arguments.get("max_elements", 50),
+        arguments.get("offset", 0),
+        arguments.get("attributes"),
+        arguments.get("use_script", True)
+    )
+
+
+# Обработчики инструментов: (browser, arguments) -> dict.
+# Все они блокирующие и выполняются в пуле потоков диспетчера.
+HANDLERS: dict[str, Callable[[BrowserManager, dict], dict]] = {
+    "browser_start": _browser_start,
+    "browser_stop": lambda b, a: b.stop(),
+    "navigate": _navigate,
+    "click_element": _click_element,
+    "type_text": _type_text,
+    "find_element": lambda b, a: b.find_element(
+        a["selector"], a.get("by", "css"), a.get("timeout")
+    ),
+    "get_text": lambda b, a: b.get_text(
+        a.get("selector"), a.get("by", "css"), a.get("timeout"), a.get("element_id")
+    ),
+    "wait_for": lambda b, a: b.wait_for(
+        a.get("condition", "visible"), a.get("selector"), a.get("by", "css"),
+        a.get("timeout"), a.get("idle_ms", 500)
+    ),
+    "screenshot": _screenshot,
+    "execute_javascript": lambda b, a: b.execute_script(a["script"]),
+    "get_page_info": lambda b, a: b.get_page_info(),
+    "browser_back": lambda b, a: b.back(),
+    "browser_forward": lambda b, a: b.forward(),
+    "browser_refresh": lambda b, a: b.refresh(),
+    "tab_open": lambda b, a: b.open_tab(a.get("url"), a.get("isolated", False)),
+    "tab_switch": lambda b, a: b.switch_tab(a["tab_id"]),
+    "tab_close": lambda b, a: b.close_tab(a.get("tab_id")),
+    "tab_list": lambda b, a: b.list_tabs(),
+    "get_page_html": lambda b, a: b.get_page_html(
+        a.get("clean", True), a.get("offset", 0), a.get("max_length"), a.get("cursor"),
+        a.get("use_cache", True)
+    ),
+    "get_all_text": lambda b, a: b.get_all_text(
+        a.get("visible_only", True), a.get("offset", 0), a.get("max_length"), a.get("cursor"),
+        a.get("use_cache", True)
+    ),
+    "get_elements_info": _get_elements_info,
+    "get_page_changes": lambda b, a: b.get_page_changes(a.get("max_items", 50)),
+    "get_page_structure": lambda b, a: b.get_page_structure(a.get("use_cache", True)),
+    "get_page_model": lambda b, a: b.get_page_model(
+        a.get("max_elements", 200), a.get("visible_only", False), a.get("use_cache", True)
+    ),
+}
+# Пакет выполняется одним заданием в пуле потоков под одной блокировкой
+HANDLERS["run_actions"] = lambda b, a: run_actions(
+    HANDLERS, b, a["steps"], a.get("stop_on_error", True), unsupported=ASYNC_HANDLERS
+)
+
+
+def _session_key(arguments: dict) -> str:
+    """Ключ сессии для пула: явный session_id или текущая MCP сессия."""
+    session_id = arguments.get("session_id")
+    if session_id:
+        return str(session_id)
+    try:
+        return f"mcp-{id(server.request_context.session)}"
+    except LookupError:
+        return "default"
+
+
+async def _report_progress(progress: float, total: float, message: str) -> None:
+    """Уведомление о ходе вызова, если клиент передал progressToken."""
+    try:
+        context = server.request_context
+    except LookupError:
+        return
+    token = context.meta.progressToken if context.meta else None
+    if token is None:
+        return
+    try:
+        await context.session.send_progress_notification(token, progress, total, message)
+    except TypeError:
+        # Версии mcp без текста в уведомлении о прогрессе
+        await context.session.send_progress_notification(token, progress, total)
+
+
+def _open_fetch_tab(browser: BrowserManager) -> dict:
+    """Вкладка для fetch_many в браузере сессии (текущая страница сохраняется)."""
+    _restart_if_pending(browser)
+    return browser.open_tab()
+
+
+def _close_fetch_tab(browser: BrowserManager, tab_id: str) -> dict:
+    """Закрытие вкладки fetch_many и возврат к прежней вкладке сессии."""
+    if browser.driver is None or tab_id not in browser.driver.window_handles:
+        return {"success": True}
+    return browser.close_tab(tab_id)
+
+
+async def _fetch_many(arguments: dict) -> dict:
+    """
+    Параллельная загрузка страниц.
+    
+    Исполнители - отдельная вкладка браузера сессии и уже запущенные
+    свободные браузеры пула, выданные на время вызова и остановленные
+    после него. Браузеры для вызова не запускаются.
+    """
+    urls = arguments["urls"]
+    mode = arguments.get("mode", "text")
+    if not urls:
+        return {
+            "success": False,
+            "error": "Список urls пуст"
+        }
+    if mode not in EXTRACTORS:
+        return {
+            "success": False,
+            "error": f"Неизвестный режим: {mode}. Допустимые: {', '.join(EXTRACTORS)}"
+        }
+    
+    crawl = settings["crawl"]
+    timeout = arguments.get("timeout", crawl["url_timeout"])
+    concurrency = max(1, min(arguments.get("concurrency", crawl["concurrency"]), len(urls), pool.max_size))
+    throttle = HostThrottle(
+        arguments.get("max_per_host", crawl["max_per_host"]),
+        arguments.get("host_delay", crawl["host_delay"])
+    )
+    
+    # Первый исполнитель - отдельная вкладка браузера сессии
+    session_key = _session_key(arguments)
+    session = pool.acquire(session_key)
+    tab = await dispatcher.run(_open_fetch_tab, session, lock=session.lock)
+    if not tab["success"]:
+        return tab
+    
+    # Остальные - уже запущенные свободные браузеры пула: холодный запуск
+    # Chrome дольше загрузки нескольких страниц
+    run_id = uuid.uuid4().hex[:8]
+    browsers = [session]
+    leases = []
+    leases_of = {id(session): session_key}
+    while len(browsers) < concurrency:
+        key = f"fetch-{run_id}-{len(browsers)}"
+        browser = pool.acquire_idle(key)
+        if browser is None:
+            break
+        browsers.append(browser)
+        leases.append(key)
+        leases_of[id(browser)] = key
+    hung = set()
+    
+    def discard(browser: BrowserManager) -> None:
+        # Зависшая загрузка держит блокировку браузера: сессия получает
+        # новый браузер, старый остановится после ее завершения
+        hung.add(leases_of[id(browser)])
+        pool.replace(leases_of[id(browser)])
+    
+    def fetch(browser: BrowserManager, url: str) -> dict:
+        fetch_args = (
+            browser, url, mode, arguments.get("max_length", 20000), timeout,
+            arguments.get("block_resources")
+        )
+        if metrics is None:
+            return fetch_page(*fetch_args)
+        with metrics.tool_scope("fetch_many"):
+            return fetch_page(*fetch_args)
+    
+    def run(func: Callable, browser: BrowserManager, url: str) -> Awaitable[dict]:
+        return dispatcher.run(func, browser, url, lock=browser.lock, timeout=timeout)
+    
+    done = 0
     
+    async def on_result(result: dict) -> None:
+        nonlocal done
+        done += 1
+        status = "ok" if result["success"] else result["error"]
+        await _report_progress(done, len(urls), f"{result['url']}: {status}")
+    
+    started_at = time.perf_counter()
     try:
-        if name == "browser_start":
-            headless = arguments.get("headless", False)
-            browser.headless = headless
-            result = browser.start()
-            
-        elif name == "browser_stop":
-            result = browser.stop()
-            
-        elif name == "navigate":
-            url = arguments["url"]
-            result = browser.navigate(url)
-            
-        elif name == "click_element":
-            selector = arguments["selector"]
-            by = arguments.get("by", "css")
-            result = browser.click(selector, by)
-            
-        elif name == "type_text":
-            selector = arguments["selector"]
-            text = arguments["text"]
-            by = arguments.get("by", "css")
-            clear_first = arguments.get("clear_first", True)
-            result = browser.type_text(selector, text, by, clear_first)
-            
-        elif name == "find_element":
-            selector = arguments["selector"]
-            by = arguments.get("by", "css")
-            result = browser.find_element(selector, by)
-            
-        elif name == "get_text":
-            selector = arguments["selector"]
-            by = arguments.get("by", "css")
-            result = browser.get_text(selector, by)
-            
-        elif name == "screenshot":
-            filename = arguments.get("filename")
-            result = browser.screenshot(filename)
-            
-        elif name == "execute_javascript":
-            script = arguments["script"]
-            result = browser.execute_script(script)
-            
-        elif name == "get_page_info":
-            result = browser.get_page_info()
-            
-        elif name == "browser_back":
-            result = browser.back()
-            
-        elif name == "browser_forward":
-            result = browser.forward()
-            
-        elif name == "browser_refresh":
-            result = browser.refresh()
-            
-        elif name == "get_page_html":
-            clean = arguments.get("clean", True)
-            result = browser.get_page_html(clean)
-            
-        elif name == "get_all_text":
-            visible_only = arguments.get("visible_only", True)
-            result = browser.get_all_text(visible_only)
-            
-        elif name == "get_elements_info":
-            selector = arguments["selector"]
-            by = arguments.get("by", "css")
-            max_elements = arguments.get("max_elements", 50)
-            result = browser.get_elements_info(selector, by, max_elements)
-            
-        elif name == "get_page_structure":
-            result = browser.get_page_structure()
-            
+        results = await fetch_many(urls, browsers, run, fetch, throttle, on_result, discard)
+    finally:
+        if session_key not in hung:
+            await dispatcher.run(
+                _close_fetch_tab, session, tab["tab_id"], lock=session.lock
+            )
+        await asyncio.gather(
+            *(dispatcher.run(pool.release, key) for key in leases),
+            return_exceptions=True
+        )
+        if pool.needs_warm_up():
+            asyncio.get_running_loop().run_in_executor(None, pool.warm_up)
+    
+    failed = sum(1 for result in results if not result["success"])
+    return {
+        "success": True,
+        "total": len(urls),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "workers": len(browsers),
+        "elapsed_ms": round((time.perf_counter() - started_at) * 1000, 1),
+        "results": sorted(results, key=lambda result: result["index"])
+    }
+
+
+async def _server_stats(arguments: dict) -> dict:
+    if metrics is None:
+        return {
+            "success": False,
+            "error": "Метрики отключены (metrics.enabled в настройках)"
+        }
+    stats = metrics.snapshot()
+    if arguments.get("reset", False):
+        metrics.reset()
+    return {
+        "success": True,
+        **stats,
+        "pool": pool.stats()
+    }
+
+
+# Инструменты, которые не выполняются в браузере сессии
+ASYNC_HANDLERS: dict[str, Callable[[dict], Awaitable[dict]]] = {
+    "fetch_many": _fetch_many,
+    "server_stats": _server_stats,
+}
+
+
+def _restart_if_pending(browser: BrowserManager) -> None:
+    """Запуск браузера, замененного после таймаута предыдущего вызова."""
+    if browser.restart_pending:
+        browser.restart_pending = False
+        if watchdog is None:
+            browser.start()
         else:
-            result = {
-                "success": False,
-                "error": f"Неизвестный инструмент: {name}"
-            }
+            watchdog.restart(browser)
+
+
+def _run_tool(
+    name: str,
+    handler: Callable[[BrowserManager, dict], dict],
+    browser: BrowserManager,
+    arguments: dict
+) -> dict:
+    """
+    Выполнение обработчика в рабочем потоке с перезапуском упавшего
+    браузера и проверкой лимитов пула.
+    """
+    _restart_if_pending(browser)
+    
+    def run() -> dict:
+        if watchdog is None:
+            return handler(browser, arguments)
+        return watchdog.call(browser, name, lambda: handler(browser, arguments))
+    
+    if metrics is None:
+        result = run()
+    else:
+        with metrics.tool_scope(name):
+            result = run()
+    pool.recycle_if_needed(browser)
+    return result
+
+
+def _content_size(content: list[TextContent | ImageContent]) -> int:
+    """Размер ответа в байтах (изображения - в base64)."""
+    return sum(
+        len(item.text.encode("utf-8")) if isinstance(item, TextContent) else len(item.data)
+        for item in content
+    )
+
+
+@server.call_tool()
+async def call_tool(name: str, arguments: Any) -> list[TextContent | ImageContent]:
+    """Обработка вызовов инструментов."""
+    
+    arguments = arguments or {}
+    started_at = time.perf_counter()
+    # Корневой span вызова; команды WebDriver станут его дочерними span
+    trace = tracer.trace(name, kind="tool", session=_session_key(arguments)) if tracer else nullcontext()
+    with trace as root:
+        try:
+            handler = HANDLERS.get(name)
+        
+            if name in ASYNC_HANDLERS:
+                result = await ASYNC_HANDLERS[name](arguments)
+            elif handler is None:
+                result = {
+                    "success": False,
+                    "error": f"Неизвестный инструмент: {name}"
+                }
+            else:
+                browser = pool.acquire(_session_key(arguments))
+                if pool.needs_warm_up():
+                    # Следующая сессия тоже получит уже запущенный браузер
+                    asyncio.get_running_loop().run_in_executor(None, pool.warm_up)
+                # Selenium блокирует поток, поэтому вызов уходит в пул потоков
+                timeout = None
+                if name == "run_actions":
+                    # Таймаут пакета - tool_timeout на каждый шаг
+                    timeout = settings["server"]["tool_timeout"] * max(1, len(arguments.get("steps") or ()))
+                try:
+                    result = await dispatcher.run(
+                        _run_tool, name, handler, browser, arguments, lock=browser.lock, timeout=timeout
+                    )
+                except ToolTimeoutError:
+                    # Вызов продолжает держать блокировку браузера: следующий
+                    # вызов сессии выполнится в перезапущенном браузере
+                    pool.replace(_session_key(arguments))
+                    raise
         
-        # Форматирование результата
-        return [TextContent(
-            type="text",
-            text=str(result)
-        )]
+            # Компактный JSON, изображения - отдельным содержимым
+            content = encode_result(name, result, arguments.get("fields"))
+            success = result.get("success", False)
+            error = result.get("error")
         
-    except Exception as e:
-        logger.error(f"Ошибка при выполнении {name}: {e}")
-        return [TextContent(
-            type="text",
-            text=str({
+        except Exception as e:
+            logger.error(f"Ошибка при выполнении {name}: {e}")
+            content = encode_result(name, {
                 "success": False,
                 "error": str(e)
             })
-        )]
+            success = False
+            error = str(e)
+        
+        if root is not None:
+            root.attributes.update(success=success, bytes=_content_size(content))
+            if not success:
+                root.error = str(error or "success = false")
+    
+    if metrics is not None:
+        metrics.record_tool(name, time.perf_counter() - started_at, _content_size(content), success)
+    return content
+
+
+async def _reap_idle_browsers() -> None:
+    """Периодическое освобождение простаивающих браузеров пула."""
+    interval = settings["pool"]["reap_interval"]
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await dispatcher.run(pool.reap_idle)
+        except Exception as e:
+            logger.error(f"Ошибка при очистке пула браузеров: {e}")
+
+
+async def _write_metrics() -> None:
+    """Периодическая запись метрик в файл metrics.file."""
+    config = settings["metrics"]
+    while True:
+        await asyncio.sleep(config["interval"])
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, metrics.write, config["file"], config["format"]
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при записи метрик в {config['file']}: {e}")
 
 
 async def main():
     """Запуск MCP сервера."""
     logger.info("Запуск Chrome MCP Server...")
     
+    loop = asyncio.get_running_loop()
+    warmup_mode = settings["startup"]["warmup"]
+    warm_up = None
+    if warmup_mode == "eager":
+        # Сервер начинает отвечать только после запуска браузеров
+        logger.info(f"Прогрев пула браузеров: {await loop.run_in_executor(None, pool.warm_up)}")
+    elif warmup_mode == "background":
+        # Прогрев пула не задерживает запуск сервера
+        warm_up = loop.run_in_executor(None, pool.warm_up)
+    reaper = asyncio.create_task(_reap_idle_browsers())
+    metrics_writer = None
+    if metrics is not None and settings["metrics"]["file"]:
+        metrics_writer = asyncio.create_task(_write_metrics())
+    
     try:
         async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
             await server.run(
@@ -389,8 +1195,15 @@ async def main():
                 server.create_initialization_options()
             )
     finally:
-        # Остановка браузера при завершении
-        browser.stop()
+        # Остановка браузеров при завершении
+        reaper.cancel()
+        if metrics_writer:
+            metrics_writer.cancel()
+            metrics.write(settings["metrics"]["file"], settings["metrics"]["format"])
+        if warm_up:
+            await asyncio.wait([warm_up])
+        pool.shutdown()
+        dispatcher.shutdown()
         logger.info("Chrome MCP Server остановлен")
 
 
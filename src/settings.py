@@ -0,0 +1,135 @@
+"""Загрузка настроек сервера из config/browser_config.json."""
+
+import copy
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CONFIG_ENV_VAR = "CHROME_MCP_CONFIG"
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "browser_config.json"
+
+DEFAULTS: Dict[str, Any] = {
+    "headless": False,
+    "timeout": 10,
+    "window_size": {
+        "width": 1920,
+        "height": 1080,
+    },
+    "chrome_options": [
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-blink-features=AutomationControlled",
+    ],
+    "startup": {
+        "warmup": "off",
+        "user_data_dir": None,
+        "driver_path": None,
+    },
+    "navigation": {
+        "page_load_strategy": "normal",
+        "wait_until": "load",
+        "timeout": 30,
+    },
+    "blocking": {
+        "types": [],
+        "urls": [],
+        "allow": [],
+    },
+    "waits": {
+        "event_driven": True,
+        "poll_frequency": 0.5,
+        "track_requests": True,
+    },
+    "server": {
+        "max_workers": 4,
+        "tool_timeout": 60,
+    },
+    "pool": {
+        "size": 0,
+        "max_size": 4,
+        "max_navigations": 0,
+        "idle_timeout": 900,
+        "reap_interval": 60,
+    },
+    "memory": {
+        "enabled": True,
+        "interval": 30,
+        "max_rss_mb": 0,
+        "max_heap_mb": 0,
+        "actions": ["clear_cache", "close_background_tabs", "recycle"],
+    },
+    "output": {
+        "max_text_length": 100000,
+    },
+    "metrics": {
+        "enabled": True,
+        "file": None,
+        "format": "prometheus",
+        "interval": 60,
+    },
+    "watchdog": {
+        "enabled": True,
+        "max_restarts": 3,
+        "backoff": 1.0,
+        "restore_url": True,
+        "restore_storage": False,
+        "retry_idempotent": True,
+    },
+    "devtools": {
+        "websocket": True,
+    },
+    "tracing": {
+        "enabled": False,
+        "file": "traces.json",
+        "format": "chrome",
+    },
+    "crawl": {
+        "concurrency": 4,
+        "max_per_host": 2,
+        "host_delay": 0,
+        "url_timeout": 30,
+    },
+    "screenshot": {
+        "format": "png",
+        "quality": 80,
+        "scale": 1.0,
+    },
+}
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Рекурсивное слияние словарей настроек."""
+    result = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = _merge(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def load_settings(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Загрузка настроек с подстановкой значений по умолчанию.
+
+    Args:
+        path: Путь к JSON файлу (по умолчанию CHROME_MCP_CONFIG
+            или config/browser_config.json)
+    """
+    config_path = Path(path or os.environ.get(CONFIG_ENV_VAR) or DEFAULT_CONFIG_PATH)
+
+    try:
+        with open(config_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        logger.info(f"Файл настроек не найден, используются значения по умолчанию: {config_path}")
+        data = {}
+    except (OSError, ValueError) as e:
+        logger.error(f"Ошибка при чтении настроек {config_path}: {e}")
+        data = {}
+
+    return _merge(DEFAULTS, data)
@@ -0,0 +1,194 @@
+"""Трассировка вызовов инструментов: span на вызов, метод и команду WebDriver."""
+
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+SERVICE_NAME = "chrome-mcp-server"
+
+
+@dataclass
+class Span:
+    """Интервал выполнения операции."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    # Текст ошибки (None - успешное выполнение)
+    error: Optional[str] = None
+    thread_id: int = field(default_factory=threading.get_ident)
+
+
+class _Trace:
+    """Завершенные span одного вызова инструмента."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+
+# Текущий span и его трасса. ToolDispatcher копирует контекст в рабочий
+# поток, поэтому команды WebDriver становятся дочерними span вызова.
+_current: ContextVar[Optional[tuple]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Трассировка с выгрузкой каждой завершенной трассы в exporter.
+
+    span вне трассы (например, при использовании BrowserManager без
+    MCP сервера) не записываются.
+    """
+
+    def __init__(self, exporter):
+        """
+        Args:
+            exporter: Объект с методом export(spans)
+        """
+        self.exporter = exporter
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Корневой span; по завершении трасса выгружается."""
+        root = Span(name, secrets.token_hex(16), secrets.token_hex(8), attributes=attributes)
+        trace = _Trace()
+        token = _current.set((root, trace))
+        try:
+            yield root
+        except Exception as e:
+            root.error = str(e)
+            raise
+        finally:
+            _current.reset(token)
+            root.end_ns = time.time_ns()
+            self.exporter.export([root] + trace.spans)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Дочерний span текущего (None вне трассы)."""
+        current = _current.get()
+        if current is None:
+            yield None
+            return
+
+        parent, trace = current
+        span = Span(name, parent.trace_id, secrets.token_hex(8), parent.span_id, attributes=attributes)
+        token = _current.set((span, trace))
+        try:
+            yield span
+        except Exception as e:
+            span.error = str(e)
+            raise
+        finally:
+            _current.reset(token)
+            span.end_ns = time.time_ns()
+            trace.add(span)
+
+
+class ChromeTraceExporter:
+    """
+    Запись в формате Chrome trace events (chrome://tracing, Perfetto).
+
+    События дописываются в JSON массив без закрывающей скобки - формат
+    это допускает, и файл можно открыть во время работы сервера.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        pid = os.getpid()
+        events = []
+        for span in spans:
+            args = {"trace_id": span.trace_id, **span.attributes}
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "name": span.name,
+                "cat": span.attributes.get("kind", "tool"),
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args,
+            })
+
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            if f.tell() == 0:
+                f.write("[\n")
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False, default=str) + ",\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpJsonExporter:
+    """
+    Запись в формате OTLP JSON: одна строка ExportTraceServiceRequest на
+    трассу (как file exporter OpenTelemetry Collector).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        otlp_spans = []
+        for span in spans:
+            item = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in {**span.attributes, "thread.id": span.thread_id}.items()
+                ],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                item["parentSpanId"] = span.parent_id
+            otlp_spans.append(item)
+
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": SERVICE_NAME}}
+                ]},
+                "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": otlp_spans}],
+            }]
+        }
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(request, ensure_ascii=False, default=str) + "\n")
+
+
+EXPORTERS = {
+    "chrome": ChromeTraceExporter,
+    "otlp": OtlpJsonExporter,
+}
@@ -0,0 +1,185 @@
+"""Ожидание элементов и состояния страницы по событиям DOM."""
+
+import logging
+import time
+import weakref
+from typing import Union
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from scripts import (
+    WAIT_FOR_ELEMENT_SCRIPT,
+    WAIT_FOR_NETWORK_IDLE_SCRIPT,
+    WAIT_FOR_READY_STATE_SCRIPT,
+)
+
+logger = logging.getLogger(__name__)
+
+BY_MAPPING = {
+    "css": By.CSS_SELECTOR,
+    "xpath": By.XPATH,
+    "id": By.ID,
+    "name": By.NAME,
+    "class": By.CLASS_NAME,
+    "tag": By.TAG_NAME
+}
+
+# Условия ожидания элемента и их аналоги для WebDriverWait
+ELEMENT_CONDITIONS = {
+    "present": EC.presence_of_element_located,
+    "visible": EC.visibility_of_element_located,
+    "clickable": EC.element_to_be_clickable,
+    "gone": EC.invisibility_of_element_located,
+}
+
+# Запас времени для ответа chromedriver сверх таймаута ожидания
+SCRIPT_TIMEOUT_MARGIN = 5
+
+
+class WaitEngine:
+    """
+    Ожидание элементов без опроса WebDriver.
+
+    Вместо WebDriverWait (запрос к chromedriver каждые poll_frequency
+    секунд) на страницу внедряется MutationObserver, который завершает
+    ожидание сразу после появления элемента. Если страница перезагрузилась
+    во время ожидания или скрипт не удалось выполнить, оставшееся время
+    ожидание продолжается через WebDriverWait.
+    """
+
+    def __init__(self, event_driven: bool = True, poll_frequency: float = 0.5):
+        """
+        Инициализация движка ожиданий.
+
+        Args:
+            event_driven: Использовать MutationObserver (False - только WebDriverWait)
+            poll_frequency: Интервал опроса WebDriverWait и резервной
+                проверки внутри страницы, секунд
+        """
+        self.event_driven = event_driven
+        self.poll_frequency = poll_frequency
+        # Текущий script timeout каждого драйвера, чтобы не задавать его повторно
+        self._script_timeouts: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def _ensure_script_timeout(self, driver, seconds: float) -> None:
+        current = self._script_timeouts.get(driver, 30)
+        if current < seconds:
+            driver.set_script_timeout(seconds)
+            self._script_timeouts[driver] = seconds
+
+    def wait_for_element(
+        self,
+        driver,
+        selector: str,
+        by: str = "css",
+        condition: str = "present",
+        timeout: float = 10
+    ) -> Union[WebElement, bool]:
+        """
+        Ожидание элемента.
+
+        Args:
+            driver: WebDriver
+            selector: Селектор элемента
+            by: Тип селектора (css, xpath, id, name, class, tag)
+            condition: present, visible, clickable или gone
+            timeout: Таймаут в секундах
+
+        Returns:
+            Найденный элемент (True для condition = gone)
+
+        Raises:
+            TimeoutException: Если условие не выполнено за timeout секунд
+        """
+        if condition not in ELEMENT_CONDITIONS:
+            raise ValueError(f"Неизвестное условие ожидания: {condition}")
+
+        by = by.lower() if by.lower() in BY_MAPPING else "css"
+        deadline = time.monotonic() + timeout
+
+        if self.event_driven:
+            try:
+                self._ensure_script_timeout(driver, timeout + SCRIPT_TIMEOUT_MARGIN)
+                result = driver.execute_async_script(
+                    WAIT_FOR_ELEMENT_SCRIPT,
+                    selector, by, condition,
+                    int(timeout * 1000), int(self.poll_frequency * 1000)
+                )
+                if result is None:
+                    raise TimeoutException(f"Условие {condition} не выполнено: {selector}")
+                return result
+            except TimeoutException:
+                raise
+            except WebDriverException as e:
+                # Например, страница перезагрузилась во время ожидания
+                logger.debug(f"Ожидание через MutationObserver прервано: {e}")
+
+        remaining = max(deadline - time.monotonic(), 0)
+        wait = WebDriverWait(driver, remaining, poll_frequency=self.poll_frequency)
+        return wait.until(ELEMENT_CONDITIONS[condition]((BY_MAPPING[by], selector)))
+
+    def wait_for_network_idle(
+        self,
+        driver,
+        idle_ms: int = 500,
+        timeout: float = 10
+    ) -> bool:
+        """
+        Ожидание простоя сети.
+
+        Args:
+            driver: WebDriver
+            idle_ms: Сколько миллисекунд не должно быть новых запросов
+            timeout: Таймаут в секундах
+
+        Returns:
+            True если сеть простаивала idle_ms, False по таймауту
+        """
+        self._ensure_script_timeout(driver, timeout + SCRIPT_TIMEOUT_MARGIN)
+        return bool(driver.execute_async_script(
+            WAIT_FOR_NETWORK_IDLE_SCRIPT, idle_ms, int(timeout * 1000)
+        ))
+
+    def wait_for_ready_state(
+        self,
+        driver,
+        state: str = "complete",
+        timeout: float = 30
+    ) -> bool:
+        """
+        Ожидание document.readyState новой страницы.
+
+        Документ, помеченный MARK_DOCUMENT_SCRIPT перед переходом,
+        считается старым: ожидание продолжается до его выгрузки.
+
+        Args:
+            driver: WebDriver
+            state: interactive (DOMContentLoaded) или complete (load)
+            timeout: Таймаут в секундах
+
+        Returns:
+            True если состояние достигнуто, False по таймауту
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            self._ensure_script_timeout(driver, remaining + SCRIPT_TIMEOUT_MARGIN)
+            try:
+                result = driver.execute_async_script(
+                    WAIT_FOR_READY_STATE_SCRIPT, state, int(remaining * 1000)
+                )
+            except WebDriverException as e:
+                # Документ выгружен во время ожидания - проверяем новый
+                logger.debug(f"Ожидание readyState прервано: {e}")
+                time.sleep(0.05)
+                continue
+
+            if result is not None:
+                return bool(result)
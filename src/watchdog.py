@@ -0,0 +1,176 @@
+"""Обнаружение падения браузера, перезапуск и восстановление сессии."""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from browser_manager import BrowserManager
+
+logger = logging.getLogger(__name__)
+
+# Фрагменты ошибок chromedriver и urllib3, означающие потерю браузера
+CRASH_MARKERS = (
+    "tab crashed",
+    "chrome not reachable",
+    "session deleted",
+    "invalid session id",
+    "disconnected: not connected to devtools",
+    "unable to receive message from renderer",
+    "connection refused",
+    "max retries exceeded",
+    "remote end closed connection",
+)
+
+# Инструменты, которые можно повторить после перезапуска без побочных эффектов
+IDEMPOTENT_TOOLS = frozenset({
+    "navigate", "browser_refresh", "find_element", "get_text", "wait_for",
+    "screenshot", "get_page_info", "get_page_html", "get_all_text",
+    "get_elements_info", "get_page_structure", "get_page_model", "tab_list",
+})
+
+# Инструменты, после которых сохраняются cookies и localStorage
+STATEFUL_TOOLS = frozenset({
+    "navigate", "click_element", "type_text", "execute_javascript", "run_actions",
+    "browser_back", "browser_forward", "browser_refresh", "tab_switch",
+})
+
+# Инструменты, управляющие браузером явно: их ошибки не обрабатываются
+_LIFECYCLE_TOOLS = frozenset({"browser_start", "browser_stop"})
+
+
+def is_crash_error(error: Optional[str]) -> bool:
+    """Ошибка похожа на потерю соединения с Chrome или chromedriver."""
+    if not error:
+        return False
+    error = error.lower()
+    return any(marker in error for marker in CRASH_MARKERS)
+
+
+class Watchdog:
+    """
+    Перезапуск упавшего браузера между вызовами инструментов.
+
+    Падение определяется по ошибке вызова и подтверждается проверкой
+    BrowserManager.is_alive; процесс chromedriver, завершившийся между
+    вызовами, обнаруживается до вызова. Браузер перезапускается с
+    экспоненциальной задержкой, восстанавливается последний URL и, если
+    включено, cookies и localStorage; идемпотентный инструмент
+    повторяется один раз.
+    """
+
+    def __init__(
+        self,
+        max_restarts: int = 3,
+        backoff: float = 1.0,
+        restore_url: bool = True,
+        restore_storage: bool = False,
+        retry_idempotent: bool = True
+    ):
+        """
+        Args:
+            max_restarts: Попыток запуска на одно падение
+            backoff: Задержка перед второй попыткой, секунд (удваивается)
+            restore_url: Открыть страницу, на которой был браузер
+            restore_storage: Сохранять cookies и localStorage после
+                инструментов из STATEFUL_TOOLS и восстанавливать их
+            retry_idempotent: Повторить идемпотентный инструмент
+        """
+        self.max_restarts = max_restarts
+        self.backoff = backoff
+        self.restore_url = restore_url
+        self.restore_storage = restore_storage
+        self.retry_idempotent = retry_idempotent
+
+    def call(
+        self,
+        browser: BrowserManager,
+        name: str,
+        run: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Выполнение инструмента с восстановлением после падения браузера.
+
+        Вызывается в рабочем потоке под блокировкой браузера.
+        """
+        if name in _LIFECYCLE_TOOLS:
+            return run()
+
+        restarted = None
+        if browser.driver and not self._driver_process_alive(browser):
+            logger.warning(f"chromedriver завершился, перезапуск перед {name}")
+            restarted = self.restart(browser)
+
+        result = run()
+        if not result.get("success", True) and is_crash_error(result.get("error")):
+            if browser.is_alive():
+                return result
+            logger.warning(f"Браузер упал во время {name}: {result.get('error')}")
+            restarted = self.restart(browser)
+            if not restarted["success"]:
+                result["error"] = f"{result.get('error')}; перезапуск не удался: {restarted['error']}"
+                return result
+            if self.retry_idempotent and name in IDEMPOTENT_TOOLS:
+                result = run()
+                result["retried"] = True
+        elif result.get("success", True):
+            self._remember(browser, name, result)
+
+        if restarted is not None:
+            result["browser_restarted"] = restarted["success"]
+        return result
+
+    @staticmethod
+    def _driver_process_alive(browser: BrowserManager) -> bool:
+        process = getattr(getattr(browser.driver, "service", None), "process", None)
+        return process is None or process.poll() is None
+
+    def _remember(self, browser: BrowserManager, name: str, result: Dict[str, Any]) -> None:
+        """Сохранение URL из ответа и, после изменяющих инструментов, storage."""
+        state = browser.session_state
+        if self.restore_storage and name in STATEFUL_TOOLS and browser.driver:
+            try:
+                state.update(browser.capture_state(storage=True))
+                return
+            except Exception as e:
+                logger.debug(f"Не удалось сохранить состояние сессии: {e}")
+        if isinstance(result.get("url"), str):
+            state["url"] = result["url"]
+
+    def restart(self, browser: BrowserManager) -> Dict[str, Any]:
+        """
+        Перезапуск браузера с задержкой между попытками и восстановлением.
+
+        Returns:
+            Результат последнего start (success, error) и restored
+        """
+        browser.stop()
+        browser.restart_count += 1
+
+        result: Dict[str, Any] = {"success": False, "error": "max_restarts = 0"}
+        for attempt in range(self.max_restarts):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            result = browser.start()
+            if result["success"]:
+                break
+            logger.error(f"Перезапуск браузера, попытка {attempt + 1}: {result['error']}")
+        if not result["success"]:
+            return result
+
+        state = dict(browser.session_state)
+        if not self.restore_storage:
+            state.pop("cookies", None)
+            state.pop("local_storage", None)
+        if not self.restore_url:
+            state.pop("url", None)
+        if state:
+            try:
+                restored = browser.restore_state(state)
+            except Exception as e:
+                restored = {"success": False, "error": str(e)}
+            result["restored"] = restored["success"]
+            if restored["success"]:
+                logger.info(f"Сессия восстановлена: {state.get('url')}")
+            else:
+                logger.error(f"Не удалось восстановить сессию: {restored.get('error')}")
+        return result
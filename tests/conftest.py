@@ -0,0 +1,8 @@
+"""Общие настройки тестов."""
+
+import sys
+from pathlib import Path
+
+# Модули сервера импортируют друг друга напрямую (как при запуске
+# python src/server.py), поэтому src добавляется в sys.path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,124 @@
+"""Тесты для AsyncBrowserManager."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from async_browser import AsyncBrowserManager
+from dispatcher import ToolDispatcher
+
+
+class FakeDevTools:
+    """DevToolsChannel, записывающий поток каждого вызова."""
+
+    def __init__(self):
+        self.calls = []
+        # Ответ на команду ждет этого события
+        self.respond = threading.Event()
+        self.respond.set()
+
+    def execute(self, method, params=None):
+        self.respond.wait(5)
+        self.calls.append((threading.current_thread().name, method))
+        return {"via": "webdriver"}
+
+    def evaluate(self, script, *args):
+        self.calls.append((threading.current_thread().name, "evaluate"))
+        return "webdriver"
+
+
+class FakeBrowser:
+    """Браузер с блокировкой и каналом DevTools."""
+
+    def __init__(self, devtools=None):
+        self.lock = threading.RLock()
+        self.devtools = devtools
+
+
+class TestAsyncBrowserManager:
+    """Тесты для AsyncBrowserManager."""
+
+    @pytest.fixture
+    def dispatcher(self):
+        dispatcher = ToolDispatcher(max_workers=4, timeout=5)
+        yield dispatcher
+        dispatcher.shutdown()
+
+    def test_operations_keep_signature(self):
+        assert AsyncBrowserManager.navigate.__name__ == "navigate"
+        assert "selector" in AsyncBrowserManager.get_elements_info.__doc__
+        assert asyncio.iscoroutinefunction(AsyncBrowserManager.get_page_structure)
+
+    @pytest.mark.asyncio
+    async def test_browsers_overlap(self, dispatcher):
+        """Операции с разными браузерами выполняются параллельно."""
+        def slow(browser, delay):
+            time.sleep(delay)
+            return threading.current_thread().name
+
+        browsers = [AsyncBrowserManager(FakeBrowser(), dispatcher) for _ in range(3)]
+        started_at = time.perf_counter()
+        threads = await asyncio.gather(*(browser.run(slow, browser.browser, delay=0.2) for browser in browsers))
+
+        assert time.perf_counter() - started_at < 0.5
+        assert all(name.startswith("browser-worker") for name in threads)
+
+    @pytest.mark.asyncio
+    async def test_same_browser_serialized(self, dispatcher):
+        """Вызовы одного браузера не пересекаются (блокировка браузера)."""
+        active = []
+
+        def operation(browser):
+            active.append(1)
+            overlap = len(active) > 1
+            time.sleep(0.05)
+            active.pop()
+            return overlap
+
+        browser = AsyncBrowserManager(FakeBrowser(), dispatcher)
+        results = await asyncio.gather(*(browser.run(operation, browser.browser) for _ in range(3)))
+        assert results == [False, False, False]
+
+    @pytest.mark.asyncio
+    async def test_cdp_under_browser_lock(self, dispatcher):
+        """Команда CDP ждет операцию, держащую блокировку браузера."""
+        devtools = FakeDevTools()
+        browser = AsyncBrowserManager(FakeBrowser(devtools), dispatcher)
+        operation_started = threading.Event()
+
+        def operation(browser):
+            operation_started.set()
+            time.sleep(0.05)
+            devtools.calls.append((threading.current_thread().name, "operation"))
+
+        running = asyncio.ensure_future(browser.run(operation, browser.browser))
+        await asyncio.get_running_loop().run_in_executor(None, operation_started.wait, 5)
+        assert await browser.cdp("Page.captureScreenshot") == {"via": "webdriver"}
+        assert await browser.evaluate("return 1;") == "webdriver"
+        await running
+
+        assert [method for _, method in devtools.calls] == ["operation", "Page.captureScreenshot", "evaluate"]
+        assert all(thread.startswith("browser-worker") for thread, _ in devtools.calls)
+
+    @pytest.mark.asyncio
+    async def test_cdp_timeout(self):
+        """Таймаут команды - TimeoutException, как у WebDriver."""
+        dispatcher = ToolDispatcher(max_workers=1, timeout=0.1)
+        devtools = FakeDevTools()
+        devtools.respond.clear()
+        browser = AsyncBrowserManager(FakeBrowser(devtools), dispatcher)
+        try:
+            with pytest.raises(TimeoutException):
+                await browser.cdp("Page.captureScreenshot")
+        finally:
+            devtools.respond.set()
+            dispatcher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_not_started(self, dispatcher):
+        browser = AsyncBrowserManager(FakeBrowser(), dispatcher)
+        with pytest.raises(RuntimeError):
+            await browser.cdp("Page.captureScreenshot")
@@ -0,0 +1,46 @@
+"""Тесты инфраструктуры бенчмарков."""
+
+import json
+from urllib.request import urlopen
+
+from benchmarks.fixture_server import PAGES, FixtureServer
+from benchmarks.run import compare, percentile, summarize
+
+
+class TestFixtureServer:
+    """Тесты для FixtureServer."""
+
+    def test_pages(self):
+        with FixtureServer() as fixtures:
+            for path in PAGES:
+                with urlopen(fixtures.url(path)) as response:
+                    assert response.status == 200
+                    assert b"<html>" in response.read()
+
+    def test_delay(self):
+        with FixtureServer() as fixtures:
+            with urlopen(fixtures.url("/delay?ms=10")) as response:
+                assert json.load(response) == {"delay_ms": 10}
+
+
+class TestStatistics:
+    """Тесты сводки и сравнения замеров."""
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile([7.0], 95) == 7.0
+
+    def test_summarize(self):
+        stats = summarize([10, 30, 20], [100, 200, 300], 1)
+        assert stats["p50_ms"] == 20
+        assert stats["payload_bytes"] == 200
+        assert stats["errors"] == 1
+
+    def test_compare(self):
+        baseline = {"a": {"p50_ms": 100}, "b": {"p50_ms": 1}, "c": {"p50_ms": 100}}
+        current = {"a": {"p50_ms": 140}, "b": {"p50_ms": 3}, "c": {"p50_ms": 110}}
+        regressions = compare(current, baseline, 0.25)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("a:")
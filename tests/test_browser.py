@@ -29,6 +29,8 @@ class TestBrowserManager:
         result = browser.navigate("https://www.example.com")
         assert result["success"] is True
         assert "example.com" in result["url"].lower()
+        assert result["completed"] is True
+        assert result["timing"]["ttfb_ms"] is not None
     
     def test_get_page_info(self, browser):
         """Тест получения информации о странице."""
@@ -39,6 +41,10 @@ class TestBrowserManager:
         assert result["success"] is True
         assert "url" in result
         assert "title" in result
+        assert result["ready_state"] == "complete"
+        assert result["dom_nodes"] > 0
+        assert result["scroll_height"] > 0
+        assert "page_source_length" not in result
     
     def test_find_element(self, browser):
         """Тест поиска элемента."""
@@ -56,6 +62,85 @@ class TestBrowserManager:
         result = browser.screenshot()
         assert result["success"] is True
         assert "screenshot_base64" in result
+        assert result["mime_type"] == "image/png"
+    
+    def test_screenshot_element_jpeg(self, browser, tmp_path):
+        """Снимок элемента в JPEG возвращается и сохраняется одним захватом."""
+        browser.start()
+        browser.navigate("https://www.example.com")
+        
+        path = tmp_path / "h1.jpg"
+        result = browser.screenshot(str(path), format="jpeg", quality=50, selector="h1", scale=0.5)
+        assert result["success"] is True
+        assert result["mime_type"] == "image/jpeg"
+        assert path.read_bytes()[:2] == b"\xff\xd8"
+        assert result["size_bytes"] == path.stat().st_size
+    
+    def test_get_page_changes(self, browser):
+        """После чтения страницы возвращаются только изменения."""
+        browser.start()
+        browser.navigate("https://www.example.com")
+        browser.get_all_text()
+        
+        browser.execute_script("""
+            const p = document.createElement('p');
+            p.innerHTML = '<a href="/new">Новая ссылка</a>';
+            document.body.appendChild(p);
+            document.querySelector('h1').textContent = 'Changed';
+        """)
+        
+        changes = browser.get_page_changes()
+        assert changes["success"] is True
+        assert changes["baseline"] is False
+        assert changes["added"][0]["tag"] == "p"
+        assert changes["links"][0]["text"] == "Новая ссылка"
+        assert changes["counts"]["removed"] == 1
+        
+        assert browser.get_page_changes()["changed"] is False
+    
+    def test_get_elements_info_modes(self, browser):
+        """Сбор данных скриптом совпадает с командами WebDriver."""
+        browser.start()
+        browser.navigate("https://www.example.com")
+        
+        fast = browser.get_elements_info("a", attributes=["href"])
+        slow = browser.get_elements_info("a", attributes=["href"], use_script=False)
+        assert fast["success"] is True
+        assert fast["total"] == slow["total"]
+        assert fast["elements"][0]["attributes"] == slow["elements"][0]["attributes"]
+        
+        page = browser.get_elements_info("*", max_elements=2, offset=1)
+        assert page["elements"][0]["index"] == 1
+        assert page["has_more"] is True
+    
+    def test_get_page_model(self, browser):
+        """Элементы модели страницы доступны действиям по element_id."""
+        browser.start()
+        browser.navigate("https://www.example.com")
+        
+        model = browser.get_page_model(visible_only=True)
+        assert model["success"] is True
+        link = next(e for e in model["elements"] if e["role"] == "link")
+        assert link["box"][2] > 0
+        
+        result = browser.get_text(element_id=link["element_id"])
+        assert result["text"] == link["name"]
+    
+    def test_tabs(self, browser):
+        """Тест открытия, переключения и закрытия вкладок."""
+        browser.start()
+        first = browser.list_tabs()["tabs"][0]["tab_id"]
+        
+        result = browser.open_tab("https://www.example.com", isolated=True)
+        assert result["success"] is True
+        assert browser.list_tabs()["count"] == 2
+        
+        result = browser.switch_tab(first)
+        assert result["success"] is True
+        
+        result = browser.close_tab(first)
+        assert result["success"] is True
+        assert browser.list_tabs()["count"] == 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""Тесты для BrowserPool."""
+
+import threading
+
+import pytest
+
+from browser_pool import BrowserPool, PoolExhaustedError
+from memory import MemoryGovernor
+from metrics import Metrics
+
+
+class FakeBrowser:
+    """Заглушка BrowserManager без запуска Chrome."""
+
+    def __init__(self):
+        self.driver = None
+        self.lock = threading.RLock()
+        self.navigation_count = 0
+        self.memory = None
+        self.starts = 0
+        self.startup_ms = None
+
+    def start(self):
+        self.driver = object()
+        self.navigation_count = 0
+        self.starts += 1
+        return {"success": True}
+
+    def stop(self):
+        self.driver = None
+        return {"success": True}
+
+    def get_memory_usage(self):
+        return self.memory
+
+
+class TestBrowserPool:
+    """Тесты для BrowserPool."""
+
+    def test_warm_up(self):
+        """Прогрев запускает size браузеров."""
+        pool = BrowserPool(factory=FakeBrowser, size=2, max_size=3)
+        result = pool.warm_up()
+        assert result["started"] == 2
+        assert pool.stats()["idle"] == 2
+
+    def test_needs_warm_up(self):
+        """После выдачи прогретого браузера пул требует пополнения."""
+        pool = BrowserPool(factory=FakeBrowser, size=1, max_size=2)
+        pool.warm_up()
+        assert pool.needs_warm_up() is False
+        pool.acquire("a")
+        assert pool.needs_warm_up() is True
+
+    def test_session_affinity(self):
+        """Одна сессия всегда получает один и тот же браузер."""
+        pool = BrowserPool(factory=FakeBrowser, max_size=2)
+        first = pool.acquire("a")
+        assert pool.acquire("a") is first
+        assert pool.acquire("b") is not first
+
+    def test_exhausted(self):
+        """При занятых браузерах новая сессия получает ошибку."""
+        pool = BrowserPool(factory=FakeBrowser, max_size=1)
+        pool.acquire("a")
+        with pytest.raises(PoolExhaustedError):
+            pool.acquire("b")
+
+        pool.release("a")
+        assert pool.acquire("b") is not None
+
+    def test_acquire_idle(self):
+        """Без прогретых браузеров новый не создается."""
+        pool = BrowserPool(factory=FakeBrowser, size=1, max_size=3)
+        assert pool.acquire_idle("a") is None
+
+        pool.warm_up()
+        browser = pool.acquire_idle("a")
+        assert browser.driver is not None
+        assert pool.acquire_idle("b") is None
+        assert pool.acquire("a") is browser
+
+    def test_recycle_after_navigations(self):
+        """Браузер перезапускается после max_navigations переходов."""
+        pool = BrowserPool(factory=FakeBrowser, max_navigations=3)
+        browser = pool.acquire("a")
+        browser.start()
+        browser.navigation_count = 3
+
+        assert pool.recycle_if_needed(browser) is True
+        assert browser.starts == 2
+        assert browser.navigation_count == 0
+
+    def test_recycle_restores_session(self):
+        """Перезапуск после max_navigations восстанавливает страницу и storage."""
+        pool = BrowserPool(factory=FakeBrowser, max_navigations=3)
+        browser = pool.acquire("a")
+        browser.start()
+        browser.navigation_count = 3
+        restored = []
+        browser.capture_state = lambda storage: {"url": "https://example.com/", "cookies": []}
+        browser.restore_state = lambda state: restored.append(state) or {"success": True}
+
+        assert pool.recycle_if_needed(browser) is True
+        assert restored == [{"url": "https://example.com/", "cookies": []}]
+
+    def test_recycle_on_memory(self):
+        """Браузер перезапускается при превышении лимита памяти."""
+        pool = BrowserPool(factory=FakeBrowser, memory=MemoryGovernor(max_heap_mb=100, actions=["recycle"], interval=0))
+        browser = pool.acquire("a")
+        browser.start()
+        browser.memory = 50
+        assert pool.recycle_if_needed(browser) is False
+        browser.memory = 150
+        assert pool.recycle_if_needed(browser) is True
+
+    def test_memory_governor(self):
+        """Замеры памяти сессии публикуются до ее освобождения."""
+        metrics = Metrics()
+        pool = BrowserPool(factory=FakeBrowser, memory=MemoryGovernor(max_heap_mb=100, actions=["recycle"], metrics=metrics))
+        browser = pool.acquire("a")
+        browser.start()
+        browser.capture_state = lambda storage: {}
+        browser.memory = 150
+
+        assert pool.recycle_if_needed(browser) is True
+        assert browser.starts == 2
+        assert metrics.snapshot()["memory"]["a"]["heap_mb"] == 150
+
+        pool.release("a")
+        assert metrics.snapshot()["memory"] == {}
+
+    def test_reap_idle(self):
+        """Простаивающие сессии освобождаются."""
+        pool = BrowserPool(factory=FakeBrowser, idle_timeout=0)
+        browser = pool.acquire("a")
+        browser.start()
+
+        assert pool.reap_idle() == ["a"]
+        assert browser.driver is None
+        assert pool.stats()["leased"] == 0
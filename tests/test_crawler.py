@@ -0,0 +1,201 @@
+"""Тесты параллельной загрузки страниц."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import crawler
+from crawler import HostThrottle, fetch_many, fetch_page
+from dispatcher import ToolDispatcher
+
+
+class Gauge:
+    """Счетчик одновременных загрузок и его максимум."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.current -= 1
+
+
+class FakeBrowser:
+    """Браузер, загрузка страницы в котором занимает delay секунд."""
+
+    def __init__(self, delay=0.05, gauge=None, barrier=None):
+        self.delay = delay
+        self.gauge = gauge or Gauge()
+        # Загрузка ждет, пока столько же загрузок не начнется параллельно
+        self.barrier = barrier
+        self.lock = threading.RLock()
+        self.pages = []
+        self.load_timeouts = []
+
+    def navigate(self, url, block_resources=None, timeout=None, load_timeout=None):
+        self.load_timeouts.append(load_timeout)
+        with self.gauge:
+            if self.barrier is not None:
+                self.barrier.wait(5)
+            time.sleep(self.delay)
+        if "broken" in url:
+            return {"success": False, "error": "net::ERR_NAME_NOT_RESOLVED"}
+        self.pages.append(url)
+        return {"success": True, "url": url, "title": url[-1], "completed": True}
+
+    def get_all_text(self, max_length=None, use_cache=True):
+        return {"success": True, "text": self.pages[-1], "cached": False, "length": 1}
+
+
+class HungBrowser(FakeBrowser):
+    """Браузер, загрузка в котором не завершается до release."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def navigate(self, url, block_resources=None, timeout=None, load_timeout=None):
+        self.release.wait(5)
+        return super().navigate(url, block_resources, timeout, load_timeout)
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = ToolDispatcher(max_workers=4, timeout=5)
+    yield dispatcher
+    dispatcher.shutdown()
+
+
+def runner(dispatcher):
+    return lambda func, browser, url: dispatcher.run(func, browser, url, lock=browser.lock)
+
+
+class TestFetchPage:
+    """Тесты для fetch_page."""
+
+    def test_text(self):
+        result = fetch_page(FakeBrowser(0), "https://a.test/1")
+        assert result["success"] is True
+        assert result["text"] == "https://a.test/1"
+        assert "cached" not in result
+
+    def test_load_timeout(self):
+        """Загрузка страницы ограничена таймаутом страницы, а не только ожидание."""
+        browser = FakeBrowser(0)
+        fetch_page(browser, "https://a.test/1", timeout=7)
+        assert browser.load_timeouts == [7]
+
+    def test_navigation_error(self):
+        result = fetch_page(FakeBrowser(0), "https://broken.test/")
+        assert result == {"url": "https://broken.test/", "success": False,
+                          "error": "net::ERR_NAME_NOT_RESOLVED"}
+
+
+class TestFetchMany:
+    """Тесты для fetch_many."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_browsers(self, dispatcher):
+        """Четыре страницы на четырех браузерах загружаются одновременно."""
+        # Барьер не пропустит ни одну загрузку, пока не начнутся все четыре
+        barrier = threading.Barrier(4)
+        browsers = [FakeBrowser(0, barrier=barrier) for _ in range(4)]
+        urls = [f"https://h{i}.test/{i}" for i in range(4)]
+
+        results = await fetch_many(urls, browsers, runner(dispatcher), fetch_page, HostThrottle())
+        assert all(result["success"] for result in results)
+        assert sorted(result["index"] for result in results) == [0, 1, 2, 3]
+        assert all(browser.pages for browser in browsers)
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self, dispatcher):
+        """Страницы одного хоста при max_per_host = 1 загружаются по очереди."""
+        gauge = Gauge()
+        browsers = [FakeBrowser(0.05, gauge) for _ in range(3)]
+        urls = [f"https://same.test/{i}" for i in range(3)]
+
+        results = await fetch_many(urls, browsers, runner(dispatcher), fetch_page, HostThrottle(max_per_host=1))
+        assert all(result["success"] for result in results)
+        assert gauge.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_results_streamed(self, dispatcher):
+        """Ошибка одной страницы не мешает остальным, каждый результат передается сразу."""
+        streamed = []
+
+        async def on_result(result):
+            streamed.append(result["url"])
+
+        urls = ["https://a.test/1", "https://broken.test/", "https://b.test/2"]
+        results = await fetch_many(
+            urls, [FakeBrowser(0), FakeBrowser(0)], runner(dispatcher), fetch_page,
+            HostThrottle(), on_result
+        )
+        assert sorted(streamed) == sorted(urls)
+        assert [r["success"] for r in sorted(results, key=lambda r: r["index"])] == [True, False, True]
+
+    @pytest.mark.asyncio
+    async def test_hung_browser_not_reused(self, dispatcher):
+        """Браузер с зависшей загрузкой не получает следующие страницы."""
+        hung, free = HungBrowser(), FakeBrowser(0)
+        discarded = []
+        urls = ["https://a.test/1", "https://b.test/2", "https://c.test/3"]
+
+        def run(func, browser, url):
+            return dispatcher.run(func, browser, url, lock=browser.lock, timeout=0.2)
+
+        try:
+            results = await fetch_many(
+                urls, [hung, free], run, fetch_page, HostThrottle(), discard=discarded.append
+            )
+        finally:
+            hung.release.set()
+        results = sorted(results, key=lambda r: r["index"])
+        assert [r["success"] for r in results] == [False, True, True]
+        assert discarded == [hung]
+        assert free.pages == urls[1:]
+
+    @pytest.mark.asyncio
+    async def test_all_browsers_hung(self, dispatcher):
+        """Без свободных браузеров оставшиеся страницы завершаются ошибкой."""
+        hung = HungBrowser()
+
+        def run(func, browser, url):
+            return dispatcher.run(func, browser, url, lock=browser.lock, timeout=0.2)
+
+        try:
+            results = await fetch_many(["https://a.test/1", "https://a.test/2"], [hung], run, fetch_page, HostThrottle())
+        finally:
+            hung.release.set()
+        assert [r["success"] for r in results] == [False, False]
+
+
+class TestHostThrottle:
+    """Тесты для HostThrottle."""
+
+    @pytest.mark.asyncio
+    async def test_delay(self, monkeypatch):
+        """Пауза выдерживается между загрузками одного хоста, но не разных."""
+        pauses = []
+        sleep = asyncio.sleep
+
+        async def record(delay):
+            pauses.append(delay)
+            await sleep(0)
+
+        monkeypatch.setattr(crawler.asyncio, "sleep", record)
+        throttle = HostThrottle(delay=10)
+        for _ in range(3):
+            await throttle.wait_turn("https://a.test/")
+        await throttle.wait_turn("https://b.test/")
+        assert len(pauses) == 2
+        assert all(9 < pause <= 10 for pause in pauses)
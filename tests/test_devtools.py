@@ -0,0 +1,219 @@
+"""Тесты транспорта DevTools."""
+
+import json
+import queue
+
+import pytest
+from selenium.common.exceptions import JavascriptException, UnexpectedAlertPresentException
+
+import devtools
+from browser_manager import BrowserManager
+from devtools import CdpConnection, CdpError, DevToolsChannel
+
+
+class FakeSocket:
+    """WebSocket, отвечающий на команды в порядке, обратном отправке."""
+
+    def __init__(self, respond=None):
+        self.sent = []
+        self.respond = respond or (lambda command: {"result": {"method": command["method"]}})
+        self._incoming = queue.Queue()
+        self._answered = 0
+        self.hold = False
+
+    def send(self, data):
+        self.sent.append(json.loads(data))
+        if not self.hold:
+            self.flush()
+
+    def flush(self):
+        for command in reversed(self.sent[self._answered:]):
+            self._incoming.put(json.dumps({"id": command["id"], **self.respond(command)}))
+        self._answered = len(self.sent)
+
+    def recv(self):
+        message = self._incoming.get()
+        if message is None:
+            raise ConnectionError("closed")
+        return message
+
+    def close(self):
+        self._incoming.put(None)
+
+
+class DialogSocket(FakeSocket):
+    """WebSocket вкладки, в которой alert() открывает диалог: Chrome не отвечает на скрипт."""
+
+    def __init__(self):
+        super().__init__(lambda command: {"result": {"result": {"value": "ok"}}}
+                         if command["method"] == "Runtime.evaluate" else {"result": {}})
+
+    def flush(self):
+        for command in self.sent[self._answered:]:
+            if "alert(" in command["params"].get("expression", ""):
+                self.event("Page.javascriptDialogOpening", {"type": "alert", "message": "Привет"})
+            else:
+                self._incoming.put(json.dumps({"id": command["id"], **self.respond(command)}))
+        self._answered = len(self.sent)
+
+    def event(self, method, params=None):
+        self._incoming.put(json.dumps({"method": method, "params": params or {}}))
+
+
+class FakeDriver:
+    """WebDriver с адресом отладки и записью команд."""
+
+    capabilities = {"goog:chromeOptions": {"debuggerAddress": "127.0.0.1:9222"}}
+    current_window_handle = "TARGET"
+
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, method, params):
+        self.commands.append(method)
+        return {"via": "webdriver"}
+
+    def execute_script(self, script, *args):
+        self.commands.append("executeScript")
+        return list(args)
+
+
+class TestCdpConnection:
+    """Тесты для CdpConnection."""
+
+    def test_responses_matched_by_id(self):
+        socket = FakeSocket()
+        socket.hold = True
+        connection = CdpConnection(socket)
+
+        first = connection.send("Page.captureScreenshot")
+        second = connection.send("Runtime.evaluate", {"expression": "1"})
+        # Обе команды отправлены до получения ответов
+        assert [command["method"] for command in socket.sent] == ["Page.captureScreenshot", "Runtime.evaluate"]
+        socket.flush()
+
+        assert first.result(1) == {"method": "Page.captureScreenshot"}
+        assert second.result(1) == {"method": "Runtime.evaluate"}
+        connection.close()
+
+    def test_protocol_error(self):
+        connection = CdpConnection(FakeSocket(lambda command: {"error": {"message": "No node"}}))
+        with pytest.raises(CdpError, match="No node"):
+            connection.send("DOM.resolveNode").result(1)
+        connection.close()
+
+    def test_close_fails_pending(self):
+        socket = FakeSocket()
+        socket.hold = True
+        connection = CdpConnection(socket)
+        future = connection.send("Runtime.evaluate")
+
+        connection.close()
+        with pytest.raises(CdpError):
+            future.result(1)
+        with pytest.raises(ConnectionError):
+            connection.send("Runtime.evaluate")
+
+
+class TestDevToolsChannel:
+    """Тесты для DevToolsChannel."""
+
+    @pytest.fixture
+    def sockets(self, monkeypatch):
+        """Подключения channel к FakeSocket вместо Chrome."""
+        urls = []
+
+        def connect(url, timeout=10):
+            urls.append(url)
+            return CdpConnection(FakeSocket(lambda command: {"result": {
+                "result": {"value": json.loads(command["params"]["expression"].rsplit("apply(null, ", 1)[1][:-1])}
+            } if command["method"] == "Runtime.evaluate" else {"method": command["method"]}}))
+
+        monkeypatch.setattr(devtools.CdpConnection, "connect", staticmethod(connect))
+        return urls
+
+    def test_websocket(self, sockets):
+        driver = FakeDriver()
+        channel = DevToolsChannel(driver)
+
+        assert channel.execute("Page.captureScreenshot") == {"method": "Page.captureScreenshot"}
+        assert channel.evaluate("return arguments;", "a", 1) == ["a", 1]
+        assert sockets == ["ws://127.0.0.1:9222/devtools/page/TARGET"]
+        assert driver.commands == []
+        channel.close()
+
+    def test_batch(self, sockets):
+        channel = DevToolsChannel(FakeDriver())
+        results = channel.batch([("Input.dispatchMouseEvent", {}), ("Input.insertText", {})])
+        assert results == [{"method": "Input.dispatchMouseEvent"}, {"method": "Input.insertText"}]
+        channel.close()
+
+    def test_reset_reconnects_to_tab(self, sockets):
+        channel = DevToolsChannel(FakeDriver())
+        channel.execute("Runtime.getHeapUsage")
+        channel.reset("OTHER")
+        channel.execute("Runtime.getHeapUsage")
+        assert sockets[-1].endswith("/devtools/page/OTHER")
+        channel.close()
+
+    def test_disabled(self):
+        driver = FakeDriver()
+        channel = DevToolsChannel(driver, websocket_enabled=False)
+
+        assert channel.execute("Page.captureScreenshot") == {"via": "webdriver"}
+        assert channel.evaluate("return arguments;", 1) == [1]
+        assert driver.commands == ["Page.captureScreenshot", "executeScript"]
+
+    def test_fallback_when_unavailable(self, monkeypatch):
+        def refuse(url, timeout=10):
+            raise ConnectionRefusedError(url)
+
+        monkeypatch.setattr(devtools.CdpConnection, "connect", staticmethod(refuse))
+        driver = FakeDriver()
+        channel = DevToolsChannel(driver)
+
+        assert channel.execute("Page.captureScreenshot") == {"via": "webdriver"}
+        assert channel.execute("Page.captureScreenshot") == {"via": "webdriver"}
+        assert driver.commands == ["Page.captureScreenshot"] * 2
+
+    def test_script_error(self, monkeypatch):
+        def connect(url, timeout=10):
+            return CdpConnection(FakeSocket(lambda command: {"result": {
+                "result": {}, "exceptionDetails": {"text": "Uncaught", "exception": {"description": "ReferenceError: x"}}
+            }}))
+
+        monkeypatch.setattr(devtools.CdpConnection, "connect", staticmethod(connect))
+        channel = DevToolsChannel(FakeDriver())
+        with pytest.raises(JavascriptException, match="ReferenceError"):
+            channel.evaluate("return x;")
+        channel.close()
+
+    def test_alert_then_page_info(self, monkeypatch):
+        """Открытый alert не блокирует чтение страницы до таймаута."""
+        socket = DialogSocket()
+        monkeypatch.setattr(devtools.CdpConnection, "connect", staticmethod(lambda url, timeout=10: CdpConnection(socket)))
+        driver = FakeDriver()
+
+        def execute_script(script, *args):
+            # chromedriver закрывает диалог и возвращает ошибку
+            driver.commands.append("executeScript")
+            socket.event("Page.javascriptDialogClosed")
+            raise UnexpectedAlertPresentException("unexpected alert open", alert_text="Привет")
+
+        driver.execute_script = execute_script
+        browser = BrowserManager()
+        browser.driver = driver
+        browser.devtools = DevToolsChannel(driver)
+
+        with pytest.raises(UnexpectedAlertPresentException):
+            browser.devtools.evaluate("alert('Привет');")
+        result = browser.get_page_info()
+        assert result["success"] is False
+        assert "Привет" in result["error"]
+        assert driver.commands == ["executeScript"]
+
+        # Ответ на команду приходит после события закрытия диалога
+        browser.devtools.connection.send("Runtime.getHeapUsage").result(1)
+        assert browser.devtools.dialog is None
+        assert browser.devtools.evaluate("return 1;") == "ok"
+        browser.devtools.close()
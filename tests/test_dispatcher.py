@@ -0,0 +1,99 @@
+"""Тесты для ToolDispatcher."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from browser_pool import BrowserPool
+from dispatcher import ToolDispatcher, ToolTimeoutError
+
+
+class TestToolDispatcher:
+    """Тесты для ToolDispatcher."""
+
+    @pytest.fixture
+    def dispatcher(self):
+        """Фикстура диспетчера."""
+        dispatcher = ToolDispatcher(max_workers=2, timeout=5)
+        yield dispatcher
+        dispatcher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run_in_worker_thread(self, dispatcher):
+        """Функция выполняется не в потоке event loop."""
+        result = await dispatcher.run(lambda: threading.current_thread().name)
+        assert result.startswith("browser-worker")
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self, dispatcher):
+        """Блокирующий вызов не останавливает event loop."""
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(dispatcher.run(time.sleep, 0.2), ticker())
+        assert len(ticks) == 5
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, dispatcher):
+        """Превышение таймаута возвращает ToolTimeoutError."""
+        with pytest.raises(ToolTimeoutError):
+            await dispatcher.run(time.sleep, 0.5, timeout=0.05)
+
+    @pytest.mark.asyncio
+    async def test_lock_serializes_calls(self, dispatcher):
+        """Вызовы под одной блокировкой не пересекаются."""
+        lock = threading.RLock()
+        active = []
+        overlaps = []
+
+        def job():
+            active.append(1)
+            if len(active) > 1:
+                overlaps.append(1)
+            time.sleep(0.05)
+            active.pop()
+
+        await asyncio.gather(
+            dispatcher.run(job, lock=lock),
+            dispatcher.run(job, lock=lock)
+        )
+        assert not overlaps
+
+    @pytest.mark.asyncio
+    async def test_session_usable_after_timeout(self, dispatcher):
+        """После таймаута сессия не ждет блокировку зависшего браузера."""
+        class FakeBrowser:
+            def __init__(self):
+                self.lock = threading.RLock()
+                self.driver = object()
+                self.session_state = {"url": "https://example.com/"}
+                self.restart_count = 0
+                self.restart_pending = False
+                self.stopped = threading.Event()
+
+            def stop(self):
+                self.driver = None
+                self.stopped.set()
+
+        pool = BrowserPool(factory=FakeBrowser)
+        hung = pool.acquire("a")
+        release = threading.Event()
+
+        with pytest.raises(ToolTimeoutError):
+            await dispatcher.run(release.wait, 5, lock=hung.lock, timeout=0.05)
+        browser = pool.replace("a")
+
+        # Зависший вызов еще держит блокировку старого браузера
+        assert pool.acquire("a") is browser is not hung
+        assert browser.restart_pending and browser.session_state == hung.session_state
+        assert await dispatcher.run(lambda: "done", lock=browser.lock, timeout=1) == "done"
+        assert not hung.stopped.is_set()
+
+        release.set()
+        assert hung.stopped.wait(5)
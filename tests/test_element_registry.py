@@ -0,0 +1,118 @@
+"""Тесты реестра элементов."""
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from browser_manager import BrowserManager
+from element_registry import ElementRegistry, HandleError
+
+
+class FakeElement:
+    """Элемент, ссылка на который может устареть."""
+
+    def __init__(self, id, text="", stale=False):
+        self.id = id
+        self.text = text
+        self.stale = stale
+        self.clicks = 0
+
+    def click(self):
+        if self.stale:
+            raise StaleElementReferenceException("stale element reference")
+        self.clicks += 1
+
+
+class TestElementRegistry:
+    """Тесты для ElementRegistry."""
+
+    def test_same_element_same_handle(self):
+        registry = ElementRegistry()
+        first = registry.register(FakeElement("a"), "#a")
+        second = registry.register(FakeElement("b"), "#b")
+
+        assert first != second
+        assert registry.register(FakeElement("a"), "#a") == first
+        assert registry.get(second).selector == "#b"
+
+    def test_unknown_handle(self):
+        with pytest.raises(HandleError):
+            ElementRegistry().get("e1")
+
+    def test_eviction(self):
+        """Вытесняется давно не использованный элемент."""
+        registry = ElementRegistry(max_size=2)
+        first = registry.register(FakeElement("a"), "#a")
+        second = registry.register(FakeElement("b"), "#b")
+        registry.get(first)
+        registry.register(FakeElement("c"), "#c")
+
+        assert registry.get(first).selector == "#a"
+        with pytest.raises(HandleError):
+            registry.get(second)
+
+    def test_update(self):
+        registry = ElementRegistry()
+        handle = registry.register(FakeElement("a"), "#a")
+        registry.update(handle, FakeElement("a2"))
+
+        assert registry.get(handle).element.id == "a2"
+        assert registry.find(FakeElement("a2")) == handle
+        assert registry.find(FakeElement("a")) is None
+
+
+class FakeWaits:
+    """Ожидание, возвращающее заданный элемент и считающее поиски."""
+
+    def __init__(self, element):
+        self.element = element
+        self.lookups = 0
+
+    def wait_for_element(self, driver, selector, by="css", condition="present", timeout=10):
+        self.lookups += 1
+        return self.element
+
+
+class TestBrowserHandles:
+    """Действия по element_id в BrowserManager."""
+
+    @pytest.fixture
+    def browser(self):
+        browser = BrowserManager()
+        browser.driver = object()
+        browser.waits = FakeWaits(FakeElement("a", text="Привет"))
+        return browser
+
+    def test_handle_skips_lookup(self, browser):
+        element_id = browser.get_text("#a")["element_id"]
+        result = browser.click(element_id=element_id)
+
+        assert result["success"] is True
+        assert browser.waits.lookups == 1
+        assert browser.waits.element.clicks == 1
+
+    def test_stale_handle_relocated(self, browser):
+        element_id = browser.get_text("#a")["element_id"]
+        browser.waits.element.stale = True
+        browser.waits.element = FakeElement("a2")
+
+        result = browser.click(element_id=element_id)
+        assert result["success"] is True
+        assert result["element_id"] == element_id
+        assert browser.waits.lookups == 2
+        assert browser.waits.element.clicks == 1
+
+    def test_unknown_handle(self, browser):
+        result = browser.get_text(element_id="e99")
+        assert result["success"] is False
+
+    def test_handle_invalid_after_navigation(self, browser):
+        """После перехода handle не ищется заново на новой странице."""
+        element_id = browser.get_text("#a")["element_id"]
+        browser.driver = type("Driver", (), {"refresh": lambda self: None, "current_url": "https://a"})()
+
+        assert browser.refresh()["success"] is True
+        result = browser.click(element_id=element_id)
+        assert result["success"] is False
+        assert "handle" in result["error"]
+        assert browser.waits.lookups == 1
+        assert browser.get_text("#a")["element_id"] != element_id
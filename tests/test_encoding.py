@@ -0,0 +1,57 @@
+"""Тесты кодирования результатов инструментов."""
+
+import json
+
+from encoding import encode_result, select_fields, truncate
+
+
+class TestEncodeResult:
+    """Тесты для encode_result."""
+
+    def test_compact_json_keeps_cyrillic(self):
+        content = encode_result("get_text", {"success": True, "text": "Привет"})
+        assert len(content) == 1
+        assert content[0].text == '{"success":true,"text":"Привет"}'
+
+    def test_screenshot_as_image(self):
+        """base64 уходит в ImageContent, в JSON остается ссылка на него."""
+        content = encode_result("screenshot", {
+            "success": True,
+            "screenshot_base64": "iVBORw0KGgo=",
+            "url": "https://example.com"
+        })
+        data = json.loads(content[0].text)
+        assert "screenshot_base64" not in data
+        image = content[data["image_index"]]
+        assert data["image_index"] == 1
+        assert image.type == "image"
+        assert image.mimeType == "image/png"
+        assert image.data == "iVBORw0KGgo="
+
+    def test_nested_screenshot(self):
+        """Скриншоты внутри шагов run_actions тоже выносятся."""
+        result = {"success": True, "steps": [
+            {"step": 1, "result": {"success": True, "screenshot_base64": "AAAA"}}
+        ]}
+        result["steps"].append({"step": 2, "result": {"success": True, "screenshot_base64": "BBBB"}})
+        content = encode_result("run_actions", result)
+        data = json.loads(content[0].text)
+        assert data["steps"][0]["result"] == {"success": True, "image_index": 1}
+        assert data["steps"][1]["result"] == {"success": True, "image_index": 2}
+        assert [content[step["result"]["image_index"]].data for step in data["steps"]] == ["AAAA", "BBBB"]
+
+    def test_truncation_policy(self):
+        content = encode_result("execute_javascript", {"success": True, "result": "x" * 25000})
+        data = json.loads(content[0].text)
+        assert data["result"].startswith("x" * 20000)
+        assert data["result"].endswith("…[+5000]")
+        assert data["truncated_fields"] == ["result"]
+
+
+def test_select_fields_keeps_status():
+    result = {"success": False, "error": "нет", "url": "u", "title": "t"}
+    assert select_fields(result, ["url"]) == {"success": False, "error": "нет", "url": "u"}
+
+
+def test_truncate_list():
+    assert truncate([1, 2, 3, 4], 2) == [1, 2, "…[+2]"]
@@ -0,0 +1,115 @@
+"""Тесты контроля памяти браузера."""
+
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from memory import MemoryGovernor, process_memory
+from metrics import Metrics
+
+
+class FakeBrowser:
+    """Браузер без процессов Chrome: память задается в тесте."""
+
+    def __init__(self, heap):
+        self.driver = object()
+        self.lock = threading.RLock()
+        self.heap = heap
+        self.calls = []
+
+    def get_memory_usage(self):
+        return self.heap
+
+    def free_memory(self):
+        self.calls.append("free_memory")
+        self.heap /= 2
+        return {"success": True}
+
+    def close_background_tabs(self):
+        self.calls.append("close_background_tabs")
+        return {"success": True, "closed": []}
+
+    def capture_state(self, storage=True):
+        return {"url": "https://example.com/"}
+
+    def stop(self):
+        self.calls.append("stop")
+        self.driver = None
+
+    def start(self):
+        self.calls.append("start")
+        self.driver = object()
+        self.heap = 10
+        return {"success": True}
+
+    def restore_state(self, state):
+        self.calls.append(("restore_state", state["url"]))
+        return {"success": True}
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="нужен /proc")
+def test_process_memory():
+    """RSS потомков процесса делится по --type как у процессов Chrome."""
+    sleep = [sys.executable, "-c", "import time; time.sleep(30)"]
+    children = [subprocess.Popen(sleep), subprocess.Popen(sleep + ["--type=renderer"])]
+    try:
+        result = process_memory(os.getpid())
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+
+    assert result["renderers"] == 1
+    assert result["browser_mb"] > 0 and result["renderer_mb"] > 0
+    assert result["rss_mb"] == pytest.approx(result["browser_mb"] + result["renderer_mb"] + result["other_mb"], abs=0.2)
+
+
+class TestMemoryGovernor:
+    """Тесты для MemoryGovernor."""
+
+    def test_sample_within_limits(self):
+        metrics = Metrics()
+        governor = MemoryGovernor(max_heap_mb=100, metrics=metrics)
+        browser = FakeBrowser(heap=50)
+
+        assert governor.check(browser, "a") == []
+        assert metrics.snapshot()["memory"] == {"a": {"rss_mb": None, "heap_mb": 50}}
+
+    def test_actions_until_below_limit(self):
+        metrics = Metrics()
+        governor = MemoryGovernor(max_heap_mb=100, metrics=metrics)
+        browser = FakeBrowser(heap=150)
+
+        assert governor.check(browser, "a") == ["clear_cache"]
+        assert browser.calls == ["free_memory"]
+        assert metrics.snapshot()["memory_actions"] == {"clear_cache": 1}
+
+    def test_recycle_restores_page(self):
+        governor = MemoryGovernor(max_heap_mb=100)
+        browser = FakeBrowser(heap=500)
+
+        assert governor.check(browser, "a") == ["clear_cache", "close_background_tabs", "recycle"]
+        assert browser.calls[-3:] == ["stop", "start", ("restore_state", "https://example.com/")]
+
+    def test_interval(self):
+        governor = MemoryGovernor(max_heap_mb=100, actions=["recycle"], interval=60)
+        browser = FakeBrowser(heap=500)
+
+        assert governor.check(browser, "a") == ["recycle"]
+        browser.heap = 500
+        assert governor.check(browser, "a") == []
+        assert governor.check(browser, "a", force=True) == ["recycle"]
+
+    def test_forget(self):
+        metrics = Metrics()
+        governor = MemoryGovernor(metrics=metrics)
+        governor.check(FakeBrowser(heap=50), "a")
+        governor.forget("a")
+        assert metrics.snapshot()["memory"] == {}
+
+    def test_unknown_action(self):
+        with pytest.raises(ValueError):
+            MemoryGovernor(actions=["restart_host"])
@@ -0,0 +1,103 @@
+"""Тесты метрик."""
+
+from metrics import Histogram, Metrics, timed
+
+
+class TestHistogram:
+    """Тесты для Histogram."""
+
+    def test_quantiles(self):
+        histogram = Histogram(buckets=(10, 100, 1000))
+        for value in [5] * 90 + [500] * 10:
+            histogram.observe(value)
+
+        assert histogram.quantile(0.5) <= 10
+        assert 100 < histogram.quantile(0.95) <= 1000
+        assert histogram.max == 500
+
+    def test_empty(self):
+        assert Histogram().quantile(0.5) is None
+
+
+class FakeBrowser:
+    """Объект с методами, замеряемыми timed."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    @timed
+    def ok(self):
+        return {"success": True}
+
+    @timed
+    def failing(self):
+        return {"success": False, "error": "boom"}
+
+
+class TestMetrics:
+    """Тесты для Metrics."""
+
+    def test_tool_series(self):
+        metrics = Metrics()
+        metrics.record_tool("navigate", 0.2, 100, True)
+        metrics.record_tool("navigate", 0.4, 300, False)
+
+        stats = metrics.snapshot()["tools"]["navigate"]
+        assert stats["calls"] == 2
+        assert stats["error_rate"] == 0.5
+        assert stats["bytes_mean"] == 200
+
+    def test_commands_attributed_to_tool(self):
+        metrics = Metrics()
+        with metrics.tool_scope("click_element"):
+            metrics.count_command("findElement")
+            metrics.count_command("clickElement")
+        metrics.count_command("getTitle")
+        metrics.record_tool("click_element", 0.1, 10, True)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["tools"]["click_element"]["webdriver_commands"] == 2
+        assert snapshot["webdriver_commands"]["getTitle"] == 1
+
+    def test_timed(self):
+        metrics = Metrics()
+        browser = FakeBrowser(metrics)
+        browser.ok()
+        browser.failing()
+
+        methods = metrics.snapshot()["methods"]
+        assert methods["ok"]["errors"] == 0
+        assert methods["failing"]["errors"] == 1
+
+    def test_timed_disabled(self):
+        assert FakeBrowser(None).ok() == {"success": True}
+
+    def test_prometheus(self):
+        metrics = Metrics()
+        metrics.record_tool("get_page_html", 0.03, 5000, True)
+        text = metrics.to_prometheus()
+
+        assert 'chrome_mcp_tool_duration_ms_bucket{tool="get_page_html",le="50"} 1' in text
+        assert 'chrome_mcp_tool_response_bytes_total{tool="get_page_html"} 5000' in text
+
+    def test_memory_gauges(self):
+        metrics = Metrics()
+        metrics.record_memory("a", {"browser_mb": 120.5, "renderer_mb": 310.0, "other_mb": 80.2,
+                                    "renderers": 2, "rss_mb": 510.7, "heap_mb": 42.1})
+        metrics.count_memory_action("clear_cache")
+        text = metrics.to_prometheus()
+
+        assert 'chrome_mcp_browser_rss_mb{session="a",process="renderer"} 310.0' in text
+        assert 'chrome_mcp_js_heap_mb{session="a"} 42.1' in text
+        assert 'chrome_mcp_memory_actions_total{action="clear_cache"} 1' in text
+
+        metrics.reset()
+        assert metrics.snapshot()["memory"]["a"]["rss_mb"] == 510.7
+
+    def test_jsonl_sink(self, tmp_path):
+        metrics = Metrics()
+        metrics.record_tool("screenshot", 0.1, 10, True)
+        path = tmp_path / "metrics.jsonl"
+        metrics.write(str(path), "jsonl")
+        metrics.write(str(path), "jsonl")
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 2
@@ -0,0 +1,155 @@
+"""Тесты снимков страницы и курсоров."""
+
+import pytest
+
+from browser_manager import BrowserManager
+from devtools import DevToolsChannel
+from page_cache import CursorError, SnapshotStore, chunk, make_cursor, parse_cursor
+
+
+class TestChunk:
+    """Тесты для chunk."""
+
+    def test_pages(self):
+        assert chunk("abcdefg", 0, 3) == ("abc", 3)
+        assert chunk("abcdefg", 3, 3) == ("def", 6)
+        assert chunk("abcdefg", 6, 3) == ("g", None)
+
+    def test_unlimited(self):
+        """max_length = 0 - все содержимое с offset."""
+        assert chunk("abcdefg", 2, 0) == ("cdefg", None)
+
+
+class TestCursor:
+    """Тесты курсоров продолжения."""
+
+    def test_roundtrip(self):
+        assert parse_cursor(make_cursor("text1", "s4", "d1.3", 120)) == ("text1", "s4", "d1.3", 120)
+
+    def test_invalid(self):
+        with pytest.raises(CursorError):
+            parse_cursor("garbage")
+
+
+class TestSnapshotStore:
+    """Тесты для SnapshotStore."""
+
+    def test_new_snapshot_replaces_same_kind(self):
+        """Новое извлечение того же вида делает старый курсор недействительным."""
+        store = SnapshotStore()
+        first = store.put("text", "old", {"url": "a"})
+        html = store.put("html", "<html/>")
+        second = store.put("text", "new")
+
+        assert store.get(first.snapshot_id) is None
+        assert store.get(second.snapshot_id).content == "new"
+        assert store.get(html.snapshot_id).content == "<html/>"
+
+    def test_clear(self):
+        store = SnapshotStore()
+        snapshot = store.put("text", "value")
+        store.clear()
+        assert store.get(snapshot.snapshot_id) is None
+
+    def test_lookup_by_version(self):
+        """Снимок переиспользуется только при той же версии DOM."""
+        store = SnapshotStore()
+        snapshot = store.put(("text", "https://a"), "value", version=("doc", 3))
+
+        assert store.lookup(("text", "https://a"), ("doc", 3)) is snapshot
+        assert store.lookup(("text", "https://a"), ("doc", 4)) is None
+        assert store.lookup(("text", "https://b"), ("doc", 3)) is None
+        assert store.lookup(("text", "https://a"), None) is None
+
+    def test_invalidate_keeps_cursors(self):
+        """После действия на странице снимок не переиспользуется, но читается по курсору."""
+        store = SnapshotStore()
+        snapshot = store.put("text", "value", version=("doc", 1))
+        store.invalidate()
+
+        assert store.lookup("text", ("doc", 1)) is None
+        assert store.get(snapshot.snapshot_id) is snapshot
+
+    def test_max_entries(self):
+        store = SnapshotStore(max_entries=2)
+        first = store.put("a", "1")
+        store.put("b", "2")
+        store.put("c", "3")
+        assert store.get(first.snapshot_id) is None
+
+
+class FakeDriver:
+    """Драйвер со счетчиком изменений DOM и извлечений текста."""
+
+    def __init__(self):
+        self.dom_version = 0
+        self.extractions = 0
+
+    def execute_script(self, script, *args):
+        if "__mcpDomVersion" in script:
+            return {"url": "https://a", "title": "A", "document": "d1", "version": self.dom_version}
+        self.extractions += 1
+        return {"text": "abcdef", "url": "https://a"}
+
+
+class TestBrowserSnapshots:
+    """Кэш снимков в BrowserManager."""
+
+    @pytest.fixture
+    def browser(self):
+        browser = BrowserManager(max_text_length=4)
+        browser.driver = FakeDriver()
+        browser.devtools = DevToolsChannel(browser.driver, websocket_enabled=False)
+        return browser
+
+    def test_repeated_read_is_cached(self, browser):
+        first = browser.get_all_text()
+        second = browser.get_all_text()
+        assert (first["cached"], second["cached"]) == (False, True)
+        assert browser.driver.extractions == 1
+
+        browser.driver.dom_version += 1
+        assert browser.get_all_text()["cached"] is False
+        assert browser.driver.extractions == 2
+
+    def test_cursor_continues_snapshot(self, browser):
+        first = browser.get_all_text()
+        assert first["text"] == "abcd"
+        rest = browser.get_all_text(cursor=first["next_cursor"])
+        assert rest["text"] == "ef"
+        assert "next_cursor" not in rest
+        assert browser.driver.extractions == 1
+
+    def test_execute_script_uses_webdriver(self, browser):
+        """execute_javascript не зависит от транспорта DevTools."""
+        driver = browser.driver
+        browser.devtools = DevToolsChannel(driver)
+        browser.devtools.evaluate = None
+        driver.execute_script = lambda script, *args: {"element": "WebElement"}
+
+        assert browser.execute_script("return document.body;")["result"] == {"element": "WebElement"}
+
+    def test_stop_without_devtools(self, browser):
+        """Браузер, запуск которого прервался до DevTools, останавливается."""
+        browser.devtools = None
+        browser.driver.quit = lambda: None
+        assert browser.stop()["success"] is True
+        assert browser.driver is None
+
+    def test_stale_cursor(self, browser):
+        result = browser.get_all_text(cursor="text1:s99:d1.0:4")
+        assert result["success"] is False
+
+    def test_cursor_of_other_kind(self, browser):
+        """Курсор текста не читается как HTML или как текст с другими параметрами."""
+        cursor = browser.get_all_text()["next_cursor"]
+        assert browser.get_page_html(cursor=cursor)["success"] is False
+        assert browser.get_all_text(visible_only=False, cursor=cursor)["success"] is False
+
+    def test_cursor_after_dom_change(self, browser):
+        """Изменение DOM после выдачи курсора - ошибка, а не фрагмент старого снимка."""
+        cursor = browser.get_all_text()["next_cursor"]
+        browser.driver.dom_version += 1
+        result = browser.get_all_text(cursor=cursor)
+        assert result["success"] is False
+        assert "изменилась" in result["error"]
@@ -0,0 +1,79 @@
+"""Тесты модели страницы."""
+
+from page_model import build_page_model
+
+
+def make_capture():
+    """Ответ DOMSnapshot.captureSnapshot: страница со ссылкой, виджетом и iframe."""
+    strings = [
+        "#document", "HTML", "BODY", "A", "href", "/home", "Home",
+        "DIV", "role", "button", "Go", "INPUT", "type", "hidden",
+        "IFRAME", "BUTTON", "Inner", "visible", "hidden", "P", "Text",
+    ]
+    s = strings.index
+    main = {
+        "nodes": {
+            "parentIndex": [-1, 0, 1, 2, 3, 2, 5, 2, 2, 2, 9],
+            "nodeType": [9, 1, 1, 1, 3, 1, 3, 1, 1, 1, 3],
+            "nodeName": [s("#document"), s("HTML"), s("BODY"), s("A"), -1, s("DIV"), -1,
+                         s("INPUT"), s("IFRAME"), s("P"), -1],
+            "nodeValue": [-1, -1, -1, -1, s("Home"), -1, s("Go"), -1, -1, -1, s("Text")],
+            "backendNodeId": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
+            "attributes": [[], [], [], [s("href"), s("/home")], [], [s("role"), s("button")], [],
+                           [s("type"), s("hidden")], [], [], []],
+            "contentDocumentIndex": {"index": [8], "value": [1]},
+        },
+        "layout": {
+            "nodeIndex": [1, 2, 3, 5, 8, 9],
+            "bounds": [[0, 0, 800, 600], [0, 0, 800, 600], [10, 10, 50, 20],
+                       [10, 40, 0, 0], [100, 200, 300, 150], [0, 300, 800, 20]],
+            "styles": [[s("visible")]] * 6,
+        },
+    }
+    frame = {
+        "nodes": {
+            "parentIndex": [-1, 0, 1],
+            "nodeType": [9, 1, 3],
+            "nodeName": [s("#document"), s("BUTTON"), -1],
+            "nodeValue": [-1, -1, s("Inner")],
+            "backendNodeId": [20, 21, 22],
+            "attributes": [[], [], []],
+        },
+        "layout": {
+            "nodeIndex": [1],
+            "bounds": [[5, 5, 40, 20]],
+            "styles": [[s("visible")]],
+        },
+    }
+    return {"documents": [main, frame], "strings": strings}
+
+
+class TestBuildPageModel:
+    """Тесты для build_page_model."""
+
+    def test_interactive_elements(self):
+        elements, total = build_page_model(make_capture())
+
+        assert total == 3
+        assert [(e["role"], e["name"]) for e in elements] == [
+            ("link", "Home"), ("button", "Go"), ("button", "Inner")
+        ]
+        assert elements[0]["href"] == "/home"
+        assert elements[0]["backend_node_id"] == 4
+
+    def test_iframe_offset(self):
+        """Координаты элементов iframe пересчитываются в координаты страницы."""
+        inner = build_page_model(make_capture())[0][2]
+        assert inner["box"] == [105, 205, 40, 20]
+        assert inner["frame"] == 1
+
+    def test_visible_only(self):
+        """Элемент нулевого размера не видим."""
+        elements, total = build_page_model(make_capture(), visible_only=True)
+        assert [e["name"] for e in elements] == ["Home", "Inner"]
+        assert total == 2
+
+    def test_max_elements(self):
+        elements, total = build_page_model(make_capture(), max_elements=1)
+        assert len(elements) == 1
+        assert total == 3
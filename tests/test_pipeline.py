@@ -0,0 +1,83 @@
+"""Тесты для run_actions."""
+
+import pytest
+
+from pipeline import StepReferenceError, resolve_references, run_actions
+
+
+def _handlers(calls):
+    """Обработчики, записывающие аргументы вызовов."""
+    def find(browser, arguments):
+        calls.append(("find", arguments))
+        return {"success": True, "text": "Example", "items": [{"href": "/a"}]}
+
+    def fail(browser, arguments):
+        calls.append(("fail", arguments))
+        return {"success": False, "error": "boom"}
+
+    def echo(browser, arguments):
+        calls.append(("echo", arguments))
+        return {"success": True, "arguments": arguments}
+
+    return {"find": find, "fail": fail, "echo": echo}
+
+
+class TestResolveReferences:
+    """Тесты подстановки ссылок на шаги."""
+
+    def test_whole_value_keeps_type(self):
+        results = {"1": {"items": [{"href": "/a"}]}}
+        assert resolve_references("${1.items}", results) == [{"href": "/a"}]
+
+    def test_interpolation_and_ids(self):
+        results = {"search": {"text": "Example"}}
+        value = {"text": "Title: ${search.text}"}
+        assert resolve_references(value, results) == {"text": "Title: Example"}
+
+    def test_missing_reference(self):
+        with pytest.raises(StepReferenceError):
+            resolve_references("${3.text}", {})
+
+
+class TestRunActions:
+    """Тесты пакетного выполнения."""
+
+    def test_references_between_steps(self):
+        calls = []
+        result = run_actions(_handlers(calls), None, [
+            {"action": "find", "id": "first"},
+            {"action": "echo", "arguments": {"href": "${first.items.0.href}"}},
+        ])
+        assert result["success"] is True
+        assert result["steps"][1]["result"]["arguments"] == {"href": "/a"}
+
+    def test_stop_on_error(self):
+        calls = []
+        result = run_actions(_handlers(calls), None, [
+            {"action": "fail"},
+            {"action": "find"},
+        ])
+        assert result["success"] is False
+        assert result["completed"] == 1
+        assert len(calls) == 1
+
+    def test_continue_on_error(self):
+        calls = []
+        result = run_actions(_handlers(calls), None, [
+            {"action": "unknown"},
+            {"action": "find"},
+        ], stop_on_error=False)
+        assert result["completed"] == 2
+        assert result["failed"] == 1
+        assert result["steps"][1]["result"]["success"] is True
+
+    def test_unsupported_action_rejected_before_run(self):
+        calls = []
+        result = run_actions(_handlers(calls), None, [
+            {"action": "find"},
+            {"action": "fetch_many", "arguments": {"urls": []}},
+        ], unsupported={"fetch_many"})
+        assert result["success"] is False
+        assert "Шаг 2" in result["error"] and "fetch_many" in result["error"]
+        assert result["completed"] == 0
+        assert calls == []
@@ -0,0 +1,31 @@
+"""Тесты правил блокировки ресурсов."""
+
+import pytest
+
+from resource_blocking import build_block_rules
+
+
+class TestBuildBlockRules:
+    """Тесты для build_block_rules."""
+
+    def test_empty(self):
+        """Без правил ничего не блокируется."""
+        assert build_block_rules() == {"urlPatterns": [], "legacy_urls": []}
+
+    def test_allow_before_block(self):
+        """Разрешения идут первыми и не блокируют."""
+        rules = build_block_rules(["image"], allow_urls=["*://cdn.example.com/*"])
+        first = rules["urlPatterns"][0]
+        assert first == {"urlPattern": "*://cdn.example.com/*", "block": False}
+        assert {"urlPattern": "*://*/*.png", "block": True} in rules["urlPatterns"]
+        assert "*.png" in rules["legacy_urls"]
+
+    def test_ads_and_custom_urls(self):
+        rules = build_block_rules(["ads"], block_urls=["*://tracker.test/*"])
+        patterns = [rule["urlPattern"] for rule in rules["urlPatterns"]]
+        assert "*://*.doubleclick.net/*" in patterns
+        assert "*://tracker.test/*" in rules["legacy_urls"]
+
+    def test_unknown_type(self):
+        with pytest.raises(ValueError):
+            build_block_rules(["video"])
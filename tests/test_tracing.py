@@ -0,0 +1,132 @@
+"""Тесты трассировки."""
+
+import json
+
+import pytest
+
+from dispatcher import ToolDispatcher
+from metrics import timed
+from tracing import ChromeTraceExporter, OtlpJsonExporter, Tracer
+
+
+class MemoryExporter:
+    """Сохраняет выгруженные трассы в списке."""
+
+    def __init__(self):
+        self.traces = []
+
+    def export(self, spans):
+        self.traces.append(spans)
+
+
+class FakeBrowser:
+    """Объект с методом, трассируемым timed."""
+
+    def __init__(self, tracer):
+        self.metrics = None
+        self.tracer = tracer
+
+    @timed
+    def navigate(self):
+        with self.tracer.span("get", kind="webdriver"):
+            pass
+        return {"success": False, "error": "timeout"}
+
+
+class TestTracer:
+    """Тесты для Tracer."""
+
+    def test_nested_spans(self):
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter)
+
+        with tracer.trace("navigate", kind="tool") as root:
+            FakeBrowser(tracer).navigate()
+
+        [spans] = exporter.traces
+        by_name = {span.name: span for span in spans}
+        assert spans[0] is root
+        method = next(span for span in spans if span.attributes.get("kind") == "method")
+        assert method.parent_id == root.span_id
+        assert method.error == "timeout"
+        assert by_name["get"].parent_id == method.span_id
+        assert {span.trace_id for span in spans} == {root.trace_id}
+        assert all(span.end_ns >= span.start_ns for span in spans)
+
+    def test_span_outside_trace(self):
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter)
+
+        with tracer.span("get") as span:
+            assert span is None
+        assert exporter.traces == []
+
+    def test_exception_marks_root(self):
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter)
+
+        with pytest.raises(ValueError):
+            with tracer.trace("click"):
+                raise ValueError("boom")
+
+        assert exporter.traces[0][0].error == "boom"
+
+    @pytest.mark.asyncio
+    async def test_context_in_worker_thread(self):
+        """span в потоке диспетчера становится дочерним для корневого."""
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter)
+        dispatcher = ToolDispatcher(max_workers=1)
+
+        def command():
+            with tracer.span("executeScript"):
+                pass
+
+        try:
+            with tracer.trace("get_text") as root:
+                await dispatcher.run(command)
+        finally:
+            dispatcher.shutdown()
+
+        root_span, child = exporter.traces[0]
+        assert child.parent_id == root.span_id
+        assert child.thread_id != root_span.thread_id
+
+
+class TestExporters:
+    """Тесты форматов выгрузки."""
+
+    def _trace(self, exporter):
+        tracer = Tracer(exporter)
+        with tracer.trace("navigate", kind="tool", session="default"):
+            with tracer.span("cdp:Page.navigate", kind="webdriver") as span:
+                span.error = "net::ERR_ABORTED"
+
+    def test_chrome(self, tmp_path):
+        path = tmp_path / "trace.json"
+        exporter = ChromeTraceExporter(str(path))
+        self._trace(exporter)
+        self._trace(exporter)
+
+        text = path.read_text(encoding="utf-8")
+        assert text.startswith("[\n")
+        events = json.loads(text.rstrip().rstrip(",") + "]")
+        assert len(events) == 4
+        assert {event["ph"] for event in events} == {"X"}
+        assert events[0]["args"]["session"] == "default"
+        assert events[1]["cat"] == "webdriver"
+        assert events[1]["args"]["error"] == "net::ERR_ABORTED"
+
+    def test_otlp(self, tmp_path):
+        path = tmp_path / "trace.jsonl"
+        self._trace(OtlpJsonExporter(str(path)))
+
+        [line] = path.read_text(encoding="utf-8").splitlines()
+        spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        root, child = spans
+        assert "parentSpanId" not in root
+        assert child["parentSpanId"] == root["spanId"]
+        assert child["traceId"] == root["traceId"]
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert child["status"] == {"code": 2, "message": "net::ERR_ABORTED"}
+        assert {"key": "session", "value": {"stringValue": "default"}} in root["attributes"]
@@ -0,0 +1,88 @@
+"""Тесты для WaitEngine."""
+
+import pytest
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    TimeoutException,
+)
+
+from waits import WaitEngine
+
+
+class FakeDriver:
+    """Заглушка WebDriver для проверки логики ожиданий."""
+
+    def __init__(self, script_result=None, script_error=None, element=None):
+        self.script_result = script_result
+        self.script_error = script_error
+        self.element = element
+        self.script_timeouts = []
+        self.find_calls = 0
+
+    def set_script_timeout(self, seconds):
+        self.script_timeouts.append(seconds)
+
+    def execute_async_script(self, script, *args):
+        if self.script_error:
+            raise self.script_error
+        if isinstance(self.script_result, list):
+            result = self.script_result.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return self.script_result
+
+    def find_element(self, by, selector):
+        self.find_calls += 1
+        if self.element is None:
+            raise NoSuchElementException(selector)
+        return self.element
+
+
+class TestWaitEngine:
+    """Тесты для WaitEngine."""
+
+    def test_event_driven_result(self):
+        """Элемент из MutationObserver возвращается без опроса WebDriver."""
+        driver = FakeDriver(script_result="element")
+        engine = WaitEngine()
+        assert engine.wait_for_element(driver, "#id", timeout=1) == "element"
+        assert driver.find_calls == 0
+
+    def test_event_driven_timeout(self):
+        """null из скрипта означает таймаут."""
+        driver = FakeDriver(script_result=None)
+        with pytest.raises(TimeoutException):
+            WaitEngine().wait_for_element(driver, "#id", timeout=1)
+
+    def test_fallback_to_polling(self):
+        """При ошибке скрипта ожидание продолжается через WebDriverWait."""
+        driver = FakeDriver(script_error=JavascriptException("unloaded"), element="element")
+        engine = WaitEngine(poll_frequency=0.01)
+        assert engine.wait_for_element(driver, "#id", timeout=1) == "element"
+        assert driver.find_calls == 1
+
+    def test_polling_only(self):
+        """event_driven=False использует только WebDriverWait."""
+        driver = FakeDriver(script_error=AssertionError("не должен вызываться"), element="element")
+        engine = WaitEngine(event_driven=False, poll_frequency=0.01)
+        assert engine.wait_for_element(driver, "#id", timeout=1) == "element"
+
+    def test_script_timeout_set_once(self):
+        """Script timeout увеличивается только при необходимости."""
+        driver = FakeDriver(script_result="element")
+        engine = WaitEngine()
+        engine.wait_for_element(driver, "#id", timeout=60)
+        engine.wait_for_element(driver, "#id", timeout=30)
+        assert driver.script_timeouts == [65]
+
+    def test_ready_state_skips_old_document(self):
+        """Ожидание readyState пропускает старый и выгруженный документ."""
+        driver = FakeDriver(script_result=[None, JavascriptException("unloaded"), True])
+        assert WaitEngine().wait_for_ready_state(driver, "interactive", timeout=5) is True
+        assert driver.script_result == []
+
+    def test_unknown_condition(self):
+        with pytest.raises(ValueError):
+            WaitEngine().wait_for_element(FakeDriver(), "#id", condition="shiny")
@@ -0,0 +1,130 @@
+"""Тесты для Watchdog."""
+
+from watchdog import Watchdog, is_crash_error
+
+
+class FakeBrowser:
+    """Браузер, который можно «уронить» между вызовами."""
+
+    def __init__(self, start_failures=0):
+        self.driver = object()
+        self.alive = True
+        self.start_failures = start_failures
+        self.restart_count = 0
+        self.session_state = {}
+        self.restored = []
+        self.started = 0
+
+    def is_alive(self):
+        return self.alive
+
+    def stop(self):
+        self.driver = None
+        return {"success": True}
+
+    def start(self):
+        self.started += 1
+        if self.start_failures:
+            self.start_failures -= 1
+            return {"success": False, "error": "cannot start"}
+        self.driver = object()
+        self.alive = True
+        return {"success": True}
+
+    def capture_state(self, storage=True):
+        return {"url": "https://example.com/cart", "cookies": [{"name": "sid", "value": "1"}], "local_storage": {}}
+
+    def restore_state(self, state):
+        self.restored.append(state)
+        return {"success": True}
+
+
+def crash(browser):
+    """Инструмент, во время которого падает вкладка."""
+    calls = []
+
+    def run():
+        calls.append(1)
+        if len(calls) == 1:
+            browser.alive = False
+            return {"success": False, "error": "Message: tab crashed"}
+        return {"success": True, "url": "https://example.com/"}
+    return run, calls
+
+
+class TestIsCrashError:
+    """Тесты для is_crash_error."""
+
+    def test_markers(self):
+        assert is_crash_error("Message: invalid session id")
+        assert is_crash_error("HTTPConnectionPool: Max retries exceeded with url: /session")
+        assert not is_crash_error("Элемент не найден: #submit")
+        assert not is_crash_error(None)
+
+
+class TestWatchdog:
+    """Тесты для Watchdog."""
+
+    def test_restart_and_retry(self):
+        browser = FakeBrowser()
+        browser.session_state["url"] = "https://example.com/"
+        run, calls = crash(browser)
+
+        result = Watchdog(backoff=0).call(browser, "get_page_info", run)
+
+        assert result["success"] and result["retried"] and result["browser_restarted"]
+        assert len(calls) == 2
+        assert browser.restart_count == 1
+        assert browser.restored == [{"url": "https://example.com/"}]
+
+    def test_no_retry_with_side_effects(self):
+        browser = FakeBrowser()
+        run, calls = crash(browser)
+
+        result = Watchdog(backoff=0).call(browser, "click_element", run)
+
+        assert not result["success"]
+        assert result["browser_restarted"]
+        assert "retried" not in result
+        assert len(calls) == 1
+
+    def test_alive_browser_not_restarted(self):
+        browser = FakeBrowser()
+        result = Watchdog(backoff=0).call(
+            browser, "get_page_info", lambda: {"success": False, "error": "connection refused"})
+
+        assert not result["success"]
+        assert browser.restart_count == 0
+
+    def test_restart_attempts(self):
+        browser = FakeBrowser(start_failures=2)
+        run, calls = crash(browser)
+
+        result = Watchdog(max_restarts=2, backoff=0).call(browser, "get_page_info", run)
+
+        assert not result["success"]
+        assert "перезапуск не удался" in result["error"]
+        assert browser.started == 2
+
+    def test_remember_url(self):
+        browser = FakeBrowser()
+        Watchdog().call(browser, "navigate", lambda: {"success": True, "url": "https://example.com/a"})
+        assert browser.session_state == {"url": "https://example.com/a"}
+
+    def test_remember_storage(self):
+        browser = FakeBrowser()
+        watchdog = Watchdog(restore_storage=True, backoff=0)
+        watchdog.call(browser, "click_element", lambda: {"success": True})
+        assert browser.session_state["cookies"] == [{"name": "sid", "value": "1"}]
+
+        run, _ = crash(browser)
+        watchdog.call(browser, "get_page_info", run)
+        assert browser.restored[0]["url"] == "https://example.com/cart"
+        assert "cookies" in browser.restored[0]
+
+    def test_lifecycle_tools_passthrough(self):
+        browser = FakeBrowser()
+        browser.alive = False
+        result = Watchdog().call(browser, "browser_stop", lambda: {"success": False, "error": "tab crashed"})
+        assert browser.restart_count == 0
+        assert "browser_restarted" not in result